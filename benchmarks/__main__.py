@@ -0,0 +1,36 @@
+"""
+Runs the core run-loop microbenchmark suite and writes the results as JSON.
+
+    python -m benchmarks [--output results.json] [--only run.tools] [--min-time 0.2]
+"""
+
+import argparse
+import json
+import sys
+
+from .suite import run_suite
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", "-o", help="write JSON here instead of stdout")
+    parser.add_argument("--only", help="run only scenarios whose name contains this")
+    parser.add_argument(
+        "--min-time",
+        type=float,
+        default=0.2,
+        help="seconds to spend timing each scenario",
+    )
+    args = parser.parse_args()
+
+    report = run_suite(min_time=args.min_time, only=args.only)
+    if args.output:
+        with open(args.output, "w") as file:
+            json.dump(report, file, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        print()
+
+
+if __name__ == "__main__":
+    main()
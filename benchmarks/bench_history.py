@@ -0,0 +1,112 @@
+"""
+Per-turn cost of Swarm.run as conversation history grows.
+
+Each sample is a single-turn run against an in-process fake client over a
+history of N messages with ~1KB tool outputs, so the timing is framework
+overhead only. `eager_copy_us` is what deep-copying the same history and
+context_variables up front costs, for comparison.
+
+    python -m benchmarks.bench_history [--json]
+"""
+
+import argparse
+import copy
+import json
+import statistics
+import time
+
+from swarm import Agent, Swarm
+
+from .fake_client import FakeClient, completion
+
+HISTORY_LENGTHS = [10, 100, 1000, 10000]
+TOOL_OUTPUT = "x" * 1024
+
+
+def make_history(length: int) -> list:
+    history = []
+    for i in range(length):
+        match i % 3:
+            case 0:
+                history.append({"role": "user", "content": f"question {i}"})
+            case 1:
+                history.append(
+                    {
+                        "role": "assistant",
+                        "content": None,
+                        "sender": "Agent",
+                        "tool_calls": [
+                            {
+                                "id": f"call_{i}",
+                                "type": "function",
+                                "function": {"name": "lookup", "arguments": "{}"},
+                            }
+                        ],
+                    }
+                )
+            case 2:
+                history.append(
+                    {
+                        "role": "tool",
+                        "tool_call_id": f"call_{i - 1}",
+                        "tool_name": "lookup",
+                        "content": TOOL_OUTPUT,
+                    }
+                )
+    return history
+
+
+def median_us(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1e6
+
+
+def run(repeat: int = 20) -> list:
+    swarm = Swarm(client=FakeClient([completion("done")]))
+    agent = Agent()
+    context_variables = {"cart": [{"sku": i} for i in range(100)], "user": "ann"}
+
+    results = []
+    for length in HISTORY_LENGTHS:
+        history = make_history(length)
+        results.append(
+            {
+                "history_length": length,
+                "turn_us": median_us(
+                    lambda: swarm.run(agent, history, context_variables), repeat
+                ),
+                "eager_copy_us": median_us(
+                    lambda: (
+                        copy.deepcopy(history),
+                        copy.deepcopy(context_variables),
+                    ),
+                    repeat,
+                ),
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="emit JSON")
+    args = parser.parse_args()
+
+    results = run(args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(f"{'history':>8} {'turn (us)':>12} {'eager copy (us)':>16}")
+    for r in results:
+        print(
+            f"{r['history_length']:>8} {r['turn_us']:>12.1f} {r['eager_copy_us']:>16.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""
+Cost of assembling streamed completions of 10k tokens.
+
+Compares the previous per-chunk path (a JSON round trip of every delta
+followed by util.merge_chunk string concatenation) with StreamAccumulator,
+on a 10k-token text answer and a tool call whose arguments arrive in 10k
+fragments. `run_and_stream_ms` drives the whole Swarm.run_and_stream loop
+over the same stream against an in-process fake client.
+
+    python -m benchmarks.bench_streaming [--tokens N] [--json]
+"""
+
+import argparse
+import json
+import time
+from collections import defaultdict
+
+from swarm import Agent, Swarm
+from swarm.streaming import StreamAccumulator
+from swarm.util import merge_chunk
+
+from .fake_client import FakeClient, stream_chunks
+
+
+def legacy_accumulate(chunks) -> dict:
+    message = {
+        "content": "",
+        "role": "assistant",
+        "function_call": None,
+        "tool_calls": defaultdict(
+            lambda: {"function": {"arguments": "", "name": ""}, "id": "", "type": ""}
+        ),
+    }
+    for chunk in chunks:
+        delta = json.loads(chunk.choices[0].delta.model_dump_json())
+        delta.pop("role", None)
+        merge_chunk(message, delta)
+    return message
+
+
+def accumulate(chunks) -> dict:
+    accumulator = StreamAccumulator("Agent")
+    for chunk in chunks:
+        accumulator.add_chunk(chunk)
+    return accumulator.message()
+
+
+def best_ms(fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best * 1e3
+
+
+def run(tokens: int = 10_000, repeat: int = 3) -> list:
+    streams = {
+        "text": stream_chunks(content_tokens=["tok "] * tokens),
+        "tool_arguments": stream_chunks(
+            tool_calls=[("write_file", {"content": "x" * tokens * 4})],
+            argument_fragments=tokens,
+        ),
+    }
+
+    results = []
+    for name, chunks in streams.items():
+        swarm = Swarm(client=FakeClient([chunks]))
+        agent = Agent(functions=[lambda content: "ok"] if name != "text" else [])
+        messages = [{"role": "user", "content": "go"}]
+        results.append(
+            {
+                "stream": name,
+                "chunks": len(chunks),
+                "legacy_ms": best_ms(lambda: legacy_accumulate(chunks), repeat),
+                "accumulator_ms": best_ms(lambda: accumulate(chunks), repeat),
+                "run_and_stream_ms": best_ms(
+                    lambda: list(
+                        swarm.run_and_stream(
+                            agent, messages, max_turns=1, execute_tools=False
+                        )
+                    ),
+                    repeat,
+                ),
+            }
+        )
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tokens", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--json", action="store_true", help="emit JSON")
+    args = parser.parse_args()
+
+    results = run(args.tokens, args.repeat)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+    print(
+        f"{'stream':>15} {'chunks':>7} {'legacy (ms)':>12} "
+        f"{'accumulator (ms)':>17} {'run_and_stream (ms)':>20}"
+    )
+    for r in results:
+        print(
+            f"{r['stream']:>15} {r['chunks']:>7} {r['legacy_ms']:>12.1f} "
+            f"{r['accumulator_ms']:>17.1f} {r['run_and_stream_ms']:>20.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+import json
+from types import SimpleNamespace
+
+from openai.types.chat.chat_completion import ChatCompletion, Choice
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice as ChunkChoice,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+)
+from swarm.types import ChatCompletionMessage, ChatCompletionMessageToolCall, Function
+
+
+def completion(content="", tool_calls=(), model="fake-model") -> ChatCompletion:
+    """
+    Builds a ChatCompletion with the given content and tool calls, each tool
+    call given as a (name, args) pair.
+    """
+    return ChatCompletion(
+        id="fake_cc_id",
+        created=0,
+        model=model,
+        object="chat.completion",
+        choices=[
+            Choice(
+                message=ChatCompletionMessage(
+                    role="assistant",
+                    content=content,
+                    tool_calls=[
+                        ChatCompletionMessageToolCall(
+                            id=f"fake_tc_{i}",
+                            type="function",
+                            function=Function(name=name, arguments=json.dumps(args)),
+                        )
+                        for i, (name, args) in enumerate(tool_calls)
+                    ]
+                    or None,
+                ),
+                finish_reason="tool_calls" if tool_calls else "stop",
+                index=0,
+            )
+        ],
+    )
+
+
+def stream_chunks(
+    content_tokens=(), tool_calls=(), argument_fragments=1, model="fake-model"
+) -> list:
+    """
+    Builds the chunks of a streamed completion: one chunk per content token,
+    then each (name, args) tool call with its JSON arguments split across
+    `argument_fragments` chunks.
+    """
+
+    def chunk(delta, finish_reason=None):
+        return ChatCompletionChunk(
+            id="fake_cc_id",
+            created=0,
+            model=model,
+            object="chat.completion.chunk",
+            choices=[ChunkChoice(delta=delta, finish_reason=finish_reason, index=0)],
+        )
+
+    chunks = [chunk(ChoiceDelta(role="assistant"))]
+    chunks.extend(chunk(ChoiceDelta(content=token)) for token in content_tokens)
+    for index, (name, args) in enumerate(tool_calls):
+        arguments = json.dumps(args)
+        step = max(1, -(-len(arguments) // argument_fragments))
+        for i in range(0, len(arguments), step):
+            chunks.append(
+                chunk(
+                    ChoiceDelta(
+                        tool_calls=[
+                            ChoiceDeltaToolCall(
+                                index=index,
+                                id=f"fake_tc_{index}" if i == 0 else None,
+                                type="function" if i == 0 else None,
+                                function=ChoiceDeltaToolCallFunction(
+                                    name=name if i == 0 else None,
+                                    arguments=arguments[i : i + step],
+                                ),
+                            )
+                        ]
+                    )
+                )
+            )
+    chunks.append(
+        chunk(ChoiceDelta(), finish_reason="tool_calls" if tool_calls else "stop")
+    )
+    return chunks
+
+
+class FakeClient:
+    """
+    In-process stand-in for `OpenAI()` that answers instantly from a script,
+    so timings measure Swarm's own overhead rather than the model's.
+
+    `script` is a list of responses returned in order, cycling forever. A
+    list of chunks in the script is returned as a fresh stream iterator.
+    """
+
+    def __init__(self, script):
+        self.script = list(script)
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **params):
+        response = self.script[self.calls % len(self.script)]
+        self.calls += 1
+        if isinstance(response, list):
+            return iter(response)
+        return response
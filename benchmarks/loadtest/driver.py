@@ -0,0 +1,260 @@
+"""
+Ramps up concurrent Swarm sessions against an OpenAI-compatible endpoint and
+reports throughput, latency and time-to-first-token percentiles per stage.
+
+Point it at `benchmarks.loadtest.server` (or pass --spawn-server to start
+one in a subprocess) to measure how many sessions one box can drive before
+framework overhead, rather than the model, becomes the bottleneck.
+
+    python -m benchmarks.loadtest.driver --spawn-server --stages 1,10,50,100 \\
+        --duration 10 --stream --tool-call-rate 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import socket
+import subprocess
+import sys
+import threading
+import time
+
+from openai import AsyncOpenAI, OpenAI
+
+from swarm import Agent, AsyncSwarm, Swarm
+from swarm.batch import percentile
+from swarm.transport import (
+    configure_transport,
+    get_async_http_client,
+    get_http_client,
+)
+
+
+def lookup(query: str):
+    """Looks up an answer."""
+    return f"result for {query}"
+
+
+AGENT = Agent(name="Load Agent", functions=[lookup])
+MESSAGES = [{"role": "user", "content": "Look something up for me."}]
+
+
+def run_session(swarm: Swarm, stream: bool) -> dict:
+    start = time.perf_counter()
+    ttft = None
+    if stream:
+        for event in swarm.run(agent=AGENT, messages=MESSAGES, stream=True):
+            if ttft is None and "delim" not in event and "response" not in event:
+                ttft = time.perf_counter() - start
+    else:
+        swarm.run(agent=AGENT, messages=MESSAGES)
+    return {"latency": time.perf_counter() - start, "ttft": ttft}
+
+
+async def run_session_async(swarm: AsyncSwarm, stream: bool) -> dict:
+    start = time.perf_counter()
+    ttft = None
+    if stream:
+        events = await swarm.run(agent=AGENT, messages=MESSAGES, stream=True)
+        async for event in events:
+            if ttft is None and "delim" not in event and "response" not in event:
+                ttft = time.perf_counter() - start
+    else:
+        await swarm.run(agent=AGENT, messages=MESSAGES)
+    return {"latency": time.perf_counter() - start, "ttft": ttft}
+
+
+def run_stage_threads(swarm, concurrency, duration, stream) -> list:
+    samples = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration
+
+    def worker():
+        while time.perf_counter() < stop_at:
+            try:
+                sample = run_session(swarm, stream)
+            except Exception as e:
+                sample = {"error": repr(e)}
+            with lock:
+                samples.append(sample)
+
+    threads = [threading.Thread(target=worker) for _ in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return samples
+
+
+async def run_stage_tasks(swarm, concurrency, duration, stream) -> list:
+    samples = []
+    stop_at = time.perf_counter() + duration
+
+    async def worker():
+        while time.perf_counter() < stop_at:
+            try:
+                samples.append(await run_session_async(swarm, stream))
+            except Exception as e:
+                samples.append({"error": repr(e)})
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return samples
+
+
+def summarize(concurrency: int, wall_time: float, samples: list) -> dict:
+    ok = [s for s in samples if "error" not in s]
+    latencies = sorted(s["latency"] for s in ok)
+    ttfts = sorted(s["ttft"] for s in ok if s["ttft"] is not None)
+    errors = [s["error"] for s in samples if "error" in s]
+    return {
+        "concurrency": concurrency,
+        "sessions": len(ok),
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "throughput": len(ok) / wall_time,
+        "latency_p50": percentile(latencies, 0.50),
+        "latency_p95": percentile(latencies, 0.95),
+        "latency_p99": percentile(latencies, 0.99),
+        "ttft_p50": percentile(ttfts, 0.50) if ttfts else None,
+        "ttft_p95": percentile(ttfts, 0.95) if ttfts else None,
+        "ttft_p99": percentile(ttfts, 0.99) if ttfts else None,
+    }
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_server(args) -> tuple:
+    port = free_port()
+    process = subprocess.Popen(
+        [
+            sys.executable,
+            "-m",
+            "benchmarks.loadtest.server",
+            "--port",
+            str(port),
+            "--ttft",
+            args.ttft,
+            "--token-rate",
+            args.token_rate,
+            "--tokens",
+            str(args.tokens),
+            "--tool-call-rate",
+            str(args.tool_call_rate),
+        ]
+    )
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            break
+        except OSError:
+            time.sleep(0.05)
+    return process, f"http://127.0.0.1:{port}/v1"
+
+
+def print_table(results: list) -> None:
+    print(
+        f"{'conc':>5} {'sessions':>9} {'err':>5} {'sess/s':>8} "
+        f"{'p50':>7} {'p95':>7} {'p99':>7} {'ttft50':>7} {'ttft95':>7} {'ttft99':>7}"
+    )
+
+    def fmt(value):
+        return f"{value:>7.3f}" if value is not None else f"{'-':>7}"
+
+    for r in results:
+        print(
+            f"{r['concurrency']:>5} {r['sessions']:>9} {r['errors']:>5} "
+            f"{r['throughput']:>8.1f} {fmt(r['latency_p50'])} "
+            f"{fmt(r['latency_p95'])} {fmt(r['latency_p99'])} {fmt(r['ttft_p50'])} "
+            f"{fmt(r['ttft_p95'])} {fmt(r['ttft_p99'])}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--base-url", default="http://localhost:11434/v1")
+    parser.add_argument(
+        "--stages", default="1,10,50,100", help="comma-separated concurrency levels"
+    )
+    parser.add_argument("--duration", type=float, default=10, help="seconds per stage")
+    parser.add_argument("--stream", action="store_true", help="use run_and_stream")
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="drive AsyncSwarm sessions as tasks instead of threads",
+    )
+    parser.add_argument("--json", help="also write results as JSON to this path")
+    server = parser.add_argument_group("spawned server")
+    server.add_argument("--spawn-server", action="store_true")
+    server.add_argument("--ttft", default="fixed:0.2")
+    server.add_argument("--token-rate", default="fixed:50")
+    server.add_argument("--tokens", type=int, default=20)
+    server.add_argument("--tool-call-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    stages = [int(s) for s in args.stages.split(",")]
+    process = None
+    base_url = args.base_url
+    if args.spawn_server:
+        process, base_url = spawn_server(args)
+
+    # enough pooled connections that the pool itself is never the limit
+    configure_transport(
+        max_connections=max(stages) * 2, max_keepalive_connections=max(stages)
+    )
+
+    results = []
+    try:
+        if args.use_async:
+            swarm = AsyncSwarm(
+                client=AsyncOpenAI(
+                    api_key="dummy_key",
+                    base_url=base_url,
+                    http_client=get_async_http_client(),
+                )
+            )
+
+            async def ramp():
+                for concurrency in stages:
+                    start = time.perf_counter()
+                    samples = await run_stage_tasks(
+                        swarm, concurrency, args.duration, args.stream
+                    )
+                    wall_time = time.perf_counter() - start
+                    results.append(summarize(concurrency, wall_time, samples))
+                    print_table(results[-1:])
+
+            asyncio.run(ramp())
+        else:
+            swarm = Swarm(
+                client=OpenAI(
+                    api_key="dummy_key",
+                    base_url=base_url,
+                    http_client=get_http_client(),
+                )
+            )
+            for concurrency in stages:
+                start = time.perf_counter()
+                samples = run_stage_threads(
+                    swarm, concurrency, args.duration, args.stream
+                )
+                wall_time = time.perf_counter() - start
+                results.append(summarize(concurrency, wall_time, samples))
+                print_table(results[-1:])
+    finally:
+        if process:
+            process.terminate()
+
+    print()
+    print_table(results)
+    if args.json:
+        with open(args.json, "w") as file:
+            json.dump(results, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Local OpenAI-compatible fake of /v1/chat/completions for load testing.
+
+Answers the requests a default `Swarm()` client sends, including SSE
+streaming (with `stream_options.include_usage`) and scripted tool calls,
+with configurable latency and token-rate distributions. No model runs, so
+a single box can push framework overhead to its limit.
+
+    python -m benchmarks.loadtest.server --port 11434 \\
+        --ttft lognormal:-1.6,0.5 --token-rate uniform:40,80 --tool-call-rate 0.5
+"""
+
+import argparse
+import json
+import math
+import random
+import threading
+import time
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def parse_distribution(spec: str):
+    """
+    Parses a distribution spec into a sampler returning floats:
+    `fixed:X` (or just `X`), `uniform:LOW,HIGH`, `exp:MEAN`,
+    `normal:MEAN,STDDEV` (clamped at 0) or `lognormal:MU,SIGMA`.
+    """
+    kind, _, args = spec.partition(":")
+    if not args:
+        kind, args = "fixed", kind
+    values = [float(v) for v in args.split(",")]
+    match kind:
+        case "fixed":
+            return lambda: values[0]
+        case "uniform":
+            return lambda: random.uniform(values[0], values[1])
+        case "exp":
+            return lambda: random.expovariate(1 / values[0]) if values[0] else 0.0
+        case "normal":
+            return lambda: max(0.0, random.gauss(values[0], values[1]))
+        case "lognormal":
+            return lambda: random.lognormvariate(values[0], values[1])
+    raise ValueError(f"Unknown distribution: {spec}")
+
+
+class FakeModel:
+    """
+    Decides what the fake model answers and how fast: time to first token
+    from `ttft`, then `tokens` tokens at `token_rate` tokens/second. When the
+    request offers tools and the last message is from the user, the model
+    calls one of them with probability `tool_call_rate`.
+    """
+
+    def __init__(self, ttft, token_rate, tokens, tool_call_rate):
+        self.ttft = ttft
+        self.token_rate = token_rate
+        self.tokens = tokens
+        self.tool_call_rate = tool_call_rate
+
+    def plan(self, request: dict) -> dict:
+        tools = request.get("tools") or []
+        messages = request.get("messages") or []
+        tool_call = None
+        if (
+            tools
+            and messages
+            and messages[-1].get("role") == "user"
+            and random.random() < self.tool_call_rate
+        ):
+            function = random.choice(tools)["function"]
+            required = function.get("parameters", {}).get("required", [])
+            tool_call = {
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {
+                    "name": function["name"],
+                    "arguments": json.dumps({name: "x" for name in required}),
+                },
+            }
+        return {
+            "ttft": self.ttft(),
+            "token_interval": 1 / max(self.token_rate(), 1e-6),
+            "tokens": 0 if tool_call else self.tokens,
+            "tool_call": tool_call,
+            "prompt_tokens": sum(
+                math.ceil(len(str(m.get("content") or "")) / 4) for m in messages
+            ),
+        }
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    model: FakeModel = None
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_POST(self):
+        if not self.path.rstrip("/").endswith("/chat/completions"):
+            self.send_error(404)
+            return
+        request = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        plan = self.model.plan(request)
+        base = {
+            "id": f"chatcmpl-{uuid.uuid4().hex[:12]}",
+            "created": int(time.time()),
+            "model": request.get("model", "fake-model"),
+        }
+        usage = {
+            "prompt_tokens": plan["prompt_tokens"],
+            "completion_tokens": max(plan["tokens"], 1),
+            "total_tokens": plan["prompt_tokens"] + max(plan["tokens"], 1),
+        }
+        if request.get("stream"):
+            include_usage = (request.get("stream_options") or {}).get("include_usage")
+            self._stream(base, plan, usage if include_usage else None)
+        else:
+            self._complete(base, plan, usage)
+
+    def _complete(self, base, plan, usage):
+        time.sleep(plan["ttft"] + plan["tokens"] * plan["token_interval"])
+        message = {"role": "assistant", "content": "tok " * plan["tokens"]}
+        if plan["tool_call"]:
+            message = {"role": "assistant", "content": None}
+            message["tool_calls"] = [plan["tool_call"]]
+        body = json.dumps(
+            {
+                **base,
+                "object": "chat.completion",
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": message,
+                        "finish_reason": "tool_calls" if plan["tool_call"] else "stop",
+                    }
+                ],
+                "usage": usage,
+            }
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _stream(self, base, plan, usage):
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+
+        def send(data: str):
+            payload = f"data: {data}\n\n".encode()
+            self.wfile.write(f"{len(payload):x}\r\n".encode() + payload + b"\r\n")
+            self.wfile.flush()
+
+        def chunk(delta, finish_reason=None, choices=True, **extra):
+            return json.dumps(
+                {
+                    **base,
+                    "object": "chat.completion.chunk",
+                    "choices": (
+                        [{"index": 0, "delta": delta, "finish_reason": finish_reason}]
+                        if choices
+                        else []
+                    ),
+                    **extra,
+                }
+            )
+
+        time.sleep(plan["ttft"])
+        send(chunk({"role": "assistant", "content": ""}))
+        for _ in range(plan["tokens"]):
+            send(chunk({"content": "tok "}))
+            time.sleep(plan["token_interval"])
+        if plan["tool_call"]:
+            send(chunk({"tool_calls": [{"index": 0, **plan["tool_call"]}]}))
+        send(chunk({}, "tool_calls" if plan["tool_call"] else "stop"))
+        if usage:
+            send(chunk(None, choices=False, usage=usage))
+        send("[DONE]")
+        self.wfile.write(b"0\r\n\r\n")
+
+
+def serve(
+    host="127.0.0.1",
+    port=11434,
+    ttft="fixed:0.2",
+    token_rate="fixed:50",
+    tokens=20,
+    tool_call_rate=0.0,
+) -> ThreadingHTTPServer:
+    """
+    Starts the fake server on a background thread and returns it; call
+    `shutdown()` to stop it. The server's base URL is
+    `http://{host}:{server.server_port}/v1`.
+    """
+    handler = type(
+        "ConfiguredHandler",
+        (Handler,),
+        {
+            "model": FakeModel(
+                parse_distribution(ttft),
+                parse_distribution(token_rate),
+                tokens,
+                tool_call_rate,
+            )
+        },
+    )
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=11434)
+    parser.add_argument(
+        "--ttft", default="fixed:0.2", help="time to first token, seconds"
+    )
+    parser.add_argument(
+        "--token-rate", default="fixed:50", help="tokens per second after the first"
+    )
+    parser.add_argument("--tokens", type=int, default=20, help="tokens per answer")
+    parser.add_argument(
+        "--tool-call-rate",
+        type=float,
+        default=0.0,
+        help="probability of calling a tool when tools are offered",
+    )
+    args = parser.parse_args()
+
+    server = serve(
+        args.host,
+        args.port,
+        args.ttft,
+        args.token_rate,
+        args.tokens,
+        args.tool_call_rate,
+    )
+    print(f"Serving on http://{args.host}:{server.server_port}/v1", flush=True)
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
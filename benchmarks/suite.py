@@ -0,0 +1,240 @@
+"""
+Microbenchmarks of Swarm's core loop against an in-process fake client, so
+every number is framework overhead with zero model time.
+"""
+
+import gc
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timezone
+
+from swarm import Agent, Swarm
+from swarm.util import function_to_json, merge_chunk
+
+from .bench_history import make_history
+from .fake_client import FakeClient, completion, stream_chunks
+
+HISTORY_LENGTHS = [10, 100, 1000, 10000]
+TOOL_COUNTS = [1, 10, 100]
+HANDOFF_CHAIN_LENGTHS = [1, 5, 20]
+
+
+def make_tools(count: int) -> list:
+    tools = []
+    for i in range(count):
+
+        def tool(query: str, limit: int = 10, context_variables: dict = None):
+            """Looks something up."""
+            return "ok"
+
+        tool.__name__ = f"tool_{i}"
+        tools.append(tool)
+    return tools
+
+
+def make_handoff_chain(length: int) -> list:
+    agents = [Agent(name=f"Agent {i}") for i in range(length + 1)]
+    for current, following in zip(agents, agents[1:]):
+
+        def transfer_to_next(following=following):
+            return following
+
+        current.functions = [transfer_to_next]
+    return agents
+
+
+def measure(fn, min_time: float, max_iterations: int = 10_000) -> dict:
+    fn()  # warm up caches (tool plans, imports) outside the timed region
+    samples = []
+    deadline = time.perf_counter() + min_time
+    while time.perf_counter() < deadline and len(samples) < max_iterations:
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    fn()
+    after, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "iterations": len(samples),
+        "median_us": statistics.median(samples) * 1e6,
+        "mean_us": statistics.fmean(samples) * 1e6,
+        "min_us": min(samples) * 1e6,
+        "retained_bytes": after - before,
+        "peak_bytes": peak - before,
+    }
+
+
+def scenario(results, name, fn, turns=1, min_time=0.2, **params):
+    result = {"name": name, "params": params, "turns": turns}
+    result.update(measure(fn, min_time))
+    result["per_turn_us"] = result["median_us"] / turns
+    results.append(result)
+    print(
+        f"{name:<20} {str(params):<45} {result['per_turn_us']:>10.1f} us/turn "
+        f"{result['peak_bytes'] / 1024:>10.1f} KiB peak",
+        file=sys.stderr,
+    )
+
+
+def run_suite(min_time: float = 0.2, only: str = None) -> dict:
+    results = []
+
+    def wanted(name):
+        return only is None or only in name
+
+    messages = [{"role": "user", "content": "go"}]
+
+    if wanted("run.history"):
+        swarm = Swarm(client=FakeClient([completion("done")]))
+        agent = Agent()
+        for length in HISTORY_LENGTHS:
+            history = make_history(length)
+            scenario(
+                results,
+                "run.history",
+                lambda: swarm.run(agent, history),
+                min_time=min_time,
+                history_length=length,
+            )
+
+    if wanted("run.tools"):
+        swarm = Swarm(
+            client=FakeClient(
+                [
+                    completion(tool_calls=[("tool_0", {"query": "q"})]),
+                    completion("done"),
+                ]
+            )
+        )
+        for count in TOOL_COUNTS:
+            agent = Agent(functions=make_tools(count))
+            scenario(
+                results,
+                "run.tools",
+                lambda: swarm.run(agent, messages),
+                turns=2,
+                min_time=min_time,
+                tool_count=count,
+            )
+
+    if wanted("run.handoffs"):
+        for length in HANDOFF_CHAIN_LENGTHS:
+            agents = make_handoff_chain(length)
+            swarm = Swarm(
+                client=FakeClient(
+                    [completion(tool_calls=[("transfer_to_next", {})])] * length
+                    + [completion("done")]
+                )
+            )
+            scenario(
+                results,
+                "run.handoffs",
+                lambda: swarm.run(agents[0], messages),
+                turns=length + 1,
+                min_time=min_time,
+                chain_length=length,
+            )
+
+    if wanted("run_and_stream"):
+        swarm = Swarm(client=FakeClient([stream_chunks(["tok "] * 100)]))
+        agent = Agent()
+        for length in HISTORY_LENGTHS:
+            history = make_history(length)
+            scenario(
+                results,
+                "run_and_stream",
+                lambda: list(swarm.run_and_stream(agent, history)),
+                min_time=min_time,
+                history_length=length,
+                stream_tokens=100,
+            )
+
+    if wanted("handle_tool_calls"):
+        swarm = Swarm(client=FakeClient([completion("done")]))
+        for count in TOOL_COUNTS:
+            agent = Agent(functions=make_tools(count))
+            tool_calls = (
+                completion(
+                    tool_calls=[(f"tool_{i}", {"query": "q"}) for i in range(count)]
+                )
+                .choices[0]
+                .message.tool_calls
+            )
+            scenario(
+                results,
+                "handle_tool_calls",
+                lambda: swarm.handle_tool_calls(tool_calls, agent, {}, False),
+                min_time=min_time,
+                tool_calls=count,
+            )
+
+    if wanted("function_to_json"):
+        for count in TOOL_COUNTS:
+            tools = make_tools(count)
+            scenario(
+                results,
+                "function_to_json",
+                lambda: [function_to_json(tool) for tool in tools],
+                min_time=min_time,
+                functions=count,
+            )
+
+    if wanted("merge_chunk"):
+        chunks = [
+            chunk.choices[0].delta.model_dump(mode="json")
+            for chunk in stream_chunks(
+                ["tok "] * 1000,
+                tool_calls=[("tool_0", {"query": "x" * 4000})],
+                argument_fragments=1000,
+            )
+        ]
+
+        def merge_all():
+            message = {
+                "content": "",
+                "tool_calls": defaultdict(
+                    lambda: {
+                        "function": {"arguments": "", "name": ""},
+                        "id": "",
+                        "type": "",
+                    }
+                ),
+            }
+            for delta in chunks:
+                merge_chunk(message, {**delta, "tool_calls": _fresh_tool_calls(delta)})
+
+        scenario(
+            results,
+            "merge_chunk",
+            merge_all,
+            min_time=min_time,
+            chunks=len(chunks),
+        )
+
+    return {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "min_time": min_time,
+        },
+        "results": results,
+    }
+
+
+def _fresh_tool_calls(delta):
+    # merge_chunk pops "index" from tool-call deltas, so hand it fresh ones
+    tool_calls = delta.get("tool_calls")
+    if not tool_calls:
+        return tool_calls
+    return [{**t, "function": dict(t["function"])} for t in tool_calls]
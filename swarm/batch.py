@@ -0,0 +1,201 @@
+import asyncio
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Iterable, List, Optional
+
+from .types import Response
+
+
+@dataclass
+class BatchResult:
+    """
+    Outcome of one job in a batch. `index` is the job's position in the input
+    iterable; exactly one of `response` and `error` is set.
+    """
+
+    index: int
+    response: Optional[Response] = None
+    error: Optional[BaseException] = None
+    latency: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class BatchStats:
+    jobs: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    wall_time: float = 0.0
+    throughput: float = 0.0
+    latency_mean: float = 0.0
+    latency_p50: float = 0.0
+    latency_p95: float = 0.0
+    latency_p99: float = 0.0
+    latency_max: float = 0.0
+
+    def __str__(self) -> str:
+        return (
+            f"{self.jobs} jobs ({self.failed} failed) in {self.wall_time:.2f}s, "
+            f"{self.throughput:.1f} jobs/s, latency "
+            f"p50={self.latency_p50:.3f}s p95={self.latency_p95:.3f}s "
+            f"p99={self.latency_p99:.3f}s max={self.latency_max:.3f}s"
+        )
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+class BatchRun:
+    """
+    Results of `Swarm.run_batch`, yielded in completion order as jobs finish.
+    Iterate with `for` (or `async for` under `AsyncSwarm`); `stats` is set
+    once iteration is exhausted.
+    """
+
+    def __init__(self):
+        self.stats: Optional[BatchStats] = None
+        self._results = None
+        self._latencies = []
+        self._failed = 0
+        self._start = None  # set when iteration begins
+
+    def __iter__(self):
+        return self._results
+
+    def __aiter__(self):
+        return self._results
+
+    def _record(self, result: BatchResult) -> BatchResult:
+        self._latencies.append(result.latency)
+        if not result.ok:
+            self._failed += 1
+        return result
+
+    def _finish(self) -> None:
+        wall_time = time.perf_counter() - self._start
+        latencies = sorted(self._latencies)
+        jobs = len(latencies)
+        self.stats = BatchStats(
+            jobs=jobs,
+            succeeded=jobs - self._failed,
+            failed=self._failed,
+            wall_time=wall_time,
+            throughput=jobs / wall_time if wall_time else 0.0,
+            latency_mean=sum(latencies) / jobs if jobs else 0.0,
+            latency_p50=percentile(latencies, 0.50),
+            latency_p95=percentile(latencies, 0.95),
+            latency_p99=percentile(latencies, 0.99),
+            latency_max=latencies[-1] if latencies else 0.0,
+        )
+        self._latencies = []
+
+
+def job_kwargs(job) -> dict:
+    """
+    Normalizes a batch job, given as (agent, messages), (agent, messages,
+    context_variables) or a dict of `run` keyword arguments.
+    """
+    if isinstance(job, dict):
+        return dict(job)
+    agent, messages, *rest = job
+    kwargs = {"agent": agent, "messages": messages}
+    if rest:
+        kwargs["context_variables"] = rest[0]
+    return kwargs
+
+
+def run_batch(swarm, jobs: Iterable, max_concurrency: int, run_kwargs: dict):
+    batch = BatchRun()
+    batch._results = _run_threaded(swarm, jobs, max_concurrency, run_kwargs, batch)
+    return batch
+
+
+def run_batch_async(swarm, jobs: Iterable, max_concurrency: int, run_kwargs: dict):
+    batch = BatchRun()
+    batch._results = _run_tasks(swarm, jobs, max_concurrency, run_kwargs, batch)
+    return batch
+
+
+def _run_job(swarm, index: int, job, run_kwargs: dict) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        response = swarm.run(**{**run_kwargs, **job_kwargs(job)})
+        return BatchResult(index, response, latency=time.perf_counter() - start)
+    except Exception as e:
+        return BatchResult(index, error=e, latency=time.perf_counter() - start)
+
+
+async def _run_job_async(swarm, index: int, job, run_kwargs: dict) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        response = await swarm.run(**{**run_kwargs, **job_kwargs(job)})
+        return BatchResult(index, response, latency=time.perf_counter() - start)
+    except Exception as e:
+        return BatchResult(index, error=e, latency=time.perf_counter() - start)
+
+
+def _run_threaded(swarm, jobs, max_concurrency, run_kwargs, batch):
+    # only max_concurrency jobs are pulled from the iterable at a time, so
+    # arbitrarily long (or lazy) job streams run in constant memory
+    batch._start = time.perf_counter()
+    jobs = enumerate(jobs)
+    with ThreadPoolExecutor(
+        max_workers=max_concurrency, thread_name_prefix="swarm-batch"
+    ) as executor:
+        in_flight = set()
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < max_concurrency:
+                try:
+                    index, job = next(jobs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                in_flight.add(
+                    executor.submit(_run_job, swarm, index, job, run_kwargs)
+                )
+            if not in_flight:
+                break
+            done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield batch._record(future.result())
+    batch._finish()
+
+
+async def _run_tasks(swarm, jobs, max_concurrency, run_kwargs, batch):
+    batch._start = time.perf_counter()
+    jobs = enumerate(jobs)
+    in_flight = set()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(in_flight) < max_concurrency:
+                try:
+                    index, job = next(jobs)
+                except StopIteration:
+                    exhausted = True
+                    break
+                in_flight.add(
+                    asyncio.ensure_future(
+                        _run_job_async(swarm, index, job, run_kwargs)
+                    )
+                )
+            if not in_flight:
+                break
+            done, in_flight = await asyncio.wait(
+                in_flight, return_when=asyncio.FIRST_COMPLETED
+            )
+            for task in done:
+                yield batch._record(task.result())
+    finally:
+        for task in in_flight:
+            task.cancel()
+    batch._finish()
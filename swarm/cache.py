@@ -0,0 +1,189 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+
+def request_key(params: dict) -> str:
+    """
+    Stable content hash of a chat completion request (model, messages, tools,
+    and every other create parameter but the transport `timeout`).
+    """
+    if "timeout" in params:
+        params = {k: v for k, v in params.items() if k != "timeout"}
+    canonical = json.dumps(
+        params, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheStats:
+    memory_hits: int = 0
+    disk_hits: int = 0
+    misses: int = 0
+
+    @property
+    def hits(self) -> int:
+        return self.memory_hits + self.disk_hits
+
+
+class CompletionCache:
+    """
+    Caches chat completions by request content, in front of
+    `Swarm.get_chat_completion`.
+
+    Entries live in an in-memory LRU bounded to `max_bytes` of serialized
+    payload and, when `path` is given, in a sqlite file that persists across
+    processes. `ttl` (seconds) expires entries in both tiers. Streamed
+    requests are cached as their full chunk sequence and replayed as a
+    stream; only streams that ran to completion are stored.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        path: Optional[str] = None,
+        ttl: Optional[float] = None,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.stats = CacheStats()
+        self._memory = OrderedDict()  # key -> (payload, stored_at)
+        self._memory_bytes = 0
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS completions "
+                "(key TEXT PRIMARY KEY, payload TEXT NOT NULL, stored_at REAL NOT NULL)"
+            )
+            self._db.commit()
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def get(self, key: str) -> Optional[str]:
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if not self._expired(entry[1]):
+                    self._memory.move_to_end(key)
+                    self.stats.memory_hits += 1
+                    return entry[0]
+                self._evict(key)
+
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT payload, stored_at FROM completions WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    if not self._expired(row[1]):
+                        self._remember(key, row[0], row[1])
+                        self.stats.disk_hits += 1
+                        return row[0]
+                    self._db.execute("DELETE FROM completions WHERE key = ?", (key,))
+                    self._db.commit()
+
+            self.stats.misses += 1
+            return None
+
+    def put(self, key: str, payload: str) -> None:
+        stored_at = time.time()
+        with self._lock:
+            self._remember(key, payload, stored_at)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO completions VALUES (?, ?, ?)",
+                    (key, payload, stored_at),
+                )
+                self._db.commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if self._db is not None:
+                self._db.execute("DELETE FROM completions")
+                self._db.commit()
+
+    def _remember(self, key: str, payload: str, stored_at: float) -> None:
+        if key in self._memory:
+            self._evict(key)
+        if len(payload) > self.max_bytes:
+            return
+        self._memory[key] = (payload, stored_at)
+        self._memory_bytes += len(payload)
+        while self._memory_bytes > self.max_bytes:
+            self._evict(next(iter(self._memory)))
+
+    def _evict(self, key: str) -> None:
+        payload, _ = self._memory.pop(key)
+        self._memory_bytes -= len(payload)
+
+    def complete(self, client, create_params: dict, **options):
+        """
+        Returns the cached completion for `create_params`, or calls
+        `client.chat.completions.create` (with `options` such as `timeout`,
+        which are not part of the key) and caches the result.
+        """
+        key = request_key(create_params)
+        payload = self.get(key)
+        if payload is not None:
+            return _load(payload, create_params["stream"])
+
+        completion = client.chat.completions.create(**create_params, **options)
+        if create_params["stream"]:
+            return self._record_stream(key, completion)
+        self.put(key, completion.model_dump_json())
+        return completion
+
+    async def acomplete(self, client, create_params: dict, **options):
+        key = request_key(create_params)
+        payload = self.get(key)
+        if payload is not None:
+            if create_params["stream"]:
+                return _replay_async(_load(payload, True))
+            return _load(payload, False)
+
+        completion = await client.chat.completions.create(**create_params, **options)
+        if create_params["stream"]:
+            return self._record_stream_async(key, completion)
+        self.put(key, completion.model_dump_json())
+        return completion
+
+    def _record_stream(self, key, stream):
+        chunks = []
+        for chunk in stream:
+            chunks.append(chunk.model_dump(mode="json"))
+            yield chunk
+        self.put(key, json.dumps(chunks))
+
+    async def _record_stream_async(self, key, stream):
+        chunks = []
+        async for chunk in stream:
+            chunks.append(chunk.model_dump(mode="json"))
+            yield chunk
+        self.put(key, json.dumps(chunks))
+
+
+def _load(payload: str, stream: bool):
+    if stream:
+        return iter(
+            [ChatCompletionChunk.model_validate(c) for c in json.loads(payload)]
+        )
+    return ChatCompletion.model_validate_json(payload)
+
+
+async def _replay_async(chunks):
+    for chunk in chunks:
+        yield chunk
@@ -0,0 +1,175 @@
+import asyncio
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from types import SimpleNamespace
+
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from .cache import request_key
+
+CASSETTE_VERSION = 1
+
+
+class CassetteMissError(LookupError):
+    pass
+
+
+class RecordingClient:
+    """
+    Wraps a real (sync) OpenAI client and records every chat completion
+    request together with its full response into a cassette file. Streamed
+    responses are stored chunk by chunk with the delay before each chunk, the
+    first delay being the time to first token.
+
+    The cassette is rewritten after every completed interaction, so it is
+    usable even if the recording process is interrupted.
+    """
+
+    def __init__(self, client, path: str):
+        self.client = client
+        self.path = path
+        self.interactions = []
+        self._lock = threading.Lock()
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, **params):
+        start = time.perf_counter()
+        response = self.client.chat.completions.create(**params)
+        if params.get("stream"):
+            return self._record_stream(params, start, response)
+        self._add(params, latency=time.perf_counter() - start, response=response)
+        return response
+
+    def _record_stream(self, params, start, stream):
+        chunks = []
+        last = start
+        for chunk in stream:
+            now = time.perf_counter()
+            chunks.append({"delay": now - last, "chunk": chunk.model_dump(mode="json")})
+            last = now
+            yield chunk
+        self._add(params, latency=chunks[0]["delay"] if chunks else 0.0, chunks=chunks)
+
+    def _add(self, params, latency, response=None, chunks=None) -> None:
+        interaction = {
+            "key": request_key(params),
+            "request": json.loads(json.dumps(params, default=str)),
+            "stream": bool(params.get("stream")),
+            "latency": latency,
+            "response": response.model_dump(mode="json") if response else None,
+            "chunks": chunks,
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+            self.save()
+
+    def save(self) -> None:
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, "w") as file:
+            json.dump(
+                {"version": CASSETTE_VERSION, "interactions": self.interactions}, file
+            )
+        os.replace(tmp_path, self.path)
+
+
+class AsyncRecordingClient(RecordingClient):
+    """`RecordingClient` for `AsyncOpenAI` clients."""
+
+    async def create(self, **params):
+        start = time.perf_counter()
+        response = await self.client.chat.completions.create(**params)
+        if params.get("stream"):
+            return self._record_stream_async(params, start, response)
+        self._add(params, latency=time.perf_counter() - start, response=response)
+        return response
+
+    async def _record_stream_async(self, params, start, stream):
+        chunks = []
+        last = start
+        async for chunk in stream:
+            now = time.perf_counter()
+            chunks.append({"delay": now - last, "chunk": chunk.model_dump(mode="json")})
+            last = now
+            yield chunk
+        self._add(params, latency=chunks[0]["delay"] if chunks else 0.0, chunks=chunks)
+
+
+class ReplayClient:
+    """
+    Drop-in replacement for `OpenAI()` that answers from a cassette written
+    by `RecordingClient`, without any network access.
+
+    Requests are matched to recorded interactions by content; identical
+    requests are answered in recorded order. With `match="sequence"` the
+    interactions are returned in recorded order regardless of the request.
+    With `realtime=True` the recorded latency and inter-chunk timing are
+    reproduced, otherwise responses are returned as fast as possible.
+    """
+
+    def __init__(self, path: str, realtime: bool = False, match: str = "request"):
+        if match not in ("request", "sequence"):
+            raise ValueError(f"Unknown match mode: {match}")
+        with open(path) as file:
+            cassette = json.load(file)
+        self.interactions = cassette["interactions"]
+        self.realtime = realtime
+        self.match = match
+        self.calls = 0
+        self._lock = threading.Lock()
+        self._by_key = defaultdict(deque)
+        for interaction in self.interactions:
+            self._by_key[interaction["key"]].append(interaction)
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def _next(self, params) -> dict:
+        with self._lock:
+            self.calls += 1
+            if self.match == "sequence":
+                if self.calls > len(self.interactions):
+                    raise CassetteMissError(
+                        f"Cassette has only {len(self.interactions)} interactions"
+                    )
+                return self.interactions[self.calls - 1]
+            queue = self._by_key.get(request_key(params))
+            if not queue:
+                raise CassetteMissError(
+                    f"No recorded interaction for request to model {params.get('model')!r}"
+                )
+            return queue.popleft()
+
+    def create(self, **params):
+        interaction = self._next(params)
+        if interaction["stream"]:
+            return self._replay_stream(interaction)
+        if self.realtime:
+            time.sleep(interaction["latency"])
+        return ChatCompletion.model_validate(interaction["response"])
+
+    def _replay_stream(self, interaction):
+        for entry in interaction["chunks"]:
+            if self.realtime:
+                time.sleep(entry["delay"])
+            yield ChatCompletionChunk.model_validate(entry["chunk"])
+
+
+class AsyncReplayClient(ReplayClient):
+    """`ReplayClient` standing in for `AsyncOpenAI()`."""
+
+    async def create(self, **params):
+        interaction = self._next(params)
+        if interaction["stream"]:
+            return self._replay_stream_async(interaction)
+        if self.realtime:
+            await asyncio.sleep(interaction["latency"])
+        return ChatCompletion.model_validate(interaction["response"])
+
+    async def _replay_stream_async(self, interaction):
+        for entry in interaction["chunks"]:
+            if self.realtime:
+                await asyncio.sleep(entry["delay"])
+            yield ChatCompletionChunk.model_validate(entry["chunk"])
@@ -1,34 +1,433 @@
 # Standard library imports
-import copy
+import asyncio
+import inspect
 import json
-from collections import defaultdict
-from typing import List, Callable, Union
+import queue
+import threading
+import time
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Awaitable, Iterable, List, Callable, Optional, Tuple, Union
 
 # Package/library imports
-from openai import OpenAI
-
+from openai import AsyncOpenAI, BadRequestError, OpenAI
 
 # Local imports
-from .util import function_to_json, debug_print, merge_chunk
+from .batch import BatchRun, run_batch, run_batch_async
+from .cache import CompletionCache
+from .deadline import Deadline, DeadlineExceeded, deadline_for
+from .hooks import RunHooks, RunObserver
+from .layout import PromptLayout
+from .log import log_debug
+from .profiling import RunProfiler, profiler_for
+from .state import ContextVariables, ContextView
+from .streaming import StreamAccumulator, tool_call_objects
+from .tools import ToolPlan, __CTX_VARS_NAME__, get_tool_plan
+from .transport import DEFAULT_BASE_URL, get_async_http_client, get_http_client
+from .util import run_coroutine_sync
 from .types import (
     Agent,
     AgentFunction,
+    Budget,
     ChatCompletionMessage,
     ChatCompletionMessageToolCall,
-    Function,
     Response,
     Result,
+    RunUsage,
 )
 
-__CTX_VARS_NAME__ = "context_variables"
+
+async def _gather(awaitables: Iterable[Awaitable]) -> list:
+    return await asyncio.gather(*awaitables)
+
+
+def _render(instructions, context_variables: dict) -> Optional[str]:
+    if callable(instructions):
+        return instructions(ContextView(context_variables))
+    return instructions
+
+
+def _request_client(client, deadline: Optional[Deadline]) -> Tuple[object, dict]:
+    """
+    The client and extra create() options for a request made under
+    `deadline`: the time left as the timeout, and no retries, which would
+    each get the full timeout again.
+    """
+    remaining = deadline.remaining() if deadline is not None else None
+    if remaining is None:
+        return client, {}
+    # the OpenAI client rejects a zero timeout
+    timeout = max(remaining, 0.001)
+    with_options = getattr(client, "with_options", None)
+    if with_options is None:
+        return client, {"timeout": timeout}
+    return with_options(max_retries=0, timeout=timeout), {}
+
+
+def _rejects_stream_options(error: BadRequestError) -> bool:
+    # only a 400 about stream_options itself is worth retrying without it
+    return "stream_options" in f"{error.message} {error.body}"
+
+
+def _stopped_tool(
+    tool_call: ChatCompletionMessageToolCall,
+    deadline: Optional[Deadline],
+    tool_timeout: Optional[float],
+) -> Result:
+    name = tool_call.function.name
+    if deadline is not None and deadline.cancelled:
+        value = f"Error: Tool {name} was cancelled."
+    elif deadline is not None and deadline.expired:
+        value = f"Error: Tool {name} ran past the run deadline."
+    else:
+        value = f"Error: Tool {name} timed out after {tool_timeout:g}s."
+    return Result.model_construct(value=value)
+
+
+async def _await_tool(
+    awaitable: Awaitable,
+    tool_call: ChatCompletionMessageToolCall,
+    deadline: Optional[Deadline],
+    tool_timeout: Optional[float],
+):
+    task = asyncio.ensure_future(awaitable)
+    if deadline is None:
+        deadline = Deadline()
+    if await deadline.wait_for_async(task, tool_timeout):
+        return task.result()
+    task.cancel()
+    return _stopped_tool(tool_call, deadline, tool_timeout)
+
+
+def _apply_budgets(
+    budget: Optional[Budget],
+    agent: Agent,
+    usage: RunUsage,
+    model_override: Optional[str],
+    debug: bool,
+) -> Tuple[Optional[str], bool]:
+    """
+    Checks the agent's and the run's budgets before a completion. Returns the
+    model override to use, and False if a budget without a fallback ran out.
+    """
+    if budget is None and agent.budget is None:
+        return model_override, True
+    checks = [(budget, usage)]
+    if agent.budget is not None:
+        checks.insert(0, (agent.budget, usage.by_agent.get(agent.name)))
+    for limits, spent in checks:
+        if limits is None or spent is None:
+            continue
+        exceeded = limits.exceeded(spent)
+        if exceeded is None:
+            continue
+        log_debug(
+            debug,
+            "Budget reached",
+            agent=agent.name,
+            limit=exceeded,
+            fallback_model=limits.fallback_model,
+        )
+        if limits.fallback_model is None:
+            return model_override, False
+        model_override = limits.fallback_model
+    return model_override, True
+
+
+def _cut_off(deadline: Optional[Deadline]) -> bool:
+    # errors raised once the deadline has passed end the run, not fail it
+    return deadline is not None and deadline.done
+
+
+def _close_stream(stream) -> None:
+    close = getattr(stream, "close", None)
+    if close is not None:
+        close()
+
+
+async def _aclose_stream(stream) -> None:
+    close = getattr(stream, "aclose", None) or getattr(stream, "close", None)
+    if close is not None:
+        result = close()
+        if inspect.isawaitable(result):
+            await result
+
+
+class _Run:
+    """
+    State of one run, shared by the turn loops of `Swarm` and `AsyncSwarm`:
+    the checks before each turn (max_turns, deadline, budget) and what
+    happens to a completion and its tool results. The loops only differ in
+    how they await completions and tools and what they yield.
+    """
+
+    def __init__(
+        self,
+        swarm: "Swarm",
+        agent: Agent,
+        messages: List,
+        context_variables: dict,
+        model_override: Optional[str],
+        debug: bool,
+        max_turns,
+        execute_tools: bool,
+        profile,
+        deadline: Union[float, Deadline, None],
+        tool_timeout: Optional[float],
+        budget: Optional[Budget],
+    ):
+        self.agent = agent
+        # isolate caller data without eagerly deep-copying it: swarm never
+        # mutates message dicts, and context_variables copy on first read
+        self.context_variables = ContextVariables(context_variables)
+        self.history = list(messages)
+        self.init_len = len(messages)
+        self.model_override = model_override
+        self.model = model_override
+        self.debug = debug
+        self.max_turns = max_turns
+        self.execute_tools = execute_tools
+        self.deadline = deadline_for(deadline)
+        self.tool_timeout = tool_timeout
+        self.budget = budget
+        self.stop_reason = None
+        self.observer = swarm.observe_run(agent, profile)
+
+    @property
+    def timed_out(self) -> bool:
+        return _cut_off(self.deadline)
+
+    def next_turn(self) -> bool:
+        """Starts the next turn, or returns False if the run is over."""
+        if len(self.history) - self.init_len >= self.max_turns or not self.agent:
+            return False
+        if self.timed_out:
+            self.stop_reason = self.deadline.reason
+            return False
+        self.model, within_budget = _apply_budgets(
+            self.budget,
+            self.agent,
+            self.observer.usage,
+            self.model_override,
+            self.debug,
+        )
+        if not within_budget:
+            self.stop_reason = "budget"
+            return False
+        self.observer.turn += 1
+        self.observer.emit("turn_start")
+        return True
+
+    def end_turn(self, stop_reason: Optional[str] = None) -> None:
+        if stop_reason is not None:
+            self.stop_reason = stop_reason
+        self.observer.emit("turn_end", since="turn_start")
+
+    def completion_args(self, stream: bool) -> dict:
+        return dict(
+            agent=self.agent,
+            history=self.history,
+            context_variables=self.context_variables,
+            model_override=self.model,
+            stream=stream,
+            debug=self.debug,
+            observer=self.observer,
+            deadline=self.deadline,
+        )
+
+    def chunk(self, accumulator: StreamAccumulator, chunk) -> Optional[dict]:
+        # no id yet means this is the first chunk of the completion
+        if accumulator.id is None:
+            self.observer.emit("first_token", message_id=chunk.id, model=chunk.model)
+        if self.observer.wants_chunks:
+            self.observer.emit("chunk", message_id=chunk.id, data=chunk)
+        return accumulator.add_chunk(chunk)
+
+    def received(self, message: dict, message_id, model, usage) -> bool:
+        """Records a completion; returns whether its tool calls should run."""
+        log_debug(self.debug, "Received completion", message=message)
+        self.history.append(message)
+        self.observer.emit(
+            "completion",
+            since="request_sent",
+            message_id=message_id,
+            model=model,
+            usage=usage,
+            data=message,
+        )
+        if not message["tool_calls"] or not self.execute_tools:
+            log_debug(self.debug, "Ending turn")
+            self.end_turn()
+            return False
+        return True
+
+    def tool_args(self) -> dict:
+        return dict(
+            functions=get_tool_plan(self.agent),
+            context_variables=self.context_variables,
+            debug=self.debug,
+            observer=self.observer,
+            deadline=self.deadline,
+            tool_timeout=self.tool_timeout,
+        )
+
+    def apply(self, partial_response: Response) -> None:
+        """Merges a turn's tool results, switching agents on a handoff."""
+        self.history.extend(partial_response.messages)
+        self.context_variables.update(partial_response.context_variables)
+        if partial_response.agent:
+            self.agent = partial_response.agent
+            self.observer.handoff(self.agent.name)
+        self.end_turn()
+
+    def fail(self, error: BaseException) -> None:
+        self.observer.emit("run_end", since="run", error=error)
+
+    def response(self) -> Response:
+        response = Response.model_construct(
+            messages=self.history[self.init_len :],
+            agent=self.agent,
+            context_variables=self.context_variables.to_dict(),
+            usage=self.observer.usage,
+            stop_reason=self.stop_reason,
+        )
+        self.observer.emit("run_end", since="run", data=response)
+        return response
+
+
+_CHUNK, _END, _ERROR, _STOP = range(4)
+
+
+def _until_deadline(stream, deadline: Optional[Deadline]):
+    """
+    Iterates `stream` on a helper thread, so the run stops waiting on it as
+    soon as the deadline passes or is cancelled: the request timeout only
+    bounds each read, not the whole stream. Closing the returned iterator
+    has the helper thread close the stream.
+    """
+    if deadline is None:
+        return stream
+    return _read_until(stream, deadline)
+
+
+def _read_until(stream, deadline: Deadline):
+    chunks = queue.SimpleQueue()
+    stop = threading.Event()
+
+    def pump():
+        try:
+            for chunk in stream:
+                chunks.put((_CHUNK, chunk))
+                if stop.is_set():
+                    break
+            chunks.put((_END, None))
+        except BaseException as e:
+            chunks.put((_ERROR, e))
+        finally:
+            if stop.is_set():
+                _close_stream(stream)
+
+    threading.Thread(target=pump, name="swarm-stream", daemon=True).start()
+    forget = deadline.on_cancel(lambda: chunks.put((_STOP, None)))
+    try:
+        while True:
+            try:
+                kind, value = chunks.get(timeout=deadline.remaining())
+            except queue.Empty:
+                kind, value = _STOP, None
+            if kind == _CHUNK:
+                yield value
+            elif kind == _END:
+                return
+            elif kind == _ERROR:
+                raise value
+            else:
+                deadline.check()
+    finally:
+        forget()
+        stop.set()
+
+
+def _auntil_deadline(stream, deadline: Optional[Deadline]):
+    """`_until_deadline` for async streams, without a helper thread."""
+    if deadline is None:
+        return stream
+    return _aread_until(stream, deadline)
+
+
+async def _aread_until(stream, deadline: Deadline):
+    chunks = aiter(stream)
+    try:
+        while True:
+            read = asyncio.ensure_future(anext(chunks))
+            while not await deadline.wait_for_async(read):
+                if deadline.done:
+                    read.cancel()
+                    await asyncio.wait((read,))
+                    raise DeadlineExceeded(f"Run stopped: {deadline.reason}")
+            try:
+                chunk = read.result()
+            except StopAsyncIteration:
+                return
+            yield chunk
+    finally:
+        await _aclose_stream(stream)
 
 
 class Swarm:
-    def __init__(self, client=None):
+    def __init__(
+        self,
+        client=None,
+        tool_executor: Union[Executor, int] = None,
+        cache: Optional[CompletionCache] = None,
+        context_window: Optional[Callable[[List], List]] = None,
+        prompt_layout: Optional[PromptLayout] = None,
+        hooks: Optional[List[RunHooks]] = None,
+        stream_usage: bool = True,
+    ):
         if not client:
-            client = OpenAI(api_key="dummy_key")
-            client.base_url = "http://localhost:11434/v1"
+            client = OpenAI(
+                api_key="dummy_key",
+                base_url=DEFAULT_BASE_URL,
+                http_client=get_http_client(),
+            )
         self.client = client
+        # threads for sync tools under a deadline or tool_timeout, when no
+        # tool_executor is given; created on first use
+        self._timeout_pool = None
+        self._timeout_pool_lock = threading.Lock()
+        # an int is shorthand for a thread pool of that many workers
+        if isinstance(tool_executor, int):
+            tool_executor = ThreadPoolExecutor(
+                max_workers=tool_executor, thread_name_prefix="swarm-tool"
+            )
+        self.tool_executor = tool_executor
+        self.cache = cache
+        # default context-window policy for agents that don't set their own
+        self.context_window = context_window
+        self.prompt_layout = prompt_layout
+        self.hooks = list(hooks or [])
+        # ask for token usage on streams; switched off by itself the first
+        # time the server rejects the option
+        self.stream_usage = stream_usage
+
+    def _timeout_executor(self) -> Executor:
+        # sync tools need a thread of their own for the run to stop waiting on
+        # them; a tool that hangs keeps its thread, so each Swarm has its own
+        if self.tool_executor is not None:
+            return self.tool_executor
+        with self._timeout_pool_lock:
+            if self._timeout_pool is None:
+                self._timeout_pool = ThreadPoolExecutor(thread_name_prefix="swarm-tool")
+            return self._timeout_pool
+
+    def observe_run(self, agent: Agent, profile=None) -> RunObserver:
+        hooks = self.hooks
+        profiler = profiler_for(profile)
+        if profiler is not None:
+            hooks = hooks + [profiler]
+        observer = RunObserver(hooks, agent.name)
+        observer.emit("run_start")
+        return observer
 
     def get_chat_completion(
         self,
@@ -38,23 +437,65 @@ class Swarm:
         model_override: str,
         stream: bool,
         debug: bool,
+        observer: Optional[RunObserver] = None,
+        deadline: Optional[Deadline] = None,
     ) -> ChatCompletionMessage:
-        context_variables = defaultdict(str, context_variables)
-        instructions = (
-            agent.instructions(context_variables)
-            if callable(agent.instructions)
-            else agent.instructions
+        create_params = self.build_create_params(
+            agent, history, context_variables, model_override, stream, debug
         )
-        messages = [{"role": "system", "content": instructions}] + history
-        debug_print(debug, "Getting chat completion for...:", messages)
+        if observer is not None:
+            observer.emit("request_sent", data=create_params)
+        client, options = _request_client(self.client, deadline)
+        try:
+            return self._create(client, create_params, options)
+        except BadRequestError as e:
+            if "stream_options" not in create_params or not _rejects_stream_options(e):
+                raise
+            # some OpenAI-compatible servers reject stream_options
+            del create_params["stream_options"]
+            completion = self._create(client, create_params, options)
+            self.stream_usage = False
+            log_debug(debug, "Server rejected stream_options; streaming without usage")
+            return completion
 
-        tools = [function_to_json(f) for f in agent.functions]
-        # hide context_variables from model
-        for tool in tools:
-            params = tool["function"]["parameters"]
-            params["properties"].pop(__CTX_VARS_NAME__, None)
-            if __CTX_VARS_NAME__ in params["required"]:
-                params["required"].remove(__CTX_VARS_NAME__)
+    def _create(self, client, create_params: dict, options: dict):
+        if self.cache is not None:
+            return self.cache.complete(client, create_params, **options)
+        return client.chat.completions.create(**create_params, **options)
+
+    def build_create_params(
+        self,
+        agent: Agent,
+        history: List,
+        context_variables: dict,
+        model_override: str,
+        stream: bool,
+        debug: bool,
+    ) -> dict:
+        instructions = _render(agent.instructions, context_variables)
+        extra = _render(agent.context_instructions, context_variables)
+        layout, volatile = self.prompt_layout, None
+        window = agent.context_window or self.context_window
+        if layout is None:
+            if extra:
+                instructions = f"{instructions}\n\n{extra}"
+            messages = [{"role": "system", "content": instructions}] + history
+            if window is not None:
+                messages = window(messages)
+        else:
+            # anything rendered from context_variables goes after the history
+            static, dynamic = (
+                (None, instructions)
+                if callable(agent.instructions)
+                else (instructions, None)
+            )
+            dynamic = "\n\n".join(filter(None, (dynamic, extra)))
+            messages = layout.messages(static, dynamic, history, window)
+            volatile = messages[-1] if dynamic else None
+        log_debug(debug, "Getting chat completion", agent=agent.name, messages=messages)
+
+        plan = get_tool_plan(agent)
+        tools = list(layout.tools(plan) if layout else plan.schemas)
 
         create_params = {
             "model": model_override or agent.model,
@@ -67,7 +508,15 @@ class Swarm:
         if tools:
             create_params["parallel_tool_calls"] = agent.parallel_tool_calls
 
-        return self.client.chat.completions.create(**create_params)
+        if stream and self.stream_usage:
+            # the token counts arrive in a final chunk without choices
+            create_params["stream_options"] = {"include_usage": True}
+
+        if layout is not None:
+            report = layout.report(agent.name, create_params, volatile)
+            log_debug(debug, "Prompt prefix", report=report)
+
+        return create_params
 
     def handle_function_result(self, result, debug) -> Result:
         match result:
@@ -75,62 +524,172 @@ class Swarm:
                 return result
 
             case Agent() as agent:
-                return Result(
+                return Result.model_construct(
                     value=json.dumps({"assistant": agent.name}),
                     agent=agent,
                 )
             case _:
                 try:
-                    return Result(value=str(result))
+                    return Result.model_construct(value=str(result))
                 except Exception as e:
                     error_message = f"Failed to cast response to string: {result}. Make sure agent functions return a string or Result object. Error: {str(e)}"
-                    debug_print(debug, error_message)
+                    log_debug(debug, error_message)
                     raise TypeError(error_message)
 
     def handle_tool_calls(
         self,
         tool_calls: List[ChatCompletionMessageToolCall],
-        functions: List[AgentFunction],
+        functions: Union[List[AgentFunction], ToolPlan],
         context_variables: dict,
         debug: bool,
+        observer: Optional[RunObserver] = None,
+        deadline: Optional[Deadline] = None,
+        tool_timeout: Optional[float] = None,
     ) -> Response:
-        function_map = {f.__name__: f for f in functions}
-        partial_response = Response(
-            messages=[], agent=None, context_variables={})
+        plan = get_tool_plan(functions)
+        bounded = deadline is not None or tool_timeout is not None
 
-        for tool_call in tool_calls:
-            name = tool_call.function.name
-            # handle missing tool case, skip to next tool
-            if name not in function_map:
-                debug_print(debug, f"Tool {name} not found in function map.")
-                partial_response.messages.append(
-                    {
-                        "role": "tool",
-                        "tool_call_id": tool_call.id,
-                        "tool_name": name,
-                        "content": f"Error: Tool {name} not found.",
-                    }
-                )
+        def call(tool_call):
+            return self.call_tool(tool_call, plan, context_variables, debug, deadline)
+
+        if observer is not None:
+            call = observer.observe_tool(call)
+
+        if bounded:
+            results = self._call_tools_bounded(call, tool_calls, deadline, tool_timeout)
+        elif self.tool_executor is not None and len(tool_calls) > 1:
+            # run independent tool calls concurrently; map() keeps call order
+            results = list(self.tool_executor.map(call, tool_calls))
+        else:
+            results = [call(tool_call) for tool_call in tool_calls]
+
+        # coroutine tools are awaited together on the background event loop
+        pending = [i for i, r in enumerate(results) if inspect.isawaitable(r)]
+        if pending:
+            if bounded:
+                for i in pending:
+                    results[i] = _await_tool(
+                        results[i], tool_calls[i], deadline, tool_timeout
+                    )
+            awaited = run_coroutine_sync(_gather(results[i] for i in pending))
+            for i, result in zip(pending, awaited):
+                results[i] = result
+
+        return self.merge_tool_results(tool_calls, results)
+
+    def _call_tools_bounded(
+        self,
+        call: Callable,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        deadline: Optional[Deadline],
+        tool_timeout: Optional[float],
+    ) -> list:
+        # a timed-out sync tool can't be stopped: its thread runs on in the
+        # background, and the model is told the call timed out
+        if deadline is None:
+            deadline = Deadline()
+        executor = self._timeout_executor()
+        together = self.tool_executor is not None and len(tool_calls) > 1
+        if together:
+            started = time.perf_counter()
+            futures = [executor.submit(call, tool_call) for tool_call in tool_calls]
+        results = []
+        for i, tool_call in enumerate(tool_calls):
+            if together:
+                future = futures[i]
+                limit = tool_timeout
+                if limit is not None:
+                    limit = max(0.0, started + limit - time.perf_counter())
+            elif deadline.done:
+                results.append(_stopped_tool(tool_call, deadline, tool_timeout))
                 continue
-            args = json.loads(tool_call.function.arguments)
-            debug_print(
-                debug, f"Processing tool call: {name} with arguments {args}")
+            else:
+                future = executor.submit(call, tool_call)
+                limit = tool_timeout
+            if deadline.wait_for(future, limit):
+                results.append(future.result())
+            else:
+                future.cancel()
+                results.append(_stopped_tool(tool_call, deadline, tool_timeout))
+        return results
+
+    def call_tool(
+        self,
+        tool_call: ChatCompletionMessageToolCall,
+        plan: ToolPlan,
+        context_variables: dict,
+        debug: bool,
+        deadline: Optional[Deadline] = None,
+    ) -> Union[Result, Awaitable[Result], None]:
+        name = tool_call.function.name
+        # handle missing tool case, skip to next tool
+        if name not in plan.function_map:
+            log_debug(debug, "Tool not found in function map", tool=name)
+            return None
+        args = json.loads(tool_call.function.arguments)
+        log_debug(debug, "Processing tool call", tool=name, arguments=dict(args))
+
+        func = plan.function_map[name]
+        # pass context_variables to agent functions
+        if name in plan.takes_context:
+            args[__CTX_VARS_NAME__] = context_variables
+        deadline_param = plan.takes_deadline.get(name)
+        if deadline_param is not None:
+            args[deadline_param] = deadline
+        try:
+            raw_result = func(**args)
+        except DeadlineExceeded:
+            # a tool stopping itself through the deadline doesn't fail the run
+            if not _cut_off(deadline):
+                raise
+            return _stopped_tool(tool_call, deadline, None)
+
+        # async def tools hand back a coroutine, resolved by the caller
+        if inspect.isawaitable(raw_result):
+            return self._await_function_result(raw_result, tool_call, debug, deadline)
+        return self.handle_function_result(raw_result, debug)
+
+    async def _await_function_result(
+        self,
+        raw_result,
+        tool_call: ChatCompletionMessageToolCall,
+        debug: bool,
+        deadline: Optional[Deadline] = None,
+    ) -> Result:
+        try:
+            return self.handle_function_result(await raw_result, debug)
+        except DeadlineExceeded:
+            if not _cut_off(deadline):
+                raise
+            return _stopped_tool(tool_call, deadline, None)
 
-            func = function_map[name]
-            # pass context_variables to agent functions
-            if __CTX_VARS_NAME__ in func.__code__.co_varnames:
-                args[__CTX_VARS_NAME__] = context_variables
-            raw_result = function_map[name](**args)
+    def merge_tool_results(
+        self,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        results: List[Optional[Result]],
+    ) -> Response:
+        # merge in tool_call order, so later calls win on conflicting
+        # context_variables and the last handoff decides the next agent
+        partial_response = Response.model_construct(
+            messages=[], agent=None, context_variables={}
+        )
 
-            result: Result = self.handle_function_result(raw_result, debug)
+        for tool_call, result in zip(tool_calls, results):
+            name = tool_call.function.name
             partial_response.messages.append(
                 {
                     "role": "tool",
                     "tool_call_id": tool_call.id,
                     "tool_name": name,
-                    "content": result.value,
+                    "content": (
+                        result.value
+                        if result is not None
+                        else f"Error: Tool {name} not found."
+                    ),
                 }
             )
+            if result is None:
+                continue
             partial_response.context_variables.update(result.context_variables)
             if result.agent:
                 partial_response.agent = result.agent
@@ -146,88 +705,80 @@ class Swarm:
         debug: bool = False,
         max_turns: int = float("inf"),
         execute_tools: bool = True,
+        profile: Union[bool, str, RunProfiler, None] = None,
+        deadline: Union[float, Deadline, None] = None,
+        tool_timeout: Optional[float] = None,
+        budget: Optional[Budget] = None,
     ):
-        active_agent = agent
-        context_variables = copy.deepcopy(context_variables)
-        history = copy.deepcopy(messages)
-        init_len = len(messages)
-
-        while len(history) - init_len < max_turns:
-
-            message = {
-                "content": "",
-                "sender": agent.name,
-                "role": "assistant",
-                "function_call": None,
-                "tool_calls": defaultdict(
-                    lambda: {
-                        "function": {"arguments": "", "name": ""},
-                        "id": "",
-                        "type": "",
-                    }
-                ),
-            }
-
-            # get completion with current history, agent
-            completion = self.get_chat_completion(
-                agent=active_agent,
-                history=history,
-                context_variables=context_variables,
-                model_override=model_override,
-                stream=True,
-                debug=debug,
-            )
+        run = _Run(
+            self,
+            agent,
+            messages,
+            context_variables,
+            model_override,
+            debug,
+            max_turns,
+            execute_tools,
+            profile,
+            deadline,
+            tool_timeout,
+            budget,
+        )
 
-            yield {"delim": "start"}
-            for chunk in completion:
-                delta = json.loads(chunk.choices[0].delta.json())
-                if delta["role"] == "assistant":
-                    delta["sender"] = active_agent.name
-                yield delta
-                delta.pop("role", None)
-                delta.pop("sender", None)
-                merge_chunk(message, delta)
-            yield {"delim": "end"}
-
-            message["tool_calls"] = list(
-                message.get("tool_calls", {}).values())
-            if not message["tool_calls"]:
-                message["tool_calls"] = None
-            debug_print(debug, "Received completion:", message)
-            history.append(message)
-
-            if not message["tool_calls"] or not execute_tools:
-                debug_print(debug, "Ending turn.")
-                break
-
-            # convert tool_calls to objects
-            tool_calls = []
-            for tool_call in message["tool_calls"]:
-                function = Function(
-                    arguments=tool_call["function"]["arguments"],
-                    name=tool_call["function"]["name"],
-                )
-                tool_call_object = ChatCompletionMessageToolCall(
-                    id=tool_call["id"], function=function, type=tool_call["type"]
+        try:
+            while run.next_turn():
+                accumulator = StreamAccumulator(run.agent.name)
+
+                # get completion with current history, agent
+                try:
+                    completion = self.get_chat_completion(
+                        **run.completion_args(stream=True)
+                    )
+                except Exception:
+                    if not run.timed_out:
+                        raise
+                    run.end_turn(run.deadline.reason)
+                    break
+
+                yield {"delim": "start"}
+                chunks = _until_deadline(completion, run.deadline)
+                cut_off = False
+                try:
+                    for chunk in chunks:
+                        # a stream cut off by the deadline is dropped
+                        if run.timed_out:
+                            cut_off = True
+                            break
+                        delta = run.chunk(accumulator, chunk)
+                        if delta is not None:
+                            yield delta
+                except Exception:
+                    if not run.timed_out:
+                        raise
+                    cut_off = True
+                yield {"delim": "end"}
+                if cut_off:
+                    _close_stream(chunks)
+                    run.end_turn(run.deadline.reason)
+                    break
+
+                message = accumulator.message()
+                if not run.received(
+                    message, accumulator.id, accumulator.model, accumulator.usage
+                ):
+                    break
+
+                # handle function calls, updating context_variables, and switching agents
+                run.apply(
+                    self.handle_tool_calls(
+                        tool_call_objects(message), **run.tool_args()
+                    )
                 )
-                tool_calls.append(tool_call_object)
+        except BaseException as e:
+            run.fail(e)
+            raise
 
-            # handle function calls, updating context_variables, and switching agents
-            partial_response = self.handle_tool_calls(
-                tool_calls, active_agent.functions, context_variables, debug
-            )
-            history.extend(partial_response.messages)
-            context_variables.update(partial_response.context_variables)
-            if partial_response.agent:
-                active_agent = partial_response.agent
-
-        yield {
-            "response": Response(
-                messages=history[init_len:],
-                agent=active_agent,
-                context_variables=context_variables,
-            )
-        }
+        yield {"response": run.response()}
 
     def run(
         self,
@@ -239,6 +790,10 @@ class Swarm:
         debug: bool = False,
         max_turns: int = float("inf"),
         execute_tools: bool = True,
+        profile: Union[bool, str, RunProfiler, None] = None,
+        deadline: Union[float, Deadline, None] = None,
+        tool_timeout: Optional[float] = None,
+        budget: Optional[Budget] = None,
     ) -> Response:
         if stream:
             return self.run_and_stream(
@@ -249,45 +804,355 @@ class Swarm:
                 debug=debug,
                 max_turns=max_turns,
                 execute_tools=execute_tools,
+                profile=profile,
+                deadline=deadline,
+                tool_timeout=tool_timeout,
+                budget=budget,
+            )
+        run = _Run(
+            self,
+            agent,
+            messages,
+            context_variables,
+            model_override,
+            debug,
+            max_turns,
+            execute_tools,
+            profile,
+            deadline,
+            tool_timeout,
+            budget,
+        )
+
+        try:
+            while run.next_turn():
+                # get completion with current history, agent
+                try:
+                    completion = self.get_chat_completion(
+                        **run.completion_args(stream=False)
+                    )
+                except Exception:
+                    if not run.timed_out:
+                        raise
+                    run.end_turn(run.deadline.reason)
+                    break
+                message = completion.choices[0].message
+                # plain dicts rather than OpenAI types, without a JSON round trip
+                if not run.received(
+                    {**message.model_dump(mode="json"), "sender": run.agent.name},
+                    completion.id,
+                    completion.model,
+                    completion.usage,
+                ):
+                    break
+
+                # handle function calls, updating context_variables, and switching agents
+                run.apply(self.handle_tool_calls(message.tool_calls, **run.tool_args()))
+        except BaseException as e:
+            run.fail(e)
+            raise
+
+        return run.response()
+
+    def run_batch(
+        self,
+        jobs: Iterable,
+        max_concurrency: int = 8,
+        **run_kwargs,
+    ) -> BatchRun:
+        """
+        Runs many independent conversations with at most `max_concurrency`
+        in flight, yielding a `BatchResult` per job as each one finishes.
+
+        Each job is (agent, messages), (agent, messages, context_variables)
+        or a dict of `run` arguments; `run_kwargs` apply to every job. Jobs
+        are pulled from `jobs` lazily, a failing job is reported on its
+        result instead of stopping the batch, and throughput and latency
+        percentiles are available on `.stats` once the results are consumed.
+        """
+        return run_batch(self, jobs, max_concurrency, run_kwargs)
+
+
+class AsyncSwarm(Swarm):
+    """
+    asyncio-native counterpart of `Swarm`, built on `AsyncOpenAI`.
+
+    `run` and `run_and_stream` follow the same handoff, `context_variables`
+    and `max_turns` semantics as the synchronous client, but completions are
+    awaited so a single event loop can multiplex many concurrent sessions.
+    """
+
+    def __init__(self, client=None, **options):
+        if not client:
+            client = AsyncOpenAI(
+                api_key="dummy_key",
+                base_url=DEFAULT_BASE_URL,
+                http_client=get_async_http_client(),
             )
-        active_agent = agent
-        context_variables = copy.deepcopy(context_variables)
-        history = copy.deepcopy(messages)
-        init_len = len(messages)
+        super().__init__(client=client, **options)
+
+    async def get_chat_completion(
+        self,
+        agent: Agent,
+        history: List,
+        context_variables: dict,
+        model_override: str,
+        stream: bool,
+        debug: bool,
+        observer: Optional[RunObserver] = None,
+        deadline: Optional[Deadline] = None,
+    ) -> ChatCompletionMessage:
+        create_params = self.build_create_params(
+            agent, history, context_variables, model_override, stream, debug
+        )
+        if observer is not None:
+            observer.emit("request_sent", data=create_params)
+        client, options = _request_client(self.client, deadline)
+        try:
+            return await self._create(client, create_params, options)
+        except BadRequestError as e:
+            if "stream_options" not in create_params or not _rejects_stream_options(e):
+                raise
+            # some OpenAI-compatible servers reject stream_options
+            del create_params["stream_options"]
+            completion = await self._create(client, create_params, options)
+            self.stream_usage = False
+            log_debug(debug, "Server rejected stream_options; streaming without usage")
+            return completion
+
+    async def _create(self, client, create_params: dict, options: dict):
+        if self.cache is not None:
+            return await self.cache.acomplete(client, create_params, **options)
+        return await client.chat.completions.create(**create_params, **options)
+
+    async def handle_tool_calls(
+        self,
+        tool_calls: List[ChatCompletionMessageToolCall],
+        functions: Union[List[AgentFunction], ToolPlan],
+        context_variables: dict,
+        debug: bool,
+        observer: Optional[RunObserver] = None,
+        deadline: Optional[Deadline] = None,
+        tool_timeout: Optional[float] = None,
+    ) -> Response:
+        plan = get_tool_plan(functions)
+        bounded = deadline is not None or tool_timeout is not None
+
+        def call(tool_call):
+            return self.call_tool(tool_call, plan, context_variables, debug, deadline)
+
+        if observer is not None:
+            call = observer.observe_tool(call)
+
+        if bounded:
+            # sync tools go to threads so the loop can stop waiting on them
+            loop = asyncio.get_running_loop()
+            executor = self._timeout_executor()
 
-        while len(history) - init_len < max_turns and active_agent:
+            async def bounded_call(tool_call):
+                if deadline is not None and deadline.done:
+                    return _stopped_tool(tool_call, deadline, tool_timeout)
+                future = loop.run_in_executor(executor, call, tool_call)
+                return await _await_tool(future, tool_call, deadline, tool_timeout)
 
-            # get completion with current history, agent
-            completion = self.get_chat_completion(
-                agent=active_agent,
-                history=history,
+            if self.tool_executor is not None and len(tool_calls) > 1:
+                results = await _gather(map(bounded_call, tool_calls))
+            else:
+                results = [await bounded_call(tool_call) for tool_call in tool_calls]
+        elif self.tool_executor is not None:
+            # keep blocking tools off the event loop, even a single one
+            loop = asyncio.get_running_loop()
+            results = await asyncio.gather(
+                *(
+                    loop.run_in_executor(self.tool_executor, call, tool_call)
+                    for tool_call in tool_calls
+                )
+            )
+        else:
+            results = [call(tool_call) for tool_call in tool_calls]
+
+        # await coroutine tools concurrently on the running loop
+        pending = [i for i, r in enumerate(results) if inspect.isawaitable(r)]
+        if pending:
+            if bounded:
+                for i in pending:
+                    results[i] = _await_tool(
+                        results[i], tool_calls[i], deadline, tool_timeout
+                    )
+            awaited = await _gather(results[i] for i in pending)
+            for i, result in zip(pending, awaited):
+                results[i] = result
+
+        return self.merge_tool_results(tool_calls, results)
+
+    async def run_and_stream(
+        self,
+        agent: Agent,
+        messages: List,
+        context_variables: dict = {},
+        model_override: str = None,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        profile: Union[bool, str, RunProfiler, None] = None,
+        deadline: Union[float, Deadline, None] = None,
+        tool_timeout: Optional[float] = None,
+        budget: Optional[Budget] = None,
+    ):
+        run = _Run(
+            self,
+            agent,
+            messages,
+            context_variables,
+            model_override,
+            debug,
+            max_turns,
+            execute_tools,
+            profile,
+            deadline,
+            tool_timeout,
+            budget,
+        )
+
+        try:
+            while run.next_turn():
+                accumulator = StreamAccumulator(run.agent.name)
+
+                # get completion with current history, agent
+                try:
+                    completion = await self.get_chat_completion(
+                        **run.completion_args(stream=True)
+                    )
+                except Exception:
+                    if not run.timed_out:
+                        raise
+                    run.end_turn(run.deadline.reason)
+                    break
+
+                yield {"delim": "start"}
+                chunks = _auntil_deadline(completion, run.deadline)
+                cut_off = False
+                try:
+                    async for chunk in chunks:
+                        # a stream cut off by the deadline is dropped
+                        if run.timed_out:
+                            cut_off = True
+                            break
+                        delta = run.chunk(accumulator, chunk)
+                        if delta is not None:
+                            yield delta
+                except Exception:
+                    if not run.timed_out:
+                        raise
+                    cut_off = True
+                yield {"delim": "end"}
+                if cut_off:
+                    await _aclose_stream(chunks)
+                    run.end_turn(run.deadline.reason)
+                    break
+
+                message = accumulator.message()
+                if not run.received(
+                    message, accumulator.id, accumulator.model, accumulator.usage
+                ):
+                    break
+
+                # handle function calls, updating context_variables, and switching agents
+                run.apply(
+                    await self.handle_tool_calls(
+                        tool_call_objects(message), **run.tool_args()
+                    )
+                )
+        except BaseException as e:
+            run.fail(e)
+            raise
+
+        yield {"response": run.response()}
+
+    async def run(
+        self,
+        agent: Agent,
+        messages: List,
+        context_variables: dict = {},
+        model_override: str = None,
+        stream: bool = False,
+        debug: bool = False,
+        max_turns: int = float("inf"),
+        execute_tools: bool = True,
+        profile: Union[bool, str, RunProfiler, None] = None,
+        deadline: Union[float, Deadline, None] = None,
+        tool_timeout: Optional[float] = None,
+        budget: Optional[Budget] = None,
+    ) -> Response:
+        if stream:
+            return self.run_and_stream(
+                agent=agent,
+                messages=messages,
                 context_variables=context_variables,
                 model_override=model_override,
-                stream=stream,
                 debug=debug,
+                max_turns=max_turns,
+                execute_tools=execute_tools,
+                profile=profile,
+                deadline=deadline,
+                tool_timeout=tool_timeout,
+                budget=budget,
             )
-            message = completion.choices[0].message
-            debug_print(debug, "Received completion:", message)
-            message.sender = active_agent.name
-            history.append(
-                json.loads(message.model_dump_json())
-            )  # to avoid OpenAI types (?)
-
-            if not message.tool_calls or not execute_tools:
-                debug_print(debug, "Ending turn.")
-                break
-
-            # handle function calls, updating context_variables, and switching agents
-            partial_response = self.handle_tool_calls(
-                message.tool_calls, active_agent.functions, context_variables, debug
-            )
-            history.extend(partial_response.messages)
-            context_variables.update(partial_response.context_variables)
-            if partial_response.agent:
-                active_agent = partial_response.agent
-
-        return Response(
-            messages=history[init_len:],
-            agent=active_agent,
-            context_variables=context_variables,
+        run = _Run(
+            self,
+            agent,
+            messages,
+            context_variables,
+            model_override,
+            debug,
+            max_turns,
+            execute_tools,
+            profile,
+            deadline,
+            tool_timeout,
+            budget,
         )
+
+        try:
+            while run.next_turn():
+                # get completion with current history, agent
+                try:
+                    completion = await self.get_chat_completion(
+                        **run.completion_args(stream=False)
+                    )
+                except Exception:
+                    if not run.timed_out:
+                        raise
+                    run.end_turn(run.deadline.reason)
+                    break
+                message = completion.choices[0].message
+                # plain dicts rather than OpenAI types, without a JSON round trip
+                if not run.received(
+                    {**message.model_dump(mode="json"), "sender": run.agent.name},
+                    completion.id,
+                    completion.model,
+                    completion.usage,
+                ):
+                    break
+
+                # handle function calls, updating context_variables, and switching agents
+                run.apply(
+                    await self.handle_tool_calls(message.tool_calls, **run.tool_args())
+                )
+        except BaseException as e:
+            run.fail(e)
+            raise
+
+        return run.response()
+
+    def run_batch(
+        self,
+        jobs: Iterable,
+        max_concurrency: int = 8,
+        **run_kwargs,
+    ) -> BatchRun:
+        """
+        Like `Swarm.run_batch`, with jobs run as tasks on the current event
+        loop; iterate the returned `BatchRun` with `async for`.
+        """
+        return run_batch_async(self, jobs, max_concurrency, run_kwargs)
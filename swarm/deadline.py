@@ -0,0 +1,143 @@
+import asyncio
+import threading
+import time
+from concurrent import futures
+from typing import Callable, Optional, Union
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised by `Deadline.check()` once a run is out of time or cancelled."""
+
+
+class Deadline:
+    """
+    Time limit and cancellation token of a run.
+
+    The run loop checks it before every completion and between streamed
+    chunks, passes the time left to each request as its timeout, and stops
+    waiting for tools once it passes. Tools that declare a parameter
+    annotated as `Deadline` (or named `swarm_deadline`) receive it, and can
+    `check()` it or `wait()` on it to stop early. `cancel()` may be called
+    from any thread.
+    """
+
+    def __init__(self, timeout: Optional[float] = None):
+        self.expires_at = None if timeout is None else time.perf_counter() + timeout
+        self._signal = futures.Future()  # resolved by cancel()
+        self._lock = threading.Lock()
+        self._callbacks = set()
+
+    def cancel(self) -> None:
+        with self._lock:
+            if self._signal.done():
+                return
+            self._signal.set_result(None)
+            callbacks, self._callbacks = self._callbacks, set()
+        for callback in callbacks:
+            callback()
+
+    def on_cancel(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """
+        Calls `callback` (on the cancelling thread) once `cancel()` is called,
+        right away if it already was. Returns a function that unregisters it.
+        """
+        with self._lock:
+            if not self._signal.done():
+                self._callbacks.add(callback)
+                return lambda: self._discard(callback)
+        callback()
+        return lambda: None
+
+    def _discard(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            self._callbacks.discard(callback)
+
+    @property
+    def cancelled(self) -> bool:
+        return self._signal.done()
+
+    @property
+    def expired(self) -> bool:
+        return self.expires_at is not None and time.perf_counter() >= self.expires_at
+
+    @property
+    def done(self) -> bool:
+        return self.cancelled or self.expired
+
+    @property
+    def reason(self) -> Optional[str]:
+        """Why the run must stop: "cancelled", "deadline", or None."""
+        if self.cancelled:
+            return "cancelled"
+        return "deadline" if self.expired else None
+
+    def remaining(self) -> Optional[float]:
+        """Seconds left, or None without a time limit."""
+        if self.expires_at is None:
+            return None
+        return max(0.0, self.expires_at - time.perf_counter())
+
+    def timeout(self, limit: Optional[float] = None) -> Optional[float]:
+        """The smaller of `limit` and the time left; None if neither is set."""
+        remaining = self.remaining()
+        if limit is None:
+            return remaining
+        return limit if remaining is None else min(limit, remaining)
+
+    def check(self) -> None:
+        if self.done:
+            raise DeadlineExceeded(f"Run stopped: {self.reason}")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sleeps up to `timeout` seconds, waking on cancellation or expiry."""
+        futures.wait((self._signal,), timeout=self.timeout(timeout))
+        return self.done
+
+    def wait_for(self, future: futures.Future, timeout: Optional[float] = None) -> bool:
+        """Waits for `future` as long as the run allows; returns whether it's done."""
+        futures.wait(
+            (future, self._signal),
+            timeout=self.timeout(timeout),
+            return_when=futures.FIRST_COMPLETED,
+        )
+        return future.done()
+
+    async def wait_for_async(
+        self, task: asyncio.Future, timeout: Optional[float] = None
+    ) -> bool:
+        """`wait_for` for tasks on the running event loop."""
+        loop = asyncio.get_running_loop()
+        stop = loop.create_future()
+
+        def wake():
+            try:
+                loop.call_soon_threadsafe(_resolve, stop)
+            except RuntimeError:  # the loop has closed since
+                pass
+
+        forget = self.on_cancel(wake)
+        try:
+            await asyncio.wait(
+                (task, stop),
+                timeout=self.timeout(timeout),
+                return_when=asyncio.FIRST_COMPLETED,
+            )
+        finally:
+            forget()
+            stop.cancel()
+        return task.done()
+
+
+def deadline_for(deadline: Union[float, Deadline, None]) -> Optional[Deadline]:
+    """
+    Resolves the `deadline=` argument of a run: a `Deadline`, or a number of
+    seconds from now.
+    """
+    if deadline is None or isinstance(deadline, Deadline):
+        return deadline
+    return Deadline(deadline)
+
+
+def _resolve(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
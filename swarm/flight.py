@@ -0,0 +1,187 @@
+import json
+import os
+import threading
+import time
+from collections import OrderedDict, deque
+from typing import List, Optional
+
+from .hooks import HookEvent, RunHooks
+
+
+class _Timeline:
+    __slots__ = ("run_id", "agent", "started", "wall_started", "events", "dropped")
+
+    def __init__(self, event: HookEvent, max_events: int):
+        self.run_id = event.run_id
+        self.agent = event.agent
+        self.started = event.time
+        self.wall_started = time.time()
+        self.events = deque(maxlen=max_events)
+        self.dropped = 0
+
+
+class FlightRecorder(RunHooks):
+    """
+    Keeps the event timeline of recent runs in memory and writes the slow
+    ones to disk.
+
+    Every run's turns, requests, streamed chunks, tool calls and handoffs
+    are recorded as they happen, together with message and result sizes.
+    When a run ends, its timeline is kept in a ring of the last `capacity`
+    runs (see `recent()`). It is also dumped to `directory` as JSON if the
+    run took at least `latency_threshold` seconds, ran at least
+    `turn_threshold` turns, or raised (with `dump_errors`).
+
+    Memory is bounded whatever the traffic: at most `max_events` events per
+    run (the oldest are dropped first), `max_active` runs in flight, and
+    `capacity` finished runs.
+    """
+
+    def __init__(
+        self,
+        directory: str = "swarm-flights",
+        latency_threshold: Optional[float] = None,
+        turn_threshold: Optional[int] = None,
+        dump_errors: bool = True,
+        capacity: int = 32,
+        max_events: int = 1000,
+        max_active: int = 1024,
+    ):
+        self.directory = directory
+        self.latency_threshold = latency_threshold
+        self.turn_threshold = turn_threshold
+        self.dump_errors = dump_errors
+        self.max_events = max_events
+        self.max_active = max_active
+        self.dumped = deque(maxlen=capacity)  # paths of the latest dumps
+        self._active = OrderedDict()  # run_id -> _Timeline
+        self._recent = deque(maxlen=capacity)  # (timeline, run_end event)
+        self._lock = threading.Lock()
+
+    def recent(self) -> List[dict]:
+        """The timelines of the most recent finished runs, oldest first."""
+        with self._lock:
+            recent = list(self._recent)
+        return [self._record(timeline, end) for timeline, end in recent]
+
+    def on_run_start(self, event: HookEvent) -> None:
+        timeline = _Timeline(event, self.max_events)
+        with self._lock:
+            self._active[event.run_id] = timeline
+            if len(self._active) > self.max_active:
+                self._active.popitem(last=False)
+        self._add(event, timeline)
+
+    def on_run_end(self, event: HookEvent) -> None:
+        with self._lock:
+            timeline = self._active.pop(event.run_id, None)
+        if timeline is None:
+            return
+        self._add(event, timeline)
+        # timelines are only formatted when read or dumped
+        with self._lock:
+            self._recent.append((timeline, event))
+        if self._should_dump(event):
+            self.dump(self._record(timeline, event))
+
+    def on_request_sent(self, event: HookEvent) -> None:
+        self._add(event, messages=len(event.data["messages"]))
+
+    def on_chunk(self, event: HookEvent) -> None:
+        chars = 0
+        for choice in event.data.choices:
+            chars += len(choice.delta.content or "")
+            for tool_call in choice.delta.tool_calls or []:
+                if tool_call.function:
+                    chars += len(tool_call.function.arguments or "")
+        self._add(event, chars=chars)
+
+    def on_completion(self, event: HookEvent) -> None:
+        message = event.data
+        tool_calls = message.get("tool_calls") or []
+        self._add(
+            event,
+            message_id=event.message_id,
+            chars=len(message.get("content") or ""),
+            tool_calls=len(tool_calls),
+            argument_chars=sum(
+                len(tool_call["function"]["arguments"] or "")
+                for tool_call in tool_calls
+            ),
+            prompt_tokens=event.usage.prompt_tokens if event.usage else None,
+            completion_tokens=event.usage.completion_tokens if event.usage else None,
+        )
+
+    def on_tool_start(self, event: HookEvent) -> None:
+        self._add(event, tool=event.tool_name, tool_call_id=event.tool_call_id)
+
+    def on_tool_end(self, event: HookEvent) -> None:
+        result = event.data
+        self._add(
+            event,
+            tool=event.tool_name,
+            tool_call_id=event.tool_call_id,
+            chars=len(result.value) if result is not None else None,
+        )
+
+    def on_handoff(self, event: HookEvent) -> None:
+        self._add(event, target=event.target)
+
+    def on_turn_start(self, event: HookEvent) -> None:
+        self._add(event)
+
+    on_turn_end = on_first_token = on_turn_start
+
+    def dump(self, record: dict) -> str:
+        os.makedirs(self.directory, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S", time.localtime(record["started_at"]))
+        path = os.path.join(self.directory, f"flight-{stamp}-{record['run_id']}.json")
+        with open(path, "w") as f:
+            json.dump(record, f, indent=2, default=str)
+        self.dumped.append(path)
+        return path
+
+    def _add(self, event: HookEvent, timeline: _Timeline = None, **info) -> None:
+        if timeline is None:
+            timeline = self._active.get(event.run_id)
+            if timeline is None:
+                return
+        if len(timeline.events) == timeline.events.maxlen:
+            timeline.dropped += 1
+        # appends to a bounded deque are atomic, so no lock on the hot path
+        timeline.events.append(
+            (event.time, event.name, event.agent, event.turn, event.duration, info)
+        )
+
+    def _record(self, timeline: _Timeline, end: HookEvent) -> dict:
+        events = []
+        for at, name, agent, turn, duration, info in list(timeline.events):
+            entry = {
+                "t_ms": round((at - timeline.started) * 1e3, 3),
+                "event": name,
+                "agent": agent,
+                "turn": turn,
+            }
+            if duration is not None:
+                entry["duration_ms"] = round(duration * 1e3, 3)
+            entry.update(info)
+            events.append(entry)
+        return {
+            "run_id": timeline.run_id,
+            "agent": timeline.agent,
+            "started_at": timeline.wall_started,
+            "duration": end.duration,
+            "turns": end.turn,
+            "error": repr(end.error) if end.error is not None else None,
+            "dropped_events": timeline.dropped,
+            "events": events,
+        }
+
+    def _should_dump(self, end: HookEvent) -> bool:
+        # a stream abandoned by its consumer (GeneratorExit) is not an error
+        if self.dump_errors and isinstance(end.error, Exception):
+            return True
+        if self.latency_threshold is not None:
+            if end.duration >= self.latency_threshold:
+                return True
+        return self.turn_threshold is not None and end.turn >= self.turn_threshold
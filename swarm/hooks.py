@@ -0,0 +1,229 @@
+import inspect
+import itertools
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Optional
+
+from .types import RunUsage, ToolUsage, TurnUsage
+
+EVENTS = (
+    "run_start",
+    "turn_start",
+    "request_sent",
+    "first_token",
+    "chunk",
+    "completion",
+    "tool_start",
+    "tool_end",
+    "handoff",
+    "turn_end",
+    "run_end",
+)
+
+_run_ids = itertools.count(1)
+
+
+@dataclass
+class HookEvent:
+    """
+    A point in the life of a run, passed to the matching `RunHooks` method.
+
+    `time` is `time.perf_counter()`, so events can be subtracted from one
+    another but not compared to wall-clock time. `duration` is set on events
+    that close a span: `completion` (since `request_sent`), `tool_end`,
+    `turn_end` and `run_end`.
+    """
+
+    name: str
+    time: float
+    run_id: int
+    agent: str
+    turn: int
+    thread: int
+    message_id: Optional[str] = None
+    tool_call_id: Optional[str] = None
+    tool_name: Optional[str] = None
+    target: Optional[str] = None  # agent handed off to
+    model: Optional[str] = None
+    usage: Any = None  # the completion's token usage, as reported
+    duration: Optional[float] = None
+    error: Optional[BaseException] = None
+    data: Any = None
+
+
+class RunHooks:
+    """
+    Base class for run instrumentation. Override the events you need and pass
+    instances to `Swarm(hooks=[...])`; every method receives a `HookEvent`.
+
+    Hooks are called synchronously on the thread that produced the event
+    (tool events come from `tool_executor` threads when one is set), so they
+    should be quick. An exception raised by a hook propagates into the run.
+    """
+
+    def on_run_start(self, event: HookEvent) -> None:
+        pass
+
+    def on_turn_start(self, event: HookEvent) -> None:
+        pass
+
+    def on_request_sent(self, event: HookEvent) -> None:
+        pass
+
+    def on_first_token(self, event: HookEvent) -> None:
+        """Streaming only: the first chunk of a completion arrived."""
+
+    def on_chunk(self, event: HookEvent) -> None:
+        """
+        Streaming only: a chunk arrived; `data` is the chunk. Only emitted to
+        runs with a hook that overrides this method.
+        """
+
+    def on_completion(self, event: HookEvent) -> None:
+        """The full assistant message arrived; `data` is the message dict."""
+
+    def on_tool_start(self, event: HookEvent) -> None:
+        pass
+
+    def on_tool_end(self, event: HookEvent) -> None:
+        """`data` is the tool's `Result`, or None if the tool was not found."""
+
+    def on_handoff(self, event: HookEvent) -> None:
+        pass
+
+    def on_turn_end(self, event: HookEvent) -> None:
+        pass
+
+    def on_run_end(self, event: HookEvent) -> None:
+        """`data` is the `Response`; `error` is set if the run raised."""
+
+
+class RunObserver:
+    """
+    Per-run instrumentation used by the run loops. Times each completion and
+    tool call into the run's `RunUsage` and, when hooks are registered, turns
+    every step into a `HookEvent` for them. Without hooks no events are
+    built.
+    """
+
+    __slots__ = (
+        "hooks",
+        "run_id",
+        "agent",
+        "turn",
+        "started",
+        "usage",
+        "wants_chunks",
+        "_marks",
+        "_turn_usage",
+        "_first_token",
+    )
+
+    def __init__(self, hooks, agent: str):
+        self.hooks = hooks
+        self.run_id = next(_run_ids)
+        self.agent = agent
+        self.turn = 0
+        self.started = time.perf_counter()
+        self.usage = RunUsage.model_construct(turns=[], wall_time=0.0)
+        # per-chunk events are only built if some hook listens for them
+        self.wants_chunks = any(
+            getattr(type(hook), "on_chunk", RunHooks.on_chunk) is not RunHooks.on_chunk
+            for hook in hooks
+        )
+        self._marks = {}  # span name -> start time
+        self._turn_usage = None
+        self._first_token = None
+
+    def emit(self, name: str, since: Optional[str] = None, **fields) -> None:
+        now = time.perf_counter()
+        if since is not None:
+            fields["duration"] = now - self._marks.pop(since, self.started)
+        if name in ("turn_start", "request_sent"):
+            self._marks[name] = now
+        self._account(name, now, fields)
+        if not self.hooks:
+            return
+        event = HookEvent(
+            name=name,
+            time=now,
+            run_id=self.run_id,
+            agent=self.agent,
+            turn=self.turn,
+            thread=threading.get_ident(),
+            **fields,
+        )
+        for hook in self.hooks:
+            getattr(hook, "on_" + name)(event)
+
+    def _account(self, name: str, now: float, fields: dict) -> None:
+        if name == "first_token":
+            self._first_token = now - self._marks.get("request_sent", self.started)
+        elif name == "completion":
+            usage = fields.get("usage")
+            self._turn_usage = TurnUsage.model_construct(
+                agent=self.agent,
+                model=fields.get("model"),
+                prompt_tokens=usage.prompt_tokens if usage else None,
+                completion_tokens=usage.completion_tokens if usage else None,
+                latency=fields["duration"],
+                time_to_first_token=self._first_token,
+                tools=[],
+            )
+            self._first_token = None
+            self.usage.turns.append(self._turn_usage)
+        elif name == "tool_end" and self._turn_usage is not None:
+            self._turn_usage.tools.append(
+                ToolUsage.model_construct(
+                    name=fields["tool_name"],
+                    tool_call_id=fields["tool_call_id"],
+                    latency=fields["duration"],
+                )
+            )
+        elif name == "run_end":
+            self.usage.wall_time = fields["duration"]
+
+    def handoff(self, agent: str) -> None:
+        self.emit("handoff", target=agent)
+        self.agent = agent
+
+    def observe_tool(self, call):
+        """Wraps a `call(tool_call)` function with tool_start/tool_end events."""
+
+        def observed(tool_call):
+            start = time.perf_counter()
+            self.emit(
+                "tool_start",
+                tool_call_id=tool_call.id,
+                tool_name=tool_call.function.name,
+            )
+            try:
+                result = call(tool_call)
+            except BaseException as e:
+                self._tool_end(tool_call, start, error=e)
+                raise
+            if inspect.isawaitable(result):
+                return self._observe_awaitable(result, tool_call, start)
+            self._tool_end(tool_call, start, data=result)
+            return result
+
+        return observed
+
+    async def _observe_awaitable(self, awaitable, tool_call, start):
+        try:
+            result = await awaitable
+        except BaseException as e:
+            self._tool_end(tool_call, start, error=e)
+            raise
+        self._tool_end(tool_call, start, data=result)
+        return result
+
+    def _tool_end(self, tool_call, start, **fields):
+        self.emit(
+            "tool_end",
+            tool_call_id=tool_call.id,
+            tool_name=tool_call.function.name,
+            duration=time.perf_counter() - start,
+            **fields,
+        )
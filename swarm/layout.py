@@ -0,0 +1,138 @@
+import json
+import threading
+from collections import OrderedDict
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Callable, List, Optional
+
+from .util import IdentityMemo
+
+
+def canonical(value):
+    """
+    Returns a copy of a JSON-like value with every dict's keys in sorted
+    order, so that serializing it gives the same bytes however it was built.
+    """
+    if isinstance(value, Mapping):
+        return {key: canonical(value[key]) for key in sorted(value)}
+    if isinstance(value, (list, tuple)):
+        return [canonical(item) for item in value]
+    return value
+
+
+def stable_tool_schemas(schemas: List[dict]) -> List[dict]:
+    """Tool schemas sorted by function name, with canonical key order."""
+    return [
+        canonical(schema)
+        for schema in sorted(schemas, key=lambda schema: schema["function"]["name"])
+    ]
+
+
+@dataclass
+class PrefixReport:
+    agent: str
+    model: str
+    # sizes of the serialized tools + messages, in characters
+    prompt_chars: int
+    # leading part laid out to stay identical on the next turn
+    stable_chars: int
+    # leading part identical to the previous request from the same agent
+    shared_chars: int
+
+    @property
+    def stable_ratio(self) -> float:
+        return self.stable_chars / self.prompt_chars if self.prompt_chars else 0.0
+
+
+class PromptLayout:
+    """
+    Prompt layout that keeps the start of every request byte-identical across
+    turns, so backends that reuse cached prompt prefixes (the KV cache of a
+    local server, or a hosted API's prompt cache) can skip re-processing it.
+
+    Tools are sorted by name with canonical key order. String `instructions`
+    stay first as the system message. Anything rendered from
+    `context_variables` (callable `instructions` and `context_instructions`)
+    moves to a system message after the history, the only part that changes
+    between turns. Each request gets a `PrefixReport`, kept as `last_report`
+    and passed to `on_report` if given.
+    """
+
+    def __init__(
+        self,
+        on_report: Optional[Callable[[PrefixReport], None]] = None,
+        max_entries: int = 100_000,
+        max_chars: int = 4_000_000,
+    ):
+        self.on_report = on_report
+        self.last_report: Optional[PrefixReport] = None
+        self.max_entries = max_entries
+        self._previous = OrderedDict()  # (agent, model) -> serialized segments
+        # serialized messages, bounded by size as well as count
+        self._serialize = IdentityMemo(_dumps, max_entries, max_chars)
+        self._lock = threading.Lock()
+
+    def messages(
+        self,
+        static: Optional[str],
+        volatile: Optional[str],
+        history: List[dict],
+        window: Optional[Callable[[List[dict]], List[dict]]] = None,
+    ) -> List[dict]:
+        messages = [{"role": "system", "content": static}] if static else []
+        messages += history
+        if window is not None:
+            # trim before the context message goes last, so the window keeps
+            # the conversation's newest turn rather than that message
+            messages = window(messages)
+        if volatile:
+            messages = messages + [{"role": "system", "content": volatile}]
+        return messages
+
+    def tools(self, plan) -> List[dict]:
+        return plan.stable_schemas
+
+    def report(
+        self, agent: str, params: dict, volatile: Optional[dict] = None
+    ) -> PrefixReport:
+        """
+        Measures the stable prefix of a request built with this layout.
+        `volatile` is the trailing context message, if the request has one.
+        """
+        segments = [_dumps(params.get("tools") or [])]
+        stable = len(segments[0])
+        in_prefix = True
+        for message in params["messages"]:
+            in_prefix = in_prefix and message is not volatile
+            text = self._serialize(message)
+            segments.append(text)
+            stable += len(text) if in_prefix else 0
+
+        key = (agent, params["model"])
+        with self._lock:
+            previous = self._previous.pop(key, [])
+            self._previous[key] = segments
+            if len(self._previous) > self.max_entries:
+                self._previous.popitem(last=False)
+
+        shared = 0
+        for a, b in zip(segments, previous):
+            if a != b:
+                break
+            shared += len(a)
+
+        report = PrefixReport(
+            agent=agent,
+            model=params["model"],
+            prompt_chars=sum(map(len, segments)),
+            stable_chars=stable,
+            shared_chars=shared,
+        )
+        self.last_report = report
+        if self.on_report is not None:
+            self.on_report(report)
+        return report
+
+
+def _dumps(value) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=str)
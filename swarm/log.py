@@ -0,0 +1,207 @@
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+from datetime import datetime
+from typing import Optional
+
+logger = logging.getLogger("swarm")
+
+# longest rendering of a single field, in characters
+DEFAULT_MAX_CHARS = 2000
+_FIELDS = "swarm_fields"
+_MESSAGE = "swarm_message"
+
+
+def log_debug(debug: bool, message: str, /, **fields) -> None:
+    """
+    Logs a debug record on the "swarm" logger with structured `fields`.
+
+    Nothing is formatted here: fields are rendered (and size-capped) only if
+    the record is emitted, by swarm's formatters or, for any other formatter,
+    as `key=value` pairs after the message. Records go out when the logger is
+    enabled for DEBUG, or when `debug` is set on the run, in which case a
+    console handler is added if no handler is configured.
+    """
+    extra = {_FIELDS: fields, _MESSAGE: message}
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("%s%s", message, _Fields(fields), extra=extra, stacklevel=2)
+    elif debug:
+        if not logger.hasHandlers():
+            logger.addHandler(_console_handler())
+        # bypass the level check for runs that asked for debug output
+        record = logger.makeRecord(
+            logger.name,
+            logging.DEBUG,
+            "",
+            0,
+            "%s%s",
+            (message, _Fields(fields)),
+            None,
+            extra=extra,
+        )
+        logger.handle(record)
+
+
+class _Fields:
+    """The fields of a record as ` key=value` text, rendered when printed."""
+
+    __slots__ = ("fields",)
+
+    def __init__(self, fields: dict):
+        self.fields = fields
+
+    def __str__(self) -> str:
+        return "".join(f" {key}={render(value)}" for key, value in self.fields.items())
+
+
+class _Rendered(str):
+    """A field already rendered (and capped), passed through as is."""
+
+
+def render(value, max_chars: int = DEFAULT_MAX_CHARS) -> str:
+    """Renders a field as text, cut to `max_chars` with a note of the rest."""
+    if isinstance(value, _Rendered):
+        return value
+    if isinstance(value, str):
+        text = value
+    elif hasattr(value, "model_dump"):
+        text = json.dumps(value.model_dump(mode="json"), default=str)
+    else:
+        try:
+            text = json.dumps(value, default=str, ensure_ascii=False)
+        except (TypeError, ValueError):
+            text = repr(value)
+    if len(text) > max_chars:
+        text = f"{text[:max_chars]}… (+{len(text) - max_chars} chars)"
+    return _Rendered(text)
+
+
+class ConsoleFormatter(logging.Formatter):
+    """The colored `[timestamp] message field=value` lines of debug mode."""
+
+    def __init__(self, max_chars: int = DEFAULT_MAX_CHARS):
+        super().__init__()
+        self.max_chars = max_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        timestamp = datetime.fromtimestamp(record.created).strftime("%Y-%m-%d %H:%M:%S")
+        parts = [_message(record)]
+        for key, value in getattr(record, _FIELDS, {}).items():
+            parts.append(f"{key}={render(value, self.max_chars)}")
+        message = " ".join(parts)
+        return f"\033[97m[\033[90m{timestamp}\033[97m]\033[90m {message}\033[0m"
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record, with the structured fields as keys."""
+
+    def __init__(self, max_chars: int = DEFAULT_MAX_CHARS):
+        super().__init__()
+        self.max_chars = max_chars
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "time": record.created,
+            "level": record.levelname,
+            "logger": record.name,
+            "message": _message(record),
+        }
+        for key, value in getattr(record, _FIELDS, {}).items():
+            entry[key] = _scalar_or_render(value, self.max_chars)
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class BufferedHandler(logging.handlers.QueueHandler):
+    """
+    Hands records to a background thread that formats and writes them, so
+    the run loop never waits on I/O. Structured fields are rendered (and
+    capped) on the calling thread first, so a record can't pick up later
+    changes to the objects it was logged with. When the buffer is full,
+    records are dropped (and counted) rather than blocking.
+    """
+
+    def __init__(self, handler: logging.Handler, capacity: int = 10_000):
+        super().__init__(queue.Queue(maxsize=capacity))
+        self.dropped = 0
+        self.max_chars = getattr(handler.formatter, "max_chars", DEFAULT_MAX_CHARS)
+        self.listener = logging.handlers.QueueListener(
+            self.queue, handler, respect_handler_level=True
+        )
+        self.listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # freeze the fields here; formatting is left to the listener thread
+        fields = getattr(record, _FIELDS, None)
+        if fields:
+            rendered = {
+                key: _scalar_or_render(value, self.max_chars)
+                for key, value in fields.items()
+            }
+            record = copy.copy(record)
+            setattr(record, _FIELDS, rendered)
+            # log_debug records carry (message, _Fields) as their args
+            record.args = (getattr(record, _MESSAGE, ""), _Fields(rendered))
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        # flushes what is queued; safe to call more than once
+        if self.listener is not None:
+            self.listener.stop()
+            self.listener = None
+        super().close()
+
+
+def configure_logging(
+    level: int = logging.DEBUG,
+    json_output: bool = False,
+    stream=None,
+    buffered: bool = False,
+    max_chars: int = DEFAULT_MAX_CHARS,
+) -> logging.Handler:
+    """
+    Sends the "swarm" logger's records to `stream` (stderr by default), as
+    JSON lines or colored console lines, optionally through a
+    `BufferedHandler`. Replaces handlers installed by an earlier call.
+    """
+    handler = logging.StreamHandler(stream or sys.stderr)
+    handler.setFormatter(
+        JsonFormatter(max_chars) if json_output else ConsoleFormatter(max_chars)
+    )
+    if buffered:
+        handler = BufferedHandler(handler)
+    for existing in list(logger.handlers):
+        logger.removeHandler(existing)
+        existing.close()
+    logger.addHandler(handler)
+    logger.setLevel(level)
+    logger.propagate = False
+    return handler
+
+
+def _message(record: logging.LogRecord) -> str:
+    # the message without the fields that other formatters get appended
+    message = getattr(record, _MESSAGE, None)
+    return record.getMessage() if message is None else message
+
+
+def _scalar_or_render(value, max_chars: int):
+    if value is None or isinstance(value, (bool, int, float)):
+        return value
+    return render(value, max_chars)
+
+
+def _console_handler(max_chars: Optional[int] = None) -> logging.Handler:
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(ConsoleFormatter(max_chars or DEFAULT_MAX_CHARS))
+    return handler
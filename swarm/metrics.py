@@ -0,0 +1,286 @@
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Sequence, Tuple
+
+from .hooks import HookEvent, RunHooks
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 34)
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Counter:
+    def __init__(self, name: str, help: str, labels: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = _label_values(self, labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(_label_values(self, labels), 0)
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            values = sorted(self._values.items())
+        for key, value in values:
+            lines.append(f"{self.name}{_labels(self.labels, key)} {_number(value)}")
+        return lines
+
+
+class Histogram:
+    """
+    Fixed-bucket histogram: memory per label set is one count per bucket
+    plus a sum, however many observations are made.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ):
+        self.name = name
+        self.help = help
+        self.labels = tuple(labels)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}  # key -> [counts, sum]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels) -> None:
+        key = _label_values(self, labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            series[0][index] += 1
+            series[1] += value
+
+    def count(self, **labels) -> int:
+        series = self._series.get(_label_values(self, labels))
+        return sum(series[0]) if series else 0
+
+    def quantile(self, q: float, **labels) -> Optional[float]:
+        """Upper bound of the bucket holding the `q` quantile, if any."""
+        series = self._series.get(_label_values(self, labels))
+        if not series or not sum(series[0]):
+            return None
+        rank = q * sum(series[0])
+        seen = 0
+        for bound, count in zip(self.buckets + (float("inf"),), series[0]):
+            seen += count
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def render(self) -> list:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            series = sorted((key, list(c), s) for key, (c, s) in self._series.items())
+        for key, counts, total in series:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = "+Inf" if bound == float("inf") else _number(bound)
+                labels = _labels(self.labels + ("le",), key + (le,))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _labels(self.labels, key)
+            lines.append(f"{self.name}_sum{labels} {_number(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """
+    Named counters and histograms, rendered in the Prometheus text format.
+    Serve them with `serve()`, or mount `wsgi_app` in an existing server.
+    """
+
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, help: str, labels: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                if type(existing) is not type(metric):
+                    raise ValueError(f"Metric {metric.name} is already registered.")
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def get(self, name: str):
+        return self._metrics[name]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def wsgi_app(self, environ, start_response):
+        body = self.render().encode("utf-8")
+        start_response(
+            "200 OK",
+            [("Content-Type", CONTENT_TYPE), ("Content-Length", str(len(body)))],
+        )
+        return [body]
+
+    def serve(self, port: int = 9464, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """
+        Serves the metrics over HTTP from a daemon thread; call `shutdown()`
+        on the returned server to stop it.
+        """
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = registry.render().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", CONTENT_TYPE)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(
+            target=server.serve_forever, name="swarm-metrics", daemon=True
+        ).start()
+        return server
+
+
+class MetricsHooks(RunHooks):
+    """
+    Records run metrics into a `MetricsRegistry`: completion latency and time
+    to first token per agent and model, tool latency and errors per function
+    `__name__`, tokens, and turns and handoffs per run.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry or MetricsRegistry()
+        r = self.registry
+        self.runs = r.counter(
+            "swarm_runs_total", "Finished runs: ok, error or cancelled.", ["status"]
+        )
+        self.completion_seconds = r.histogram(
+            "swarm_completion_seconds",
+            "Time from request to full completion.",
+            ["agent", "model"],
+        )
+        self.ttft_seconds = r.histogram(
+            "swarm_ttft_seconds",
+            "Time to first token of streamed completions.",
+            ["agent", "model"],
+        )
+        self.tokens = r.counter(
+            "swarm_tokens_total",
+            "Tokens reported by the server.",
+            ["agent", "model", "kind"],
+        )
+        self.tool_seconds = r.histogram(
+            "swarm_tool_seconds", "Tool call latency.", ["agent", "tool"]
+        )
+        self.tool_errors = r.counter(
+            "swarm_tool_errors_total", "Tool calls that raised.", ["agent", "tool"]
+        )
+        self.turns_per_run = r.histogram(
+            "swarm_turns_per_run", "Turns per run.", buckets=COUNT_BUCKETS
+        )
+        self.handoffs_per_run = r.histogram(
+            "swarm_handoffs_per_run", "Handoffs per run.", buckets=COUNT_BUCKETS
+        )
+        self._handoffs = {}  # run_id -> handoffs so far
+        self._requests = {}  # run_id -> request_sent time
+        self._lock = threading.Lock()
+
+    def on_request_sent(self, event: HookEvent) -> None:
+        self._requests[event.run_id] = event.time
+
+    def on_first_token(self, event: HookEvent) -> None:
+        sent = self._requests.get(event.run_id)
+        if sent is not None:
+            self.ttft_seconds.observe(
+                event.time - sent, agent=event.agent, model=event.model or ""
+            )
+
+    def on_completion(self, event: HookEvent) -> None:
+        self._requests.pop(event.run_id, None)
+        model = event.model or ""
+        self.completion_seconds.observe(event.duration, agent=event.agent, model=model)
+        if event.usage is not None:
+            for kind in ("prompt", "completion"):
+                tokens = getattr(event.usage, f"{kind}_tokens") or 0
+                self.tokens.inc(tokens, agent=event.agent, model=model, kind=kind)
+
+    def on_tool_end(self, event: HookEvent) -> None:
+        self.tool_seconds.observe(
+            event.duration, agent=event.agent, tool=event.tool_name
+        )
+        if event.error is not None:
+            self.tool_errors.inc(agent=event.agent, tool=event.tool_name)
+
+    def on_handoff(self, event: HookEvent) -> None:
+        with self._lock:
+            self._handoffs[event.run_id] = self._handoffs.get(event.run_id, 0) + 1
+
+    def on_run_end(self, event: HookEvent) -> None:
+        with self._lock:
+            handoffs = self._handoffs.pop(event.run_id, 0)
+        self._requests.pop(event.run_id, None)
+        self.runs.inc(status=_status(event.error))
+        self.turns_per_run.observe(event.turn)
+        self.handoffs_per_run.observe(handoffs)
+
+
+def _status(error: Optional[BaseException]) -> str:
+    # an abandoned stream (GeneratorExit) or cancelled task is not an error
+    if error is None:
+        return "ok"
+    return "error" if isinstance(error, Exception) else "cancelled"
+
+
+def _label_values(metric, labels: dict) -> Tuple[str, ...]:
+    if labels.keys() != set(metric.labels):
+        raise ValueError(f"{metric.name} takes labels {metric.labels}, got {labels}")
+    return tuple(str(labels[name]) for name in metric.labels)
+
+
+def _labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    escaped = (
+        value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+        for value in values
+    )
+    return "{" + ",".join(f'{n}="{v}"' for n, v in zip(names, escaped)) + "}"
+
+
+def _number(value: float) -> str:
+    return repr(float(value)) if value != int(value) else str(int(value))
@@ -0,0 +1,185 @@
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import List, Optional, Union
+
+from .hooks import HookEvent, RunHooks
+
+PROFILE_ENV_VAR = "SWARM_PROFILE"
+DEFAULT_PROFILE_DIR = "swarm-profiles"
+
+# tracemalloc is process-wide: profilers share it, and it is stopped only
+# when the last one that needed it to be started is done
+_tracing_lock = threading.Lock()
+_tracing_users = 0
+_started_tracing = False
+
+
+def _acquire_tracing() -> None:
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        if _tracing_users == 0 and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            _started_tracing = True
+        _tracing_users += 1
+
+
+def _release_tracing() -> None:
+    global _tracing_users, _started_tracing
+    with _tracing_lock:
+        _tracing_users -= 1
+        if _tracing_users == 0 and _started_tracing:
+            tracemalloc.stop()
+            _started_tracing = False
+
+
+class RunProfiler(RunHooks):
+    """
+    Profiles a single run: samples the stacks of the threads running it
+    (the caller's thread and any thread a tool ran on) every `interval`
+    seconds, and diffs `tracemalloc` snapshots around each turn.
+
+    When the run ends, two files are written to `directory`:
+
+    - `run-<time>-<pid>-<id>.folded`: the sampled stacks, one
+      `frame;frame;... count` line each, ready for flamegraph.pl or speedscope
+    - `run-<time>-<pid>-<id>.alloc.txt`: the top `top` allocation sites of
+      each turn
+
+    `tracemalloc` traces the whole process, so allocations made by other
+    threads while a turn runs are counted too.
+    """
+
+    def __init__(
+        self,
+        directory: str = DEFAULT_PROFILE_DIR,
+        interval: float = 0.005,
+        top: int = 10,
+    ):
+        self.directory = directory
+        self.interval = interval
+        self.top = top
+        self.samples = Counter()  # folded stack -> samples
+        self.turns = []  # (turn, agent, [(site, size diff, count diff)])
+        self.paths: List[str] = []
+        self._threads = {}  # ident -> name of the threads worth sampling
+        self._snapshot = None
+        self._tracing = False
+        self._stop = threading.Event()
+        self._sampler = None
+
+    def on_run_start(self, event: HookEvent) -> None:
+        self._track_thread()
+        self._stop = threading.Event()
+        if not self._tracing:
+            _acquire_tracing()
+            self._tracing = True
+        self._sampler = threading.Thread(
+            target=self._sample, name="swarm-profiler", daemon=True
+        )
+        self._sampler.start()
+
+    def on_turn_start(self, event: HookEvent) -> None:
+        self._snapshot = self._take_snapshot()
+
+    def on_tool_start(self, event: HookEvent) -> None:
+        self._track_thread()
+
+    def on_turn_end(self, event: HookEvent) -> None:
+        snapshot = self._take_snapshot()
+        if self._snapshot is None or snapshot is None:
+            return
+        diff = snapshot.compare_to(self._snapshot, "lineno")
+        self._snapshot = None
+        sites = [
+            (str(stat.traceback[0]), stat.size_diff, stat.count_diff)
+            for stat in diff[: self.top]
+        ]
+        self.turns.append((event.turn, event.agent, sites))
+
+    def on_run_end(self, event: HookEvent) -> None:
+        self._stop.set()
+        if self._sampler is not None:
+            self._sampler.join()
+        if self._tracing:
+            _release_tracing()
+            self._tracing = False
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        self.paths = self.write(f"run-{stamp}-{os.getpid()}-{event.run_id}")
+
+    def write(self, name: str) -> List[str]:
+        """Writes the folded stacks and allocation report; returns the paths."""
+        os.makedirs(self.directory, exist_ok=True)
+        folded = os.path.join(self.directory, f"{name}.folded")
+        with open(folded, "w") as f:
+            for stack, count in self.samples.most_common():
+                f.write(f"{stack} {count}\n")
+
+        alloc = os.path.join(self.directory, f"{name}.alloc.txt")
+        with open(alloc, "w") as f:
+            for turn, agent, sites in self.turns:
+                total = sum(size for _, size, _ in sites)
+                f.write(
+                    f"turn {turn} ({agent}): {total / 1024:+.1f} KiB in top sites\n"
+                )
+                for site, size, count in sites:
+                    f.write(f"  {size / 1024:+10.1f} KiB {count:+8d} blocks  {site}\n")
+        return [folded, alloc]
+
+    def _track_thread(self) -> None:
+        thread = threading.current_thread()
+        self._threads[thread.ident] = thread.name
+
+    def _take_snapshot(self) -> Optional[tracemalloc.Snapshot]:
+        # someone else may have stopped tracing under us
+        if not tracemalloc.is_tracing():
+            return None
+        try:
+            snapshot = tracemalloc.take_snapshot()
+        except RuntimeError:
+            return None
+        return snapshot.filter_traces(
+            (
+                tracemalloc.Filter(False, tracemalloc.__file__),
+                tracemalloc.Filter(False, __file__),
+            )
+        )
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for ident, name in list(self._threads.items()):
+                frame = frames.get(ident)
+                if frame is None:
+                    continue
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        f"{code.co_name} ({code.co_filename}:{code.co_firstlineno})"
+                    )
+                    frame = frame.f_back
+                stack.append(name)
+                self.samples[";".join(reversed(stack))] += 1
+
+
+def profiler_for(profile: Union[bool, str, RunProfiler, None]) -> Optional[RunProfiler]:
+    """
+    Resolves the `profile=` argument of a run: a `RunProfiler`, a directory,
+    True for the default directory, or False to disable. None defers to the
+    `SWARM_PROFILE` environment variable, which takes a directory or "1".
+    """
+    if profile is None:
+        profile = os.environ.get(PROFILE_ENV_VAR) or False
+        if profile in ("0", "false"):
+            profile = False
+        elif profile in ("1", "true"):
+            profile = True
+    if not profile:
+        return None
+    if isinstance(profile, RunProfiler):
+        return profile
+    return RunProfiler(DEFAULT_PROFILE_DIR if profile is True else profile)
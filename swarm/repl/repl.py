@@ -58,9 +58,13 @@ def pretty_print_messages(messages) -> None:
 
 
 def run_demo_loop(
-    starting_agent, context_variables=None, stream=False, debug=False
+    starting_agent,
+    context_variables=None,
+    stream=False,
+    debug=False,
+    context_window=None,
 ) -> None:
-    client = Swarm()
+    client = Swarm(context_window=context_window)
     print("Starting Swarm CLI 🐝")
 
     messages = []
@@ -0,0 +1,150 @@
+import copy
+import threading
+from collections.abc import Mapping
+
+_IMMUTABLE_TYPES = (str, bytes, int, float, complex, bool, type(None), frozenset, range)
+
+
+def _is_immutable(value) -> bool:
+    if isinstance(value, _IMMUTABLE_TYPES):
+        return True
+    if isinstance(value, tuple):
+        return all(_is_immutable(v) for v in value)
+    return False
+
+
+class ContextVariables(dict):
+    """
+    Copy-on-write `context_variables` for a single run.
+
+    Starts as a shallow copy of the caller's dict. Values that could be
+    mutated in place (lists, dicts, objects...) stay shared with the caller
+    until they are first read, at which point that value alone is deep-copied.
+    Agent functions can therefore mutate whatever they are handed without
+    touching the caller's data, and values nobody reads during the run are
+    only copied once, by `to_dict()` when the run returns. Taking ownership
+    is locked, so tools running concurrently on a `tool_executor` can share
+    one instance.
+    """
+
+    __slots__ = ("_shared", "_lock")
+
+    def __init__(self, base=None):
+        super().__init__(base or {})
+        # keys whose values are still the caller's objects
+        self._shared = {k for k, v in dict.items(self) if not _is_immutable(v)}
+        self._lock = threading.Lock()
+
+    def _own(self, key) -> None:
+        if key not in self._shared:
+            return
+        with self._lock:
+            # another thread may have copied it while we waited
+            if key in self._shared:
+                value = copy.deepcopy(dict.__getitem__(self, key))
+                dict.__setitem__(self, key, value)
+                self._shared.discard(key)
+
+    def _own_all(self) -> None:
+        for key in list(self._shared):
+            self._own(key)
+
+    def __getitem__(self, key):
+        self._own(key)
+        return dict.__getitem__(self, key)
+
+    def __setitem__(self, key, value):
+        self._shared.discard(key)
+        dict.__setitem__(self, key, value)
+
+    def __delitem__(self, key):
+        self._shared.discard(key)
+        dict.__delitem__(self, key)
+
+    def __iter__(self):
+        # overriding __iter__ makes dict(...), {**...} and dict.update(...)
+        # read through __getitem__ instead of the raw storage
+        return dict.__iter__(self)
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def __deepcopy__(self, memo):
+        return ContextVariables(copy.deepcopy(dict(dict.items(self)), memo))
+
+    def __reduce__(self):
+        return ContextVariables, (self.to_dict(),)
+
+    def get(self, key, default=None):
+        self._own(key)
+        return dict.get(self, key, default)
+
+    def setdefault(self, key, default=None):
+        self._own(key)
+        return dict.setdefault(self, key, default)
+
+    def pop(self, key, *default):
+        self._own(key)
+        return dict.pop(self, key, *default)
+
+    def popitem(self):
+        self._own_all()
+        return dict.popitem(self)
+
+    def update(self, *args, **kwargs):
+        other = dict(*args, **kwargs)
+        self._shared.difference_update(other)
+        dict.update(self, other)
+
+    def clear(self):
+        self._shared.clear()
+        dict.clear(self)
+
+    def items(self):
+        self._own_all()
+        return dict.items(self)
+
+    def values(self):
+        self._own_all()
+        return dict.values(self)
+
+    def copy(self) -> dict:
+        self._own_all()
+        return dict(dict.items(self))
+
+    def to_dict(self) -> dict:
+        """
+        Returns a plain dict of the current values, copying the ones that
+        are still the caller's objects so the result never aliases them.
+        """
+        self._own_all()
+        return dict(dict.items(self))
+
+
+class ContextView(Mapping):
+    """
+    Read-only view of `context_variables` handed to callable instructions.
+    Missing keys read as "", and nothing is copied: instructions only
+    render values, so they see the stored objects as they are.
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data: dict):
+        self._data = data
+
+    def __getitem__(self, key):
+        return dict.get(self._data, key, "")
+
+    def get(self, key, default=None):
+        return dict.get(self._data, key, default)
+
+    def __contains__(self, key) -> bool:
+        return dict.__contains__(self._data, key)
+
+    def __iter__(self):
+        return dict.__iter__(self._data)
+
+    def __len__(self) -> int:
+        return dict.__len__(self._data)
@@ -0,0 +1,98 @@
+from typing import List, Optional
+
+from .types import ChatCompletionMessageToolCall, Function
+
+
+class StreamAccumulator:
+    """
+    Assembles a streamed completion into a single assistant message.
+
+    Reads the chunk objects directly and buffers content and tool-call
+    fragments in lists that are joined once, in `message()`, so the cost
+    stays linear in the length of the stream. Every tool-call delta in a
+    chunk is applied, not just the first.
+    """
+
+    __slots__ = ("sender", "id", "model", "usage", "_content", "_tool_calls")
+
+    def __init__(self, sender: str):
+        self.sender = sender
+        # completion id, model and token usage, from the chunks
+        self.id = None
+        self.model = None
+        self.usage = None
+        self._content = []
+        # index -> [id, type, name, arguments] fragment lists
+        self._tool_calls = {}
+
+    def add_chunk(self, chunk) -> Optional[dict]:
+        """
+        Accumulates a `ChatCompletionChunk` and returns its delta as a plain
+        dict event for the caller, or None for chunks without choices (such
+        as the trailing usage chunk).
+        """
+        self.id = chunk.id
+        self.model = chunk.model
+        if chunk.usage is not None:
+            self.usage = chunk.usage
+        if not chunk.choices:
+            return None
+        delta = chunk.choices[0].delta
+        self.add_delta(delta)
+
+        event = delta.model_dump(mode="json")
+        if event["role"] == "assistant":
+            event["sender"] = self.sender
+        return event
+
+    def add_delta(self, delta) -> None:
+        if delta.content:
+            self._content.append(delta.content)
+        if not delta.tool_calls:
+            return
+        for tool_call in delta.tool_calls:
+            fragments = self._tool_calls.get(tool_call.index)
+            if fragments is None:
+                fragments = self._tool_calls[tool_call.index] = ([], [], [], [])
+            ids, types, names, arguments = fragments
+            if tool_call.id:
+                ids.append(tool_call.id)
+            if tool_call.type:
+                types.append(tool_call.type)
+            if tool_call.function:
+                if tool_call.function.name:
+                    names.append(tool_call.function.name)
+                if tool_call.function.arguments:
+                    arguments.append(tool_call.function.arguments)
+
+    def message(self) -> dict:
+        tool_calls = [
+            {
+                "function": {"arguments": "".join(arguments), "name": "".join(names)},
+                "id": "".join(ids),
+                "type": "".join(types),
+            }
+            for ids, types, names, arguments in self._tool_calls.values()
+        ]
+        return {
+            "content": "".join(self._content),
+            "sender": self.sender,
+            "role": "assistant",
+            "function_call": None,
+            "tool_calls": tool_calls or None,
+        }
+
+
+def tool_call_objects(message: dict) -> List[ChatCompletionMessageToolCall]:
+    # convert tool_calls to objects
+    return [
+        ChatCompletionMessageToolCall.model_construct(
+            id=tool_call["id"],
+            function=Function.model_construct(
+                arguments=tool_call["function"]["arguments"],
+                name=tool_call["function"]["name"],
+            ),
+            type=tool_call["type"],
+        )
+        for tool_call in message["tool_calls"]
+    ]
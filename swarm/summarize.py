@@ -0,0 +1,270 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Callable, Hashable, List, Optional, Tuple
+
+from openai import OpenAI
+
+from .transport import DEFAULT_BASE_URL, get_http_client
+from .window import TokenCounter, group_turns
+
+SUMMARY_INSTRUCTIONS = (
+    "You maintain a running summary of a conversation between a user and an "
+    "assistant. Fold the new messages into the existing summary. Keep names, "
+    "ids, numbers, decisions and open questions; drop pleasantries. Reply "
+    "with the updated summary only."
+)
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+# conversations kept apart under one session key (such as a shared opening)
+_SESSIONS_PER_KEY = 16
+
+
+@dataclass
+class SummaryStats:
+    summaries: int = 0
+    failures: int = 0
+    messages_folded: int = 0
+    # prompt tokens not sent because a summary replaced the messages it covers
+    tokens_saved: int = 0
+    summary_seconds: float = 0.0
+
+
+@dataclass(frozen=True)
+class _Summary:
+    messages: Tuple[dict, ...]  # history prefix the summary stands in for
+    message: dict
+    covered_tokens: int
+
+
+class _Session:
+    __slots__ = ("prefix", "summary", "pending", "stats")
+
+    def __init__(self):
+        # history prefix that tells this conversation apart from others under
+        # the same key: the messages summarized or being summarized
+        self.prefix: Tuple[dict, ...] = ()
+        self.summary: Optional[_Summary] = None
+        self.pending = None
+        self.stats = SummaryStats()
+
+
+class Summarizer:
+    """
+    Context-window policy that folds older turns into a running summary.
+
+    When the un-summarized history grows past `max_tokens`, the oldest turns
+    (all but the newest `keep_tokens` worth) are summarized with `model` on a
+    background thread while the conversation carries on with the full
+    history. Once the summary is ready it is swapped in, in one step, for the
+    next completion: the covered messages are replaced by a single system
+    message. Tool calls are never separated from their results, and the
+    history kept by `run()` is not changed.
+
+    One summarizer can serve many conversations. They are grouped by the
+    content of their first history message, and within a group told apart
+    by the messages their summary covers, so conversations that open the
+    same way keep their own summaries and a history reloaded from storage on
+    each request still finds its summary. Pass `session_key(history) -> key`
+    to group on something more specific, such as a conversation id. A
+    summary is only used while the history still starts with the messages
+    it covers. Savings are recorded per session (`session_stats`) and in
+    total (`stats`).
+    """
+
+    def __init__(
+        self,
+        client=None,
+        model: str = "llama3.2:1b",
+        max_tokens: int = 4000,
+        keep_tokens: Optional[int] = None,
+        instructions: str = SUMMARY_INSTRUCTIONS,
+        counter: Optional[Callable[[dict], int]] = None,
+        executor: Optional[Executor] = None,
+        max_sessions: int = 1024,
+        session_key: Optional[Callable[[List[dict]], Hashable]] = None,
+    ):
+        if not client:
+            client = OpenAI(
+                api_key="dummy_key",
+                base_url=DEFAULT_BASE_URL,
+                http_client=get_http_client(),
+            )
+        self.client = client
+        self.model = model
+        self.max_tokens = max_tokens
+        self.keep_tokens = max_tokens // 2 if keep_tokens is None else keep_tokens
+        self.instructions = instructions
+        self.counter = counter or TokenCounter()
+        self.executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="swarm-summarizer"
+        )
+        self.max_sessions = max_sessions
+        self.session_key = session_key or _first_message_key
+        self.stats = SummaryStats()
+        self.last_error: Optional[BaseException] = None
+        self._sessions = OrderedDict()  # session key -> [_Session], recent first
+        self._lock = threading.Lock()
+
+    def __call__(self, messages: List[dict]) -> List[dict]:
+        start = 0
+        while start < len(messages) and messages[start].get("role") == "system":
+            start += 1
+        head, history = messages[:start], messages[start:]
+        if not history:
+            return messages
+
+        key = self.session_key(history)
+        with self._lock:
+            # an edited or replaced history matches no summary and starts over
+            session = self._session(key, history)
+            summary = session.summary
+            tail = history[len(summary.messages) :] if summary else history
+            if session.pending is None:
+                self._maybe_schedule(session, summary, tail)
+            if summary is None:
+                return messages
+            saved = max(summary.covered_tokens - self.counter(summary.message), 0)
+            session.stats.tokens_saved += saved
+            self.stats.tokens_saved += saved
+
+        return head + [summary.message] + tail
+
+    def summarize(self, previous: Optional[str], messages: List[dict]) -> str:
+        """
+        Returns `previous` (the current summary, if any) updated with
+        `messages`. Override to summarize some other way.
+        """
+        parts = [f"Current summary:\n{previous}"] if previous else []
+        parts.append("New messages:\n" + "\n".join(map(_transcript_line, messages)))
+        completion = self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self.instructions},
+                {"role": "user", "content": "\n\n".join(parts)},
+            ],
+        )
+        return completion.choices[0].message.content or ""
+
+    def session_stats(self, messages: List[dict]) -> Optional[SummaryStats]:
+        """Stats for the conversation `messages` belongs to, if it is known."""
+        history = [m for m in messages if m.get("role") != "system"]
+        if not history:
+            return None
+        key = self.session_key(history)
+        with self._lock:
+            session = self._session(key, history, create=False)
+            return session.stats if session is not None else None
+
+    def wait(self, timeout: Optional[float] = None) -> None:
+        """Blocks until every pending summary has been swapped in or failed."""
+        with self._lock:
+            pending = [
+                session.pending
+                for sessions in self._sessions.values()
+                for session in sessions
+                if session.pending
+            ]
+        wait(pending, timeout=timeout)
+
+    def _session(
+        self, key: Hashable, history: List[dict], create: bool = True
+    ) -> Optional[_Session]:
+        sessions = self._sessions.get(key)
+        if sessions is None:
+            if not create:
+                return None
+            sessions = self._sessions[key] = []
+            if len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+        self._sessions.move_to_end(key)
+
+        # the conversation whose summarized prefix this history continues
+        session = None
+        for candidate in sessions:
+            if session is not None and len(candidate.prefix) <= len(session.prefix):
+                continue
+            if _starts_with(history, candidate.prefix):
+                session = candidate
+        if session is None:
+            if not create:
+                return None
+            session = _Session()
+        else:
+            sessions.remove(session)
+        sessions.insert(0, session)
+        del sessions[_SESSIONS_PER_KEY:]
+        return session
+
+    def _maybe_schedule(self, session, summary, tail):
+        units = group_turns(tail)
+        costs = [sum(self.counter(m) for m in unit) for unit in units]
+        remaining = sum(costs)
+        if remaining <= self.max_tokens:
+            return
+
+        # fold the oldest turns, never the newest one
+        fold = []
+        for unit, cost in zip(units[:-1], costs[:-1]):
+            if remaining <= self.keep_tokens:
+                break
+            fold.extend(unit)
+            remaining -= cost
+        if fold:
+            session.prefix = (summary.messages if summary else ()) + tuple(fold)
+            session.pending = self.executor.submit(
+                self._run, session, summary, fold, sum(costs) - remaining
+            )
+
+    def _run(self, session, base, fold, fold_tokens):
+        started = time.perf_counter()
+        try:
+            previous = base.message["content"][len(SUMMARY_PREFIX) :] if base else None
+            text = self.summarize(previous, fold)
+        except Exception as e:
+            with self._lock:
+                session.pending = None
+                session.prefix = base.messages if base else ()
+                session.stats.failures += 1
+                self.stats.failures += 1
+                self.last_error = e
+            return
+
+        elapsed = time.perf_counter() - started
+        summary = _Summary(
+            messages=(base.messages if base else ()) + tuple(fold),
+            message={"role": "system", "content": SUMMARY_PREFIX + text},
+            covered_tokens=(base.covered_tokens if base else 0) + fold_tokens,
+        )
+        with self._lock:
+            session.pending = None
+            if session.summary is not base:
+                return  # history changed underneath us; drop the stale summary
+            session.summary = summary
+            for stats in (session.stats, self.stats):
+                stats.summaries += 1
+                stats.messages_folded += len(fold)
+                stats.summary_seconds += elapsed
+
+
+def _first_message_key(history: List[dict]) -> str:
+    return json.dumps(history[0], sort_keys=True, ensure_ascii=False, default=str)
+
+
+def _starts_with(history: List[dict], prefix: Tuple[dict, ...]) -> bool:
+    if len(history) < len(prefix):
+        return False
+    return all(a is b or a == b for a, b in zip(history, prefix))
+
+
+def _transcript_line(message: dict) -> str:
+    speaker = message.get("sender") or message.get("role", "")
+    line = f"{speaker}: {message.get('content') or ''}".rstrip()
+    for tool_call in message.get("tool_calls") or []:
+        function = tool_call.get("function") or {}
+        line += (
+            f"\n{speaker} called {function.get('name')}({function.get('arguments')})"
+        )
+    return line
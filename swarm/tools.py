@@ -0,0 +1,93 @@
+import inspect
+from typing import List, Optional, Union
+
+from .deadline import Deadline
+from .layout import stable_tool_schemas
+from .types import Agent, AgentFunction
+from .util import function_to_json
+
+__CTX_VARS_NAME__ = "context_variables"
+__DEADLINE_NAME__ = "swarm_deadline"
+
+
+class ToolPlan:
+    """
+    Compiled view of a list of agent functions: the JSON schemas sent to the
+    model (with `context_variables` and the deadline parameter hidden, also
+    in a canonical order for prefix-stable prompts), a name -> callable
+    dispatch table, and which functions want `context_variables` or the
+    run's `Deadline` passed in (and under which parameter name).
+
+    Built once per `Agent` and reused on every turn until `Agent.functions`
+    changes (see `get_tool_plan`).
+    """
+
+    __slots__ = (
+        "functions",
+        "schemas",
+        "stable_schemas",
+        "function_map",
+        "takes_context",
+        "takes_deadline",
+    )
+
+    def __init__(self, functions: List[AgentFunction]):
+        self.functions = tuple(functions)
+        self.schemas = []
+        self.function_map = {}
+        self.takes_context = set()
+        self.takes_deadline = {}
+
+        for func in self.functions:
+            parameters = inspect.signature(func).parameters
+            deadline_param = _deadline_param(parameters)
+            tool = function_to_json(func)
+            # hide the arguments swarm passes in from the model
+            params = tool["function"]["parameters"]
+            for hidden in (__CTX_VARS_NAME__, deadline_param):
+                params["properties"].pop(hidden, None)
+                if hidden in params["required"]:
+                    params["required"].remove(hidden)
+            self.schemas.append(tool)
+
+            self.function_map[func.__name__] = func
+            if __CTX_VARS_NAME__ in parameters:
+                self.takes_context.add(func.__name__)
+            if deadline_param is not None:
+                self.takes_deadline[func.__name__] = deadline_param
+
+        # deterministic order and key layout, see swarm.layout.PromptLayout
+        self.stable_schemas = stable_tool_schemas(self.schemas)
+
+    def matches(self, functions: List[AgentFunction]) -> bool:
+        # identity, not equality: a rebound or mutated list invalidates the plan
+        return len(functions) == len(self.functions) and all(
+            a is b for a, b in zip(functions, self.functions)
+        )
+
+
+def _deadline_param(parameters) -> Optional[str]:
+    # opt-in only: a plain `deadline` argument is the model's to fill
+    for param in parameters.values():
+        if param.annotation in (Deadline, Optional[Deadline], "Deadline"):
+            return param.name
+    return __DEADLINE_NAME__ if __DEADLINE_NAME__ in parameters else None
+
+
+def get_tool_plan(functions: Union[Agent, List[AgentFunction], ToolPlan]) -> ToolPlan:
+    """
+    Returns the `ToolPlan` for an agent, compiling and caching it on the agent
+    the first time and again only after `Agent.functions` has changed. Plain
+    function lists are compiled on every call.
+    """
+    if isinstance(functions, ToolPlan):
+        return functions
+    if not isinstance(functions, Agent):
+        return ToolPlan(functions)
+
+    agent = functions
+    plan = agent._tool_plan
+    if plan is None or not plan.matches(agent.functions):
+        plan = ToolPlan(agent.functions)
+        agent._tool_plan = plan
+    return plan
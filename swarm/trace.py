@@ -0,0 +1,216 @@
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Optional
+
+from .hooks import HookEvent, RunHooks
+
+# hook event that opens each span -> (span kind, event that closes it)
+_SPANS = {
+    "run_start": ("run", "run_end"),
+    "turn_start": ("turn", "turn_end"),
+    "request_sent": ("completion", "completion"),
+    "tool_start": ("tool", "tool_end"),
+}
+_CLOSES = {end: kind for kind, end in _SPANS.values()}
+
+
+class ChromeTrace(RunHooks):
+    """
+    Records runs as a Chrome trace-event file that opens in Perfetto
+    (ui.perfetto.dev) or chrome://tracing.
+
+    Every run, turn, completion (with its time to first token marked) and
+    tool call becomes a span, and every handoff an instant event. With
+    `lanes="run"` each run gets its own track, so a batch shows one track
+    per session. With `lanes="thread"`, spans go on the track of the thread
+    that ran them. Tool calls that overlap are spread over extra tracks so
+    they stay visible. Register with `Swarm(hooks=[trace])`, then `save()`.
+    """
+
+    def __init__(self, lanes: str = "run"):
+        if lanes not in ("run", "thread"):
+            raise ValueError(f"lanes must be 'run' or 'thread', not {lanes!r}")
+        self.lanes = lanes
+        self.spans = []  # (kind, name, start, end, lane, args)
+        self.instants = []  # (name, time, lane, args)
+        self._open = {}  # (run_id, kind, tool call) -> opening event
+        self._lane_names = {}
+        self._lock = threading.Lock()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.spans.clear()
+            self.instants.clear()
+            self._open.clear()
+            self._lane_names.clear()
+
+    def _lane(self, event: HookEvent):
+        if self.lanes == "run":
+            lane = event.run_id
+            name = f"run {event.run_id}"
+        else:
+            lane = event.thread
+            name = threading.current_thread().name
+        self._lane_names.setdefault(lane, name)
+        return lane
+
+    def _record(self, event: HookEvent) -> None:
+        with self._lock:
+            if event.name in _SPANS:
+                kind = _SPANS[event.name][0]
+                self._open[_key(kind, event)] = event
+                self._lane(event)
+                return
+            kind = _CLOSES[event.name]
+            start = self._open.pop(_key(kind, event), None)
+            if start is None:
+                return
+            self.spans.append(
+                (
+                    kind,
+                    _span_name(kind, start, event),
+                    start.time,
+                    event.time,
+                    self._lane(start),
+                    _span_args(kind, event),
+                )
+            )
+
+    def _instant(self, name: str, event: HookEvent, **args) -> None:
+        with self._lock:
+            self.instants.append((name, event.time, self._lane(event), args))
+
+    on_run_start = on_run_end = _record
+    on_turn_start = on_turn_end = _record
+    on_request_sent = on_completion = _record
+    on_tool_start = on_tool_end = _record
+
+    def on_first_token(self, event: HookEvent) -> None:
+        request = self._open.get(_key("completion", event))
+        ttft = event.time - request.time if request else None
+        self._instant("first token", event, ttft_ms=_ms(ttft))
+
+    def on_handoff(self, event: HookEvent) -> None:
+        self._instant(f"handoff → {event.target}", event, source=event.agent)
+
+    def to_json(self) -> dict:
+        """The trace as a Chrome trace-event JSON object."""
+        with self._lock:
+            spans = list(self.spans)
+            instants = list(self.instants)
+            lane_names = dict(self._lane_names)
+        times = [span[2] for span in spans] + [instant[1] for instant in instants]
+        origin = min(times, default=0.0)
+
+        def us(t):
+            return round((t - origin) * 1e6, 3)
+
+        tracks = {}  # (lane, extra track index) -> tid
+
+        def tid(lane, index=0):
+            return tracks.setdefault((lane, index), len(tracks) + 1)
+
+        events = []
+        # spread overlapping tool spans over extra tracks of their lane
+        track_ends = defaultdict(list)
+        for kind, name, start, end, lane, args in sorted(spans, key=lambda s: s[2]):
+            index = 0
+            if kind == "tool":
+                ends = track_ends[lane]
+                index = next((i for i, t in enumerate(ends) if t <= start), len(ends))
+                if index == len(ends):
+                    ends.append(end)
+                else:
+                    ends[index] = end
+            events.append(
+                {
+                    "name": name,
+                    "cat": kind,
+                    "ph": "X",
+                    "ts": us(start),
+                    "dur": round((end - start) * 1e6, 3),
+                    "pid": 1,
+                    "tid": tid(lane, index),
+                    "args": args,
+                }
+            )
+        for name, time, lane, args in instants:
+            events.append(
+                {
+                    "name": name,
+                    "ph": "i",
+                    "s": "t",
+                    "ts": us(time),
+                    "pid": 1,
+                    "tid": tid(lane),
+                    "args": args,
+                }
+            )
+
+        metadata = [
+            {"name": "process_name", "ph": "M", "pid": 1, "args": {"name": "swarm"}}
+        ]
+        for (lane, index), track in tracks.items():
+            name = lane_names.get(lane, str(lane))
+            metadata.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": track,
+                    "args": {"name": f"{name} · tools {index}" if index else name},
+                }
+            )
+            metadata.append(
+                {
+                    "name": "thread_sort_index",
+                    "ph": "M",
+                    "pid": 1,
+                    "tid": track,
+                    "args": {"sort_index": track},
+                }
+            )
+        return {"traceEvents": metadata + events, "displayTimeUnit": "ms"}
+
+    def save(self, path: str) -> str:
+        """Writes the trace to `path` and returns the path."""
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_json(), f, default=str)
+        return path
+
+
+def _key(kind: str, event: HookEvent) -> tuple:
+    return (event.run_id, kind, event.tool_call_id, event.tool_name)
+
+
+def _span_name(kind: str, start: HookEvent, end: HookEvent) -> str:
+    if kind == "run":
+        return f"run ({start.agent})"
+    if kind == "turn":
+        return f"turn {start.turn} ({start.agent})"
+    if kind == "completion":
+        return f"completion ({end.model or start.agent})"
+    return end.tool_name
+
+
+def _span_args(kind: str, end: HookEvent) -> dict:
+    args = {"agent": end.agent}
+    if kind == "completion":
+        args["message_id"] = end.message_id
+        if end.usage is not None:
+            args["prompt_tokens"] = end.usage.prompt_tokens
+            args["completion_tokens"] = end.usage.completion_tokens
+    elif kind == "tool":
+        args["tool_call_id"] = end.tool_call_id
+    if end.error is not None:
+        args["error"] = repr(end.error)
+    return args
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1e3, 3)
@@ -0,0 +1,98 @@
+import importlib.util
+import threading
+from dataclasses import dataclass, replace
+from typing import Optional
+
+import httpx
+from openai import DefaultAsyncHttpxClient, DefaultHttpxClient
+
+DEFAULT_BASE_URL = "http://localhost:11434/v1"
+
+
+@dataclass(frozen=True)
+class TransportConfig:
+    """
+    Connection pooling and timeout settings for the HTTP transport shared by
+    every default-constructed `Swarm` / `AsyncSwarm` in the process.
+
+    `http2` is only honoured when the optional `h2` package is installed.
+    """
+
+    max_connections: int = 1000
+    max_keepalive_connections: int = 100
+    keepalive_expiry: float = 30.0
+    http2: bool = True
+    connect_timeout: float = 5.0
+    read_timeout: float = 600.0
+    write_timeout: float = 600.0
+    pool_timeout: float = 600.0
+
+    def client_kwargs(self) -> dict:
+        return {
+            "limits": httpx.Limits(
+                max_connections=self.max_connections,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            ),
+            "timeout": httpx.Timeout(
+                connect=self.connect_timeout,
+                read=self.read_timeout,
+                write=self.write_timeout,
+                pool=self.pool_timeout,
+            ),
+            "http2": self.http2 and importlib.util.find_spec("h2") is not None,
+        }
+
+
+_config = TransportConfig()
+_http_client: Optional[httpx.Client] = None
+_async_http_client: Optional[httpx.AsyncClient] = None
+_lock = threading.Lock()
+
+
+def configure_transport(
+    config: Optional[TransportConfig] = None, **overrides
+) -> TransportConfig:
+    """
+    Sets the process-wide transport settings, either as a whole
+    `TransportConfig` or as field overrides of the current one, e.g.
+    `configure_transport(max_connections=200, read_timeout=30)`.
+
+    Clients created afterwards use a fresh pool with the new settings;
+    clients already handed out keep working with their existing pool.
+    """
+    global _config, _http_client, _async_http_client
+    with _lock:
+        _config = replace(config or _config, **overrides)
+        _http_client = None
+        _async_http_client = None
+        return _config
+
+
+def get_transport_config() -> TransportConfig:
+    return _config
+
+
+def get_http_client() -> httpx.Client:
+    """
+    Returns the shared, keep-alive pooled HTTP client used by default `Swarm`
+    instances, creating it on first use.
+    """
+    global _http_client
+    with _lock:
+        if _http_client is None or _http_client.is_closed:
+            _http_client = DefaultHttpxClient(**_config.client_kwargs())
+        return _http_client
+
+
+def get_async_http_client() -> httpx.AsyncClient:
+    """
+    Returns the shared async HTTP client used by default `AsyncSwarm`
+    instances. Its connections belong to the event loop that opened them, so
+    share it between clients running on the same loop.
+    """
+    global _async_http_client
+    with _lock:
+        if _async_http_client is None or _async_http_client.is_closed:
+            _async_http_client = DefaultAsyncHttpxClient(**_config.client_kwargs())
+        return _async_http_client
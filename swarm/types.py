@@ -3,27 +3,147 @@ from openai.types.chat.chat_completion_message_tool_call import (
     ChatCompletionMessageToolCall,
     Function,
 )
-from typing import List, Callable, Union, Optional
+from typing import Dict, List, Callable, Union, Optional
 
 # Third-party imports
-from pydantic import BaseModel
+from pydantic import BaseModel, PrivateAttr, computed_field
 
 AgentFunction = Callable[[], Union[str, "Agent", dict]]
 
 
+class Budget(BaseModel):
+    """
+    Caps on what a run, or one agent within it, may use; None is no cap.
+    Token counts are the ones the server reported. Once a cap is reached the
+    run stops before its next completion, or with `fallback_model` goes on
+    with that (cheaper) model instead.
+    """
+
+    max_prompt_tokens: Optional[int] = None
+    max_completion_tokens: Optional[int] = None
+    max_tool_calls: Optional[int] = None
+    fallback_model: Optional[str] = None
+
+    def exceeded(self, usage: "Union[RunUsage, AgentUsage]") -> Optional[str]:
+        """The first cap `usage` has reached, if any."""
+        for limit in ("prompt_tokens", "completion_tokens", "tool_calls"):
+            cap = getattr(self, f"max_{limit}")
+            if cap is not None and getattr(usage, limit) >= cap:
+                return limit
+        return None
+
+
 class Agent(BaseModel):
     name: str = "Agent"
     model: str = "llama3.2"
     instructions: Union[str, Callable[[], str]] = "You are a helpful agent."
+    # rendered from context_variables each turn; kept out of the stable
+    # prompt prefix when a swarm.layout.PromptLayout is used
+    context_instructions: Optional[Union[str, Callable[[], str]]] = None
     functions: List[AgentFunction] = []
     tool_choice: str = None
     parallel_tool_calls: bool = True
+    # trims the messages sent to the model, e.g. swarm.window.ContextWindow
+    context_window: Optional[Callable[[List[dict]], List[dict]]] = None
+    # what this agent may use within a run, across handoffs back to it
+    budget: Optional[Budget] = None
+    # compiled schemas and dispatch table, see swarm.tools.get_tool_plan
+    _tool_plan: Optional[object] = PrivateAttr(default=None)
+
+    # agents are compared by identity so they are cheap to compare and can be
+    # used as dict keys; field-by-field equality would walk `functions`
+    def __eq__(self, other) -> bool:
+        return self is other
+
+    __hash__ = object.__hash__
+
+
+class ToolUsage(BaseModel):
+    name: str
+    tool_call_id: str
+    latency: float = 0.0  # seconds, wall clock
+
+
+class TurnUsage(BaseModel):
+    """
+    Accounting for one completion and the tool calls it made. Token counts
+    are the ones the server reported, or None if it reported none.
+    """
+
+    agent: str
+    model: Optional[str] = None
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    latency: float = 0.0  # seconds from request to full message
+    time_to_first_token: Optional[float] = None  # streaming only
+    tools: List[ToolUsage] = []
+
+
+class AgentUsage(BaseModel):
+    turns: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    tool_calls: int = 0
+    completion_time: float = 0.0
+    tool_time: float = 0.0
+
+
+class RunUsage(BaseModel):
+    turns: List[TurnUsage] = []
+    wall_time: float = 0.0  # seconds for the whole run
+
+    @computed_field
+    @property
+    def prompt_tokens(self) -> int:
+        return sum(turn.prompt_tokens or 0 for turn in self.turns)
+
+    @computed_field
+    @property
+    def completion_tokens(self) -> int:
+        return sum(turn.completion_tokens or 0 for turn in self.turns)
+
+    @computed_field
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    @computed_field
+    @property
+    def tool_calls(self) -> int:
+        return sum(len(turn.tools) for turn in self.turns)
+
+    @computed_field
+    @property
+    def completion_time(self) -> float:
+        return sum(turn.latency for turn in self.turns)
+
+    @computed_field
+    @property
+    def tool_time(self) -> float:
+        return sum(tool.latency for turn in self.turns for tool in turn.tools)
+
+    @computed_field
+    @property
+    def by_agent(self) -> Dict[str, AgentUsage]:
+        agents = {}
+        for turn in self.turns:
+            usage = agents.setdefault(turn.agent, AgentUsage())
+            usage.turns += 1
+            usage.prompt_tokens += turn.prompt_tokens or 0
+            usage.completion_tokens += turn.completion_tokens or 0
+            usage.tool_calls += len(turn.tools)
+            usage.completion_time += turn.latency
+            usage.tool_time += sum(tool.latency for tool in turn.tools)
+        return agents
 
 
 class Response(BaseModel):
     messages: List = []
     agent: Optional[Agent] = None
     context_variables: dict = {}
+    usage: Optional[RunUsage] = None
+    # set when the run stopped early: "deadline", "cancelled" or "budget"
+    stop_reason: Optional[str] = None
 
 
 class Result(BaseModel):
@@ -1,13 +1,17 @@
+import asyncio
 import inspect
-from datetime import datetime
+import logging
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+from .log import log_debug, logger
 
 
 def debug_print(debug: bool, *args: str) -> None:
-    if not debug:
-        return
-    timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    message = " ".join(map(str, args))
-    print(f"\033[97m[\033[90m{timestamp}\033[97m]\033[90m {message}\033[0m")
+    # kept for callers of the old helper; see swarm.log
+    if debug or logger.isEnabledFor(logging.DEBUG):
+        log_debug(debug, " ".join(map(str, args)))
 
 
 def merge_fields(target, source):
@@ -22,10 +26,9 @@ def merge_chunk(final_response: dict, delta: dict) -> None:
     delta.pop("role", None)
     merge_fields(final_response, delta)
 
-    tool_calls = delta.get("tool_calls")
-    if tool_calls and len(tool_calls) > 0:
-        index = tool_calls[0].pop("index")
-        merge_fields(final_response["tool_calls"][index], tool_calls[0])
+    for tool_call in delta.get("tool_calls") or []:
+        index = tool_call.pop("index")
+        merge_fields(final_response["tool_calls"][index], tool_call)
 
 
 def function_to_json(func) -> dict:
@@ -85,3 +88,87 @@ def function_to_json(func) -> dict:
             },
         },
     }
+
+
+class IdentityMemo:
+    """
+    Memoizes `compute(obj)` by object identity, so a message is processed once
+    however many turns it stays in the history. An entry keeps its object
+    alive (so its id can't be reused), so the memo is bounded to `max_entries`
+    objects and to `max_chars` of message content and string results, least
+    recently used first out.
+    """
+
+    def __init__(
+        self,
+        compute: Callable,
+        max_entries: int = 100_000,
+        max_chars: int = 4_000_000,
+    ):
+        self.compute = compute
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self._entries = OrderedDict()  # id(obj) -> (obj, value, chars)
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, obj):
+        key = id(obj)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] is obj:
+                self._entries.move_to_end(key)
+                return entry[1]
+        value = self.compute(obj)
+        chars = _chars(obj) + (len(value) if isinstance(value, str) else 0)
+        if chars > self.max_chars:
+            return value
+        with self._lock:
+            stale = self._entries.pop(key, None)
+            if stale is not None:
+                self._chars -= stale[2]
+            self._entries[key] = (obj, value, chars)
+            self._chars += chars
+            while len(self._entries) > self.max_entries or self._chars > self.max_chars:
+                self._chars -= self._entries.popitem(last=False)[1][2]
+        return value
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+def _chars(obj) -> int:
+    # the bulk of what an entry keeps alive: a message's content
+    content = obj.get("content") if isinstance(obj, dict) else None
+    if isinstance(content, str):
+        return len(content)
+    if isinstance(content, list):  # content parts
+        return sum(len(str(part)) for part in content)
+    return 0
+
+
+_background_loop = None
+_background_loop_lock = threading.Lock()
+
+
+def _get_background_loop() -> asyncio.AbstractEventLoop:
+    global _background_loop
+    with _background_loop_lock:
+        if _background_loop is None:
+            loop = asyncio.new_event_loop()
+            threading.Thread(
+                target=loop.run_forever, name="swarm-event-loop", daemon=True
+            ).start()
+            _background_loop = loop
+    return _background_loop
+
+
+def run_coroutine_sync(coro):
+    """
+    Runs a coroutine to completion from synchronous code on a shared,
+    lazily started background event loop, and returns its result.
+
+    Using a dedicated loop (rather than `asyncio.run`) works even when the
+    caller is itself running inside an event loop.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _get_background_loop()).result()
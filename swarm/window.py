@@ -0,0 +1,106 @@
+import json
+from typing import Callable, List, Optional
+
+from .util import IdentityMemo
+
+
+def estimate_tokens(message: dict) -> int:
+    """
+    Fast, tokenizer-free estimate of a message's token count: roughly four
+    characters per token plus a small per-message overhead.
+    """
+    chars = len(message.get("content") or "")
+    for tool_call in message.get("tool_calls") or []:
+        function = tool_call.get("function") or {}
+        chars += len(function.get("name") or "") + len(function.get("arguments") or "")
+    if not isinstance(message.get("content"), (str, type(None))):
+        chars += len(json.dumps(message["content"], default=str))
+    return chars // 4 + 4
+
+
+class TokenCounter:
+    """
+    Memoizes per-message token counts so each message is estimated once, no
+    matter how many turns it stays in the history. Bounded to `max_entries`
+    messages and `max_chars` of their content, least recently used first
+    out, so a long-lived counter doesn't keep old sessions alive.
+    """
+
+    def __init__(
+        self,
+        estimator: Callable[[dict], int] = estimate_tokens,
+        max_entries: int = 100_000,
+        max_chars: int = 4_000_000,
+    ):
+        self.estimator = estimator
+        self.max_entries = max_entries
+        self._memo = IdentityMemo(estimator, max_entries, max_chars)
+
+    def __call__(self, message: dict) -> int:
+        return self._memo(message)
+
+
+def group_turns(messages: List[dict]) -> List[List[dict]]:
+    """
+    Splits messages into units that must be kept or dropped together: an
+    assistant message with tool calls plus the tool results that follow it,
+    or any other single message.
+    """
+    units = []
+    for message in messages:
+        if message.get("role") == "tool" and units and _opens_tool_calls(units[-1]):
+            units[-1].append(message)
+        else:
+            units.append([message])
+    return units
+
+
+def _opens_tool_calls(unit: List[dict]) -> bool:
+    return unit[0].get("role") == "assistant" and bool(unit[0].get("tool_calls"))
+
+
+class ContextWindow:
+    """
+    Context-window policy that trims the messages sent with each completion
+    to the most recent `max_tokens` tokens.
+
+    System messages and messages matching `pinned` are always kept, a tool
+    call is never separated from its results, and the newest turn is kept
+    even if it alone exceeds the budget. The kept messages stay in their
+    original order. Counts come from `counter`, memoized per message.
+    """
+
+    def __init__(
+        self,
+        max_tokens: int,
+        pinned: Optional[Callable[[dict], bool]] = None,
+        counter: Optional[Callable[[dict], int]] = None,
+    ):
+        self.max_tokens = max_tokens
+        self.pinned = pinned
+        self.counter = counter or TokenCounter()
+
+    def is_pinned(self, message: dict) -> bool:
+        return message.get("role") == "system" or bool(
+            self.pinned and self.pinned(message)
+        )
+
+    def __call__(self, messages: List[dict]) -> List[dict]:
+        units = group_turns(messages)
+        costs = [sum(self.counter(m) for m in unit) for unit in units]
+        if sum(costs) <= self.max_tokens:
+            return messages
+
+        keep = [any(self.is_pinned(m) for m in unit) for unit in units]
+        budget = self.max_tokens - sum(c for c, k in zip(costs, keep) if k)
+
+        # fill the rest of the budget with the most recent contiguous turns
+        for i in range(len(units) - 1, -1, -1):
+            if keep[i]:
+                continue
+            if costs[i] > budget and i != len(units) - 1:
+                break
+            keep[i] = True
+            budget -= costs[i]
+
+        return [m for unit, k in zip(units, keep) if k for m in unit]
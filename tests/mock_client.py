@@ -1,7 +1,14 @@
-from unittest.mock import MagicMock
+from unittest.mock import AsyncMock, MagicMock
 from swarm.types import ChatCompletionMessage, ChatCompletionMessageToolCall, Function
 from openai import OpenAI
 from openai.types.chat.chat_completion import ChatCompletion, Choice
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice as ChunkChoice,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+)
 import json
 
 
@@ -41,6 +48,47 @@ def create_mock_response(message, function_calls=[], model="gpt-4o"):
     )
 
 
+def create_mock_stream(message, function_calls=[], model="gpt-4o"):
+    """
+    Build the list of chunks a streamed completion would yield: one chunk per
+    word of content, then one chunk per tool call.
+    """
+
+    def chunk(delta, finish_reason=None):
+        return ChatCompletionChunk(
+            id="mock_cc_id",
+            created=1234567890,
+            model=model,
+            object="chat.completion.chunk",
+            choices=[ChunkChoice(delta=delta, finish_reason=finish_reason, index=0)],
+        )
+
+    chunks = [chunk(ChoiceDelta(role=message.get("role", "assistant")))]
+    for word in message.get("content", "").split(" "):
+        if word:
+            chunks.append(chunk(ChoiceDelta(content=word + " ")))
+    for index, call in enumerate(function_calls):
+        chunks.append(
+            chunk(
+                ChoiceDelta(
+                    tool_calls=[
+                        ChoiceDeltaToolCall(
+                            index=index,
+                            id=f"mock_tc_id_{index}",
+                            type="function",
+                            function=ChoiceDeltaToolCallFunction(
+                                name=call.get("name", ""),
+                                arguments=json.dumps(call.get("args", {})),
+                            ),
+                        )
+                    ]
+                )
+            )
+        )
+    chunks.append(chunk(ChoiceDelta(), finish_reason="stop"))
+    return chunks
+
+
 class MockOpenAIClient:
     def __init__(self):
         self.chat = MagicMock()
@@ -64,6 +112,26 @@ class MockOpenAIClient:
         self.chat.completions.create.assert_called_with(**kwargs)
 
 
+class MockAsyncStream:
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self._chunks)
+        except StopIteration:
+            raise StopAsyncIteration
+
+
+class MockAsyncOpenAIClient(MockOpenAIClient):
+    def __init__(self):
+        super().__init__()
+        self.chat.completions.create = AsyncMock()
+
+
 # Initialize the mock client
 client = MockOpenAIClient()
 
@@ -0,0 +1,213 @@
+import asyncio
+import threading
+
+import pytest
+from swarm import AsyncSwarm, Agent
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockAsyncStream,
+    create_mock_response,
+    create_mock_stream,
+)
+from unittest.mock import Mock
+
+DEFAULT_RESPONSE_CONTENT = "sample response content"
+
+
+@pytest.fixture
+def mock_async_client():
+    m = MockAsyncOpenAIClient()
+    m.set_response(
+        create_mock_response({"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT})
+    )
+    return m
+
+
+def test_run_with_simple_message(mock_async_client: MockAsyncOpenAIClient):
+    client = AsyncSwarm(client=mock_async_client)
+    messages = [{"role": "user", "content": "Hello, how are you?"}]
+    response = asyncio.run(client.run(agent=Agent(), messages=messages))
+
+    assert response.messages[-1]["role"] == "assistant"
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_handoff_and_context_variables(mock_async_client: MockAsyncOpenAIClient):
+    get_weather_mock = Mock()
+
+    def get_weather(location, context_variables):
+        get_weather_mock(location=location, user=context_variables["user"])
+        return "It's sunny today."
+
+    def transfer_to_agent2():
+        return agent2
+
+    agent1 = Agent(name="Test Agent 1", functions=[get_weather, transfer_to_agent2])
+    agent2 = Agent(name="Test Agent 2")
+
+    mock_async_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[
+                    {"name": "get_weather", "args": {"location": "SF"}},
+                    {"name": "transfer_to_agent2"},
+                ],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = AsyncSwarm(client=mock_async_client)
+    messages = [{"role": "user", "content": "Weather, then agent 2"}]
+    response = asyncio.run(
+        client.run(agent=agent1, messages=messages, context_variables={"user": "ann"})
+    )
+
+    get_weather_mock.assert_called_once_with(location="SF", user="ann")
+    assert response.agent == agent2
+    assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_max_turns(mock_async_client: MockAsyncOpenAIClient):
+    def ping():
+        return "pong"
+
+    mock_async_client.set_response(
+        create_mock_response(
+            message={"role": "assistant", "content": ""},
+            function_calls=[{"name": "ping"}],
+        )
+    )
+
+    client = AsyncSwarm(client=mock_async_client)
+    response = asyncio.run(
+        client.run(
+            agent=Agent(functions=[ping]),
+            messages=[{"role": "user", "content": "ping forever"}],
+            max_turns=3,
+        )
+    )
+
+    assert len(response.messages) == 4
+    assert mock_async_client.chat.completions.create.call_count == 2
+
+
+def test_run_and_stream(mock_async_client: MockAsyncOpenAIClient):
+    def get_weather(location):
+        return "It's sunny today."
+
+    mock_async_client.set_sequential_responses(
+        [
+            MockAsyncStream(
+                create_mock_stream(
+                    {"role": "assistant", "content": ""},
+                    [{"name": "get_weather", "args": {"location": "SF"}}],
+                )
+            ),
+            MockAsyncStream(
+                create_mock_stream(
+                    {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+                )
+            ),
+        ]
+    )
+
+    client = AsyncSwarm(client=mock_async_client)
+
+    async def consume():
+        stream = await client.run(
+            agent=Agent(name="Streamer", functions=[get_weather]),
+            messages=[{"role": "user", "content": "What's the weather?"}],
+            stream=True,
+        )
+        return [chunk async for chunk in stream]
+
+    chunks = asyncio.run(consume())
+    response = chunks[-1]["response"]
+
+    assert [c["delim"] for c in chunks if "delim" in c] == ["start", "end"] * 2
+    assert response.messages[0]["tool_calls"][0]["function"]["name"] == "get_weather"
+    assert response.messages[1]["content"] == "It's sunny today."
+    assert response.messages[-1]["content"].strip() == DEFAULT_RESPONSE_CONTENT
+    assert response.messages[-1]["sender"] == "Streamer"
+
+
+def test_async_tool_calls(mock_async_client: MockAsyncOpenAIClient):
+    signal = asyncio.Event()
+
+    async def wait_for_signal():
+        await asyncio.wait_for(signal.wait(), timeout=5)
+        return "received"
+
+    async def send_signal():
+        signal.set()
+        return "sent"
+
+    def lookup():
+        return "looked up"
+
+    mock_async_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[
+                    {"name": "wait_for_signal"},
+                    {"name": "lookup"},
+                    {"name": "send_signal"},
+                ],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = AsyncSwarm(client=mock_async_client, tool_executor=2)
+    response = asyncio.run(
+        client.run(
+            agent=Agent(functions=[wait_for_signal, lookup, send_signal]),
+            messages=[{"role": "user", "content": "Signal yourself"}],
+        )
+    )
+
+    assert [m["content"] for m in response.messages[1:4]] == [
+        "received",
+        "looked up",
+        "sent",
+    ]
+
+
+def test_single_sync_tool_runs_off_the_loop(mock_async_client: MockAsyncOpenAIClient):
+    loop_threads = []
+
+    def blocking_lookup():
+        loop_threads.append(threading.get_ident())
+        return "looked up"
+
+    mock_async_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[{"name": "blocking_lookup"}],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    async def run():
+        client = AsyncSwarm(client=mock_async_client, tool_executor=1)
+        response = await client.run(
+            agent=Agent(functions=[blocking_lookup]),
+            messages=[{"role": "user", "content": "Look it up"}],
+        )
+        return response, threading.get_ident()
+
+    response, loop_thread = asyncio.run(run())
+
+    assert response.messages[1]["content"] == "looked up"
+    assert loop_threads and loop_threads[0] != loop_thread
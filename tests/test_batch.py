@@ -0,0 +1,117 @@
+import asyncio
+import threading
+import time
+
+from swarm import Agent, AsyncSwarm, Swarm
+from swarm.batch import job_kwargs
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockOpenAIClient,
+    create_mock_response,
+)
+
+
+def tool_call_response(name):
+    return create_mock_response(
+        message={"role": "assistant", "content": ""},
+        function_calls=[{"name": name}],
+    )
+
+
+def make_agents():
+    lock = threading.Lock()
+    state = {"running": 0, "peak": 0}
+
+    def work():
+        with lock:
+            state["running"] += 1
+            state["peak"] = max(state["peak"], state["running"])
+        time.sleep(0.02)
+        with lock:
+            state["running"] -= 1
+        return "done"
+
+    def explode():
+        raise RuntimeError("boom")
+
+    return Agent(functions=[work]), Agent(functions=[explode]), state
+
+
+def test_job_kwargs():
+    agent = Agent()
+    messages = [{"role": "user", "content": "hi"}]
+
+    assert job_kwargs((agent, messages)) == {"agent": agent, "messages": messages}
+    assert job_kwargs((agent, messages, {"a": 1}))["context_variables"] == {"a": 1}
+    assert job_kwargs({"agent": agent, "messages": messages, "max_turns": 1}) == {
+        "agent": agent,
+        "messages": messages,
+        "max_turns": 1,
+    }
+
+
+def scripted_client(client):
+    def respond(**params):
+        # call the agent's only tool on the first turn, then stop
+        if params["messages"][-1]["role"] == "user":
+            return tool_call_response(params["tools"][0]["function"]["name"])
+        return create_mock_response({"role": "assistant", "content": "ok"})
+
+    client.chat.completions.create.side_effect = respond
+    return client
+
+
+def check_results(results, batch, state):
+    assert sorted(r.index for r in results) == list(range(10))
+    failures = [r for r in results if not r.ok]
+    assert [r.index for r in failures] == [3]
+    assert isinstance(failures[0].error, RuntimeError)
+    assert all(r.response.messages[-1]["content"] == "ok" for r in results if r.ok)
+    assert state["peak"] <= 3
+    assert batch.stats.jobs == 10
+    assert batch.stats.failed == 1
+    assert batch.stats.latency_p50 > 0
+
+
+def test_run_batch_bounds_concurrency_and_isolates_failures():
+    worker, failing, state = make_agents()
+    client = scripted_client(MockOpenAIClient())
+    messages = [{"role": "user", "content": "go"}]
+
+    batch = Swarm(client=client).run_batch(
+        ((failing if i == 3 else worker, messages) for i in range(10)),
+        max_concurrency=3,
+    )
+    assert batch.stats is None
+    results = list(batch)
+
+    check_results(results, batch, state)
+
+
+def test_async_run_batch():
+    worker, failing, state = make_agents()
+    client = scripted_client(MockAsyncOpenAIClient())
+    messages = [{"role": "user", "content": "go"}]
+
+    async def consume(batch):
+        return [result async for result in batch]
+
+    batch = AsyncSwarm(client=client, tool_executor=4).run_batch(
+        ((failing if i == 3 else worker, messages) for i in range(10)),
+        max_concurrency=3,
+    )
+    results = asyncio.run(consume(batch))
+
+    check_results(results, batch, state)
+
+
+def test_wall_time_starts_with_iteration():
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    messages = [{"role": "user", "content": "go"}]
+
+    batch = Swarm(client=client).run_batch([(Agent(), messages)])
+    time.sleep(0.2)
+    list(batch)
+
+    assert batch.stats.wall_time < 0.2
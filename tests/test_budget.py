@@ -0,0 +1,146 @@
+import asyncio
+
+from openai.types.completion_usage import CompletionUsage
+
+from swarm import Agent, AsyncSwarm, Swarm
+from swarm.types import Budget
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+def looping_responses(turns, prompt_tokens=100, completion_tokens=10):
+    responses = []
+    for _ in range(turns):
+        completion = create_mock_response(
+            {"role": "assistant", "content": ""}, [{"name": "lookup"}]
+        )
+        completion.usage = CompletionUsage(
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            total_tokens=prompt_tokens + completion_tokens,
+        )
+        responses.append(completion)
+    return responses
+
+
+def lookup():
+    return "nothing yet"
+
+
+def models_requested(client):
+    return [call.kwargs["model"] for call in client.chat.completions.create.mock_calls]
+
+
+def test_run_budget_stops_before_the_next_completion():
+    client = MockOpenAIClient()
+    client.set_sequential_responses(looping_responses(5))
+
+    response = Swarm(client=client).run(
+        Agent(functions=[lookup]),
+        MESSAGES,
+        budget=Budget(max_prompt_tokens=250),
+    )
+
+    # 3 completions bring the run to 300 prompt tokens
+    assert client.chat.completions.create.call_count == 3
+    assert response.stop_reason == "budget"
+    assert response.usage.prompt_tokens == 300
+    assert response.messages[-1]["role"] == "tool"
+
+
+def test_budget_with_fallback_downgrades_the_model():
+    client = MockOpenAIClient()
+    client.set_sequential_responses(
+        looping_responses(2)
+        + [create_mock_response({"role": "assistant", "content": "Done"})]
+    )
+
+    response = Swarm(client=client).run(
+        Agent(model="big", functions=[lookup]),
+        MESSAGES,
+        budget=Budget(max_tool_calls=1, fallback_model="small"),
+    )
+
+    assert models_requested(client) == ["big", "small", "small"]
+    assert response.stop_reason is None
+    assert response.messages[-1]["content"] == "Done"
+
+
+def test_agent_budget_counts_only_that_agent():
+    client = MockOpenAIClient()
+    billing = Agent(name="Billing", functions=[lookup])
+
+    def transfer():
+        return billing
+
+    triage = Agent(
+        name="Triage",
+        model="big",
+        functions=[transfer],
+        budget=Budget(max_completion_tokens=5, fallback_model="small"),
+    )
+    handoff = create_mock_response({"role": "assistant"}, [{"name": "transfer"}])
+    handoff.usage = CompletionUsage(
+        prompt_tokens=100, completion_tokens=10, total_tokens=110
+    )
+    client.set_sequential_responses(
+        [handoff]
+        + looping_responses(2)
+        + [create_mock_response({"role": "assistant", "content": "Done"})]
+    )
+
+    response = Swarm(client=client).run(
+        triage, MESSAGES, budget=Budget(max_tool_calls=3)
+    )
+
+    # Billing has its own model and no budget of its own
+    assert models_requested(client) == ["big", "llama3.2", "llama3.2"]
+    assert response.usage.by_agent["Triage"].completion_tokens == 10
+    assert response.usage.by_agent["Billing"].tool_calls == 2
+    assert response.usage.tool_calls == 3
+    assert response.stop_reason == "budget"
+
+
+def test_streamed_run_stops_on_budget():
+    client = MockOpenAIClient()
+    client.set_sequential_responses(
+        [
+            create_mock_stream({"role": "assistant"}, [{"name": "lookup"}])
+            for _ in range(3)
+        ]
+    )
+
+    events = list(
+        Swarm(client=client).run(
+            Agent(functions=[lookup]),
+            MESSAGES,
+            stream=True,
+            budget=Budget(max_tool_calls=2),
+        )
+    )
+
+    response = events[-1]["response"]
+    assert response.stop_reason == "budget"
+    assert client.chat.completions.create.call_count == 2
+
+
+def test_async_run_stops_on_budget():
+    client = MockAsyncOpenAIClient()
+    client.set_sequential_responses(looping_responses(3))
+
+    response = asyncio.run(
+        AsyncSwarm(client=client).run(
+            Agent(functions=[lookup]),
+            MESSAGES,
+            budget=Budget(max_completion_tokens=20),
+        )
+    )
+
+    assert client.chat.completions.create.call_count == 2
+    assert response.stop_reason == "budget"
@@ -0,0 +1,104 @@
+import asyncio
+
+from swarm import Agent, AsyncSwarm, Swarm
+from swarm.cache import CompletionCache, request_key
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockAsyncStream,
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+def test_request_key_is_order_independent():
+    assert request_key({"model": "m", "messages": MESSAGES}) == request_key(
+        {"messages": MESSAGES, "model": "m"}
+    )
+    assert request_key({"model": "m"}) != request_key({"model": "n"})
+
+
+def test_repeated_runs_hit_memory_cache():
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": "hi"}))
+    cache = CompletionCache()
+    swarm = Swarm(client=client, cache=cache)
+
+    first = swarm.run(agent=Agent(), messages=MESSAGES)
+    second = swarm.run(agent=Agent(), messages=MESSAGES)
+
+    assert client.chat.completions.create.call_count == 1
+    assert first.messages == second.messages
+    assert (cache.stats.memory_hits, cache.stats.misses) == (1, 1)
+
+
+def test_streams_are_replayed():
+    client = MockOpenAIClient()
+    client.set_sequential_responses(
+        [iter(create_mock_stream({"role": "assistant", "content": "hi there"}))]
+    )
+    swarm = Swarm(client=client, cache=CompletionCache())
+
+    runs = [
+        list(swarm.run(agent=Agent(), messages=MESSAGES, stream=True)) for _ in range(2)
+    ]
+
+    assert client.chat.completions.create.call_count == 1
+    assert runs[0][:-1] == runs[1][:-1]
+    assert runs[1][-1]["response"].messages[-1]["content"] == "hi there "
+
+
+def test_async_client_uses_cache():
+    client = MockAsyncOpenAIClient()
+    client.set_sequential_responses(
+        [
+            create_mock_response({"role": "assistant", "content": "hi"}),
+            MockAsyncStream(create_mock_stream({"role": "assistant", "content": "yo"})),
+        ]
+    )
+    swarm = AsyncSwarm(client=client, cache=CompletionCache())
+
+    async def consume(stream):
+        return [chunk async for chunk in stream]
+
+    async def main():
+        for _ in range(2):
+            await swarm.run(agent=Agent(), messages=MESSAGES)
+            await consume(
+                await swarm.run(agent=Agent(), messages=MESSAGES, stream=True)
+            )
+
+    asyncio.run(main())
+
+    assert client.chat.completions.create.call_count == 2
+    assert swarm.cache.stats.memory_hits == 2
+
+
+def test_lru_evicts_by_size():
+    cache = CompletionCache(max_bytes=10)
+    cache.put("a", "12345")
+    cache.put("b", "12345")
+    cache.get("a")
+    cache.put("c", "12345")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == "12345"
+    assert cache.get("c") == "12345"
+
+
+def test_disk_tier_persists_and_expires(tmp_path, monkeypatch):
+    path = str(tmp_path / "cache.sqlite")
+    now = [1000.0]
+    monkeypatch.setattr("swarm.cache.time.time", lambda: now[0])
+
+    CompletionCache(path=path, ttl=60).put("key", "payload")
+
+    cache = CompletionCache(path=path, ttl=60)
+    assert cache.get("key") == "payload"
+    assert cache.stats.disk_hits == 1
+
+    now[0] += 61
+    assert CompletionCache(path=path, ttl=60).get("key") is None
+    assert cache.get("key") is None
@@ -0,0 +1,106 @@
+import asyncio
+import time
+
+import pytest
+
+from swarm import Agent, AsyncSwarm, Swarm
+from swarm.cassette import (
+    AsyncRecordingClient,
+    AsyncReplayClient,
+    CassetteMissError,
+    RecordingClient,
+    ReplayClient,
+)
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockAsyncStream,
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
+
+MESSAGES = [{"role": "user", "content": "What's the weather?"}]
+
+
+def get_weather(location):
+    return "It's sunny today."
+
+
+def slow_stream(chunks, delay):
+    for chunk in chunks:
+        time.sleep(delay)
+        yield chunk
+
+
+def record(path):
+    mock = MockOpenAIClient()
+    mock.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant", "content": ""},
+                [{"name": "get_weather", "args": {"location": "SF"}}],
+            ),
+            create_mock_response({"role": "assistant", "content": "Sunny."}),
+            slow_stream(
+                create_mock_stream({"role": "assistant", "content": "a b"}), 0.01
+            ),
+        ]
+    )
+    recorder = RecordingClient(mock, path)
+    swarm = Swarm(client=recorder)
+    agent = Agent(functions=[get_weather])
+    response = swarm.run(agent=agent, messages=MESSAGES)
+    chunks = list(swarm.run(agent=agent, messages=MESSAGES, stream=True))
+    return recorder, response, chunks
+
+
+def test_record_and_replay(tmp_path):
+    path = str(tmp_path / "cassette.json")
+    recorder, recorded, recorded_chunks = record(path)
+
+    assert len(recorder.interactions) == 3
+    assert recorder.interactions[2]["stream"]
+    assert all(c["delay"] >= 0.01 for c in recorder.interactions[2]["chunks"])
+
+    swarm = Swarm(client=ReplayClient(path))
+    agent = Agent(functions=[get_weather])
+    replayed = swarm.run(agent=agent, messages=MESSAGES)
+    replayed_chunks = list(swarm.run(agent=agent, messages=MESSAGES, stream=True))
+
+    assert replayed.messages == recorded.messages
+    assert replayed_chunks[:-1] == recorded_chunks[:-1]
+
+    with pytest.raises(CassetteMissError):
+        swarm.run(agent=agent, messages=[{"role": "user", "content": "new"}])
+
+
+def test_realtime_replay_keeps_timing(tmp_path):
+    path = str(tmp_path / "cassette.json")
+    record(path)
+
+    client = ReplayClient(path, realtime=True, match="sequence")
+    client.create(model="ignored")
+    client.create(model="ignored")
+    start = time.perf_counter()
+    list(client.create(model="ignored", stream=True))
+
+    assert time.perf_counter() - start >= 0.04
+
+
+def test_async_record_and_replay(tmp_path):
+    path = str(tmp_path / "cassette.json")
+    mock = MockAsyncOpenAIClient()
+    mock.set_sequential_responses(
+        [MockAsyncStream(create_mock_stream({"role": "assistant", "content": "hi"}))]
+    )
+
+    async def run(client):
+        stream = await AsyncSwarm(client=client).run(
+            agent=Agent(), messages=MESSAGES, stream=True
+        )
+        return [chunk async for chunk in stream]
+
+    recorded = asyncio.run(run(AsyncRecordingClient(mock, path)))
+    replayed = asyncio.run(run(AsyncReplayClient(path)))
+
+    assert replayed[:-1] == recorded[:-1]
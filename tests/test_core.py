@@ -1,6 +1,11 @@
+import asyncio
+import threading
+import time
+
 import pytest
 from swarm import Swarm, Agent
-from tests.mock_client import MockOpenAIClient, create_mock_response
+from swarm.types import Result
+from tests.mock_client import MockOpenAIClient, create_mock_response, create_mock_stream
 from unittest.mock import Mock
 import json
 
@@ -143,3 +148,165 @@ def test_handoff(mock_openai_client: MockOpenAIClient):
     assert response.agent == agent2
     assert response.messages[-1]["role"] == "assistant"
     assert response.messages[-1]["content"] == DEFAULT_RESPONSE_CONTENT
+
+
+def test_parallel_tool_calls_with_executor(mock_openai_client: MockOpenAIClient):
+    # both tools must be in flight at once to get past the barrier
+    barrier = threading.Barrier(2, timeout=5)
+
+    def lookup_order(order_id):
+        barrier.wait()
+        time.sleep(0.05)
+        return Result(value="order", context_variables={"source": "order"})
+
+    def lookup_user(user_id):
+        barrier.wait()
+        return Result(value="user", context_variables={"source": "user"}, agent=agent2)
+
+    agent1 = Agent(name="Test Agent 1", functions=[lookup_order, lookup_user])
+    agent2 = Agent(name="Test Agent 2")
+
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[
+                    {"name": "lookup_order", "args": {"order_id": "1"}},
+                    {"name": "lookup_user", "args": {"user_id": "2"}},
+                ],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = Swarm(client=mock_openai_client, tool_executor=2)
+    messages = [{"role": "user", "content": "Look up my order"}]
+    response = client.run(agent=agent1, messages=messages)
+
+    # tool messages keep tool_call order, later calls win on merge
+    assert [m["content"] for m in response.messages[1:3]] == ["order", "user"]
+    assert response.context_variables == {"source": "user"}
+    assert response.agent == agent2
+
+
+def test_async_tool_calls(mock_openai_client: MockOpenAIClient):
+    # wait_for_signal only returns if send_signal runs concurrently with it
+    signal = asyncio.Event()
+
+    async def wait_for_signal():
+        await asyncio.wait_for(signal.wait(), timeout=5)
+        return "received"
+
+    async def send_signal(context_variables):
+        signal.set()
+        return Result(
+            value="sent", context_variables={"user": context_variables["user"]}
+        )
+
+    agent = Agent(functions=[wait_for_signal, send_signal])
+
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[{"name": "wait_for_signal"}, {"name": "send_signal"}],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    client = Swarm(client=mock_openai_client)
+    messages = [{"role": "user", "content": "Signal yourself"}]
+    response = client.run(
+        agent=agent, messages=messages, context_variables={"user": "ann"}
+    )
+
+    assert [m["content"] for m in response.messages[1:3]] == ["received", "sent"]
+    assert response.context_variables == {"user": "ann"}
+
+
+def test_run_does_not_mutate_caller_state(mock_openai_client: MockOpenAIClient):
+    def add_to_cart(item, context_variables):
+        context_variables["cart"].append(item)
+        return Result(value="added", context_variables={"last_item": item})
+
+    mock_openai_client.set_sequential_responses(
+        [
+            create_mock_response(
+                message={"role": "assistant", "content": ""},
+                function_calls=[{"name": "add_to_cart", "args": {"item": "pear"}}],
+            ),
+            create_mock_response(
+                {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+            ),
+        ]
+    )
+
+    messages = [{"role": "user", "content": "Add a pear"}]
+    context_variables = {"cart": ["apple"], "user": {"name": "ann"}}
+
+    client = Swarm(client=mock_openai_client)
+    response = client.run(
+        agent=Agent(functions=[add_to_cart]),
+        messages=messages,
+        context_variables=context_variables,
+    )
+
+    assert messages == [{"role": "user", "content": "Add a pear"}]
+    assert context_variables == {"cart": ["apple"], "user": {"name": "ann"}}
+    assert response.context_variables == {
+        "cart": ["apple", "pear"],
+        "user": {"name": "ann"},
+        "last_item": "pear",
+    }
+
+
+def test_agents_compare_by_identity():
+    agent = Agent(name="Same")
+    twin = Agent(name="Same")
+
+    assert agent == agent
+    assert agent != twin
+    assert {agent: 1, twin: 2}[agent] == 1
+    assert agent.model_copy() != agent
+
+
+def test_run_and_stream(mock_openai_client: MockOpenAIClient):
+    def get_weather(location):
+        return "It's sunny today."
+
+    mock_openai_client.set_sequential_responses(
+        [
+            iter(
+                create_mock_stream(
+                    {"role": "assistant", "content": ""},
+                    [{"name": "get_weather", "args": {"location": "SF"}}],
+                )
+            ),
+            iter(
+                create_mock_stream(
+                    {"role": "assistant", "content": DEFAULT_RESPONSE_CONTENT}
+                )
+            ),
+        ]
+    )
+
+    client = Swarm(client=mock_openai_client)
+    chunks = list(
+        client.run(
+            agent=Agent(name="Streamer", functions=[get_weather]),
+            messages=[{"role": "user", "content": "What's the weather?"}],
+            stream=True,
+        )
+    )
+    response = chunks[-1]["response"]
+
+    assert [c["delim"] for c in chunks if "delim" in c] == ["start", "end"] * 2
+    assert response.messages[0]["tool_calls"][0]["function"]["name"] == "get_weather"
+    assert response.messages[1]["content"] == "It's sunny today."
+    assert response.messages[-1]["content"].strip() == DEFAULT_RESPONSE_CONTENT
+    assert response.messages[-1]["sender"] == "Streamer"
@@ -0,0 +1,293 @@
+import asyncio
+import threading
+import time
+
+import httpx
+import openai
+
+from swarm import Agent, AsyncSwarm, Swarm
+from swarm.deadline import Deadline
+from swarm.types import Result
+from swarm.tools import get_tool_plan
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
+
+MESSAGES = [{"role": "user", "content": "Hello"}]
+
+
+def tool_call_then_answer(name):
+    return [
+        create_mock_response(
+            {"role": "assistant", "content": ""}, [{"name": name, "args": {}}]
+        ),
+        create_mock_response({"role": "assistant", "content": "Done"}),
+    ]
+
+
+def test_expired_deadline_returns_an_empty_partial_response():
+    client = MockOpenAIClient()
+
+    response = Swarm(client=client).run(Agent(), MESSAGES, deadline=0)
+
+    assert response.messages == []
+    assert response.stop_reason == "deadline"
+    client.chat.completions.create.assert_not_called()
+
+
+def test_requests_get_the_time_left_as_timeout():
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": "Hi"}))
+
+    response = Swarm(client=client).run(Agent(), MESSAGES, deadline=30)
+
+    timeout = client.chat.completions.create.call_args.kwargs["timeout"]
+    assert 0 < timeout <= 30
+    assert response.stop_reason is None
+
+
+def test_request_timing_out_at_the_deadline_ends_the_run():
+    client = MockOpenAIClient()
+    responses = iter(tool_call_then_answer("lookup"))
+
+    def create(**params):
+        if "tools" in params and params["messages"][-1]["role"] == "tool":
+            time.sleep(params["timeout"])
+            raise openai.APITimeoutError(request=None)
+        return next(responses)
+
+    client.chat.completions.create.side_effect = create
+
+    def lookup():
+        return "found"
+
+    agent = Agent(functions=[lookup])
+    response = Swarm(client=client).run(agent, MESSAGES, deadline=0.2)
+
+    # history gathered before the cut-off request
+    assert [m["role"] for m in response.messages] == ["assistant", "tool"]
+    assert response.messages[1]["content"] == "found"
+    assert response.stop_reason == "deadline"
+
+
+def test_slow_tool_times_out_and_the_run_goes_on():
+    client = MockOpenAIClient()
+    client.set_sequential_responses(tool_call_then_answer("slow"))
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "late"
+
+    start = time.perf_counter()
+    response = Swarm(client=client).run(
+        Agent(functions=[slow]), MESSAGES, tool_timeout=0.05
+    )
+    release.set()
+
+    assert time.perf_counter() - start < 2
+    assert response.messages[1]["content"] == "Error: Tool slow timed out after 0.05s."
+    assert response.messages[-1]["content"] == "Done"
+    assert response.stop_reason is None
+
+
+def test_tools_receive_the_deadline_and_can_cancel_the_run():
+    client = MockOpenAIClient()
+    client.set_sequential_responses(tool_call_then_answer("give_up"))
+
+    def give_up(deadline: Deadline):
+        deadline.cancel()
+        return "cancelling"
+
+    agent = Agent(functions=[give_up])
+    schema = get_tool_plan(agent).schemas[0]["function"]["parameters"]
+    assert "deadline" not in schema["properties"]
+
+    response = Swarm(client=client).run(agent, MESSAGES, deadline=Deadline())
+
+    assert [m["role"] for m in response.messages] == ["assistant", "tool"]
+    assert response.stop_reason == "cancelled"
+    assert client.chat.completions.create.call_count == 1
+
+
+def test_plain_deadline_parameter_is_left_to_the_model():
+    client = MockOpenAIClient()
+    client.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant", "content": ""},
+                [{"name": "set_reminder", "args": {"text": "x", "deadline": "5pm"}}],
+            ),
+            create_mock_response({"role": "assistant", "content": "Done"}),
+        ]
+    )
+
+    def set_reminder(text: str, deadline: str, swarm_deadline=None):
+        return Result(value=f"{deadline} {swarm_deadline is not None}")
+
+    agent = Agent(functions=[set_reminder])
+    schema = get_tool_plan(agent).schemas[0]["function"]["parameters"]
+    assert list(schema["properties"]) == ["text", "deadline"]
+
+    response = Swarm(client=client).run(agent, MESSAGES, deadline=30)
+
+    assert response.messages[1]["content"] == "5pm True"
+
+
+def test_requests_under_a_deadline_are_not_retried():
+    requests = []
+
+    def handler(request):
+        requests.append(request)
+        raise httpx.ReadTimeout("timed out", request=request)
+
+    client = openai.OpenAI(
+        api_key="test",
+        base_url="http://localhost/v1",
+        http_client=httpx.Client(transport=httpx.MockTransport(handler)),
+    )
+
+    try:
+        Swarm(client=client).run(Agent(), MESSAGES, deadline=30)
+    except openai.APITimeoutError:
+        pass
+
+    assert len(requests) == 1
+
+
+def test_stalled_stream_is_cut_off():
+    client = MockOpenAIClient()
+    chunks = create_mock_stream({"role": "assistant", "content": "one two three"})
+
+    def stream():
+        yield from chunks[:2]
+        time.sleep(0.2)
+        yield from chunks[2:]
+
+    client.set_response(stream())
+
+    start = time.perf_counter()
+    events = list(
+        Swarm(client=client).run(Agent(), MESSAGES, stream=True, deadline=0.1)
+    )
+
+    # the run stops waiting at the deadline, not after the slow read
+    assert time.perf_counter() - start < 0.19
+    assert events[0] == {"delim": "start"}
+    assert events[-2] == {"delim": "end"}
+    response = events[-1]["response"]
+    assert response.messages == []
+    assert response.stop_reason == "deadline"
+
+
+def test_deadline_wait_wakes_on_cancel():
+    deadline = Deadline(timeout=10)
+    threading.Timer(0.05, deadline.cancel).start()
+
+    start = time.perf_counter()
+    assert deadline.wait()
+    assert time.perf_counter() - start < 5
+    assert deadline.reason == "cancelled"
+
+
+def test_async_tool_is_cancelled_at_its_timeout():
+    client = MockAsyncOpenAIClient()
+    client.set_sequential_responses(tool_call_then_answer("slow"))
+    cancelled = []
+
+    async def slow():
+        try:
+            await asyncio.sleep(5)
+        except asyncio.CancelledError:
+            cancelled.append(True)
+            raise
+        return "late"
+
+    response = asyncio.run(
+        AsyncSwarm(client=client).run(
+            Agent(functions=[slow]), MESSAGES, tool_timeout=0.05
+        )
+    )
+
+    assert cancelled == [True]
+    assert response.messages[1]["content"] == "Error: Tool slow timed out after 0.05s."
+    assert response.messages[-1]["content"] == "Done"
+
+
+def test_async_stream_is_cut_off_at_the_deadline():
+    client = MockAsyncOpenAIClient()
+    chunks = create_mock_stream({"role": "assistant", "content": "one two three"})
+    closed = []
+
+    async def stream():
+        try:
+            yield chunks[0]
+            await asyncio.sleep(5)
+            yield chunks[1]
+        finally:
+            closed.append(True)
+
+    client.set_response(stream())
+
+    async def run():
+        events = AsyncSwarm(client=client).run_and_stream(
+            Agent(), MESSAGES, deadline=0.1
+        )
+        return [event async for event in events]
+
+    start = time.perf_counter()
+    events = asyncio.run(run())
+
+    assert time.perf_counter() - start < 2
+    assert events[-1]["response"].stop_reason == "deadline"
+    assert closed == [True]
+
+
+def test_async_waits_leave_no_callbacks_behind():
+    deadline = Deadline()
+
+    async def wait_many():
+        for _ in range(3):
+            task = asyncio.ensure_future(asyncio.sleep(0))
+            await deadline.wait_for_async(task)
+
+    asyncio.run(wait_many())
+
+    assert not deadline._callbacks
+
+
+def test_tool_stopping_itself_ends_the_run_with_a_partial_response():
+    client = MockOpenAIClient()
+    client.set_sequential_responses(tool_call_then_answer("give_up"))
+
+    def give_up(swarm_deadline: Deadline):
+        swarm_deadline.cancel()
+        swarm_deadline.check()
+
+    response = Swarm(client=client).run(
+        Agent(functions=[give_up]), MESSAGES, deadline=30
+    )
+
+    assert response.messages[1]["content"] == "Error: Tool give_up was cancelled."
+    assert response.stop_reason == "cancelled"
+    assert client.chat.completions.create.call_count == 1
+
+
+def test_async_tool_checking_past_the_deadline_ends_the_run():
+    client = MockAsyncOpenAIClient()
+    client.set_sequential_responses(tool_call_then_answer("poll"))
+
+    async def poll(swarm_deadline: Deadline):
+        while True:
+            await asyncio.sleep(0.001)
+            swarm_deadline.check()
+
+    response = asyncio.run(
+        AsyncSwarm(client=client).run(Agent(functions=[poll]), MESSAGES, deadline=0.05)
+    )
+
+    assert response.messages[1]["role"] == "tool"
+    assert response.stop_reason == "deadline"
@@ -0,0 +1,99 @@
+import json
+
+import pytest
+from swarm import Agent, Swarm
+from swarm.flight import FlightRecorder
+from tests.mock_client import MockOpenAIClient, create_mock_response, create_mock_stream
+
+
+def lookup(order_id):
+    return f"order {order_id} shipped"
+
+
+def tool_responses():
+    return [
+        create_mock_response(
+            {"role": "assistant"}, [{"name": "lookup", "args": {"order_id": "7"}}]
+        ),
+        create_mock_response({"role": "assistant", "content": "it shipped"}),
+    ]
+
+
+def run(recorder, responses=None, stream=False):
+    client = MockOpenAIClient()
+    client.set_sequential_responses(responses or tool_responses())
+    swarm = Swarm(client=client, hooks=[recorder])
+    result = swarm.run(agent=Agent(functions=[lookup]), messages=[], stream=stream)
+    return list(result) if stream else result
+
+
+def test_fast_runs_stay_in_memory_only(tmp_path):
+    recorder = FlightRecorder(str(tmp_path), latency_threshold=60, turn_threshold=5)
+
+    run(recorder)
+
+    (record,) = recorder.recent()
+    assert not recorder.dumped
+    assert record["turns"] == 2
+    events = [event["event"] for event in record["events"]]
+    assert events[0] == "run_start" and events[-1] == "run_end"
+    tool_end = next(e for e in record["events"] if e["event"] == "tool_end")
+    assert tool_end["tool"] == "lookup" and tool_end["chars"] == len("order 7 shipped")
+    completion = [e for e in record["events"] if e["event"] == "completion"][-1]
+    assert completion["chars"] == len("it shipped")
+
+
+def test_runs_over_the_turn_threshold_are_dumped(tmp_path):
+    recorder = FlightRecorder(str(tmp_path), turn_threshold=2)
+
+    run(recorder)
+
+    (path,) = recorder.dumped
+    with open(path) as f:
+        record = json.load(f)
+    assert record["turns"] == 2
+    assert any(event["event"] == "request_sent" for event in record["events"])
+
+
+def test_runs_over_the_latency_threshold_are_dumped(tmp_path):
+    recorder = FlightRecorder(str(tmp_path), latency_threshold=0)
+
+    run(recorder)
+
+    assert len(recorder.dumped) == 1
+
+
+def test_failed_runs_are_dumped(tmp_path):
+    recorder = FlightRecorder(str(tmp_path))
+
+    with pytest.raises(StopIteration):
+        run(recorder, responses=tool_responses()[:1])
+
+    with open(recorder.dumped[0]) as f:
+        assert "StopIteration" in json.load(f)["error"]
+
+
+def test_stream_chunks_are_recorded(tmp_path):
+    recorder = FlightRecorder(str(tmp_path))
+
+    run(
+        recorder,
+        responses=[create_mock_stream({"role": "assistant", "content": "a b c"})],
+        stream=True,
+    )
+
+    chunks = [e for e in recorder.recent()[0]["events"] if e["event"] == "chunk"]
+    assert [chunk["chars"] for chunk in chunks] == [0, 2, 2, 2, 0]
+
+
+def test_memory_is_bounded(tmp_path):
+    recorder = FlightRecorder(str(tmp_path), capacity=3, max_events=4)
+
+    for _ in range(5):
+        run(recorder)
+
+    recent = recorder.recent()
+    assert len(recent) == 3
+    assert all(len(record["events"]) == 4 for record in recent)
+    assert recent[-1]["dropped_events"] > 0
+    assert recent[-1]["events"][-1]["event"] == "run_end"
@@ -0,0 +1,152 @@
+import asyncio
+
+import pytest
+from swarm import Agent, AsyncSwarm, Swarm
+from swarm.hooks import EVENTS, RunHooks
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
+
+
+class Recorder(RunHooks):
+    def __init__(self):
+        self.events = []
+        for name in EVENTS:
+            setattr(self, "on_" + name, self.events.append)
+
+    def names(self):
+        return [event.name for event in self.events]
+
+
+def handoff_agents():
+    def lookup(order_id):
+        return f"order {order_id} shipped"
+
+    def transfer_to_billing():
+        return billing
+
+    billing = Agent(name="Billing")
+    triage = Agent(name="Triage", functions=[lookup, transfer_to_billing])
+    return triage, billing
+
+
+def handoff_responses():
+    tool_calls = [
+        {"name": "lookup", "args": {"order_id": "42"}},
+        {"name": "transfer_to_billing"},
+    ]
+    return [
+        create_mock_response({"role": "assistant"}, tool_calls),
+        create_mock_response({"role": "assistant", "content": "done"}),
+    ]
+
+
+def test_run_emits_lifecycle_events():
+    client = MockOpenAIClient()
+    client.set_sequential_responses(handoff_responses())
+    recorder = Recorder()
+    triage, billing = handoff_agents()
+
+    response = Swarm(client=client, hooks=[recorder]).run(agent=triage, messages=[])
+
+    assert recorder.names() == [
+        "run_start",
+        "turn_start",
+        "request_sent",
+        "completion",
+        "tool_start",
+        "tool_end",
+        "tool_start",
+        "tool_end",
+        "handoff",
+        "turn_end",
+        "turn_start",
+        "request_sent",
+        "completion",
+        "turn_end",
+        "run_end",
+    ]
+    events = recorder.events
+    assert len({event.run_id for event in events}) == 1
+    assert [event.time for event in events] == sorted(event.time for event in events)
+    assert events[4].tool_name == "lookup" and events[4].agent == "Triage"
+    assert events[5].data.value == "order 42 shipped"
+    assert events[8].target == "Billing"
+    assert events[-2].agent == "Billing" and events[-2].turn == 2
+    assert events[3].message_id == "mock_cc_id"
+    assert events[-1].data is response
+    assert all(e.duration >= 0 for e in events if e.name.endswith("_end"))
+
+
+def test_stream_emits_first_token():
+    client = MockOpenAIClient()
+    client.set_response(create_mock_stream({"role": "assistant", "content": "hi"}))
+    recorder = Recorder()
+
+    for _ in Swarm(client=client, hooks=[recorder]).run(
+        agent=Agent(), messages=[], stream=True
+    ):
+        pass
+
+    assert recorder.names() == [
+        "run_start",
+        "turn_start",
+        "request_sent",
+        "first_token",
+        "completion",
+        "turn_end",
+        "run_end",
+    ]
+    assert recorder.events[3].message_id == "mock_cc_id"
+
+
+def test_async_run_emits_the_same_events():
+    client = MockAsyncOpenAIClient()
+    client.set_sequential_responses(handoff_responses())
+    sync_client = MockOpenAIClient()
+    sync_client.set_sequential_responses(handoff_responses())
+    recorder, sync_recorder = Recorder(), Recorder()
+
+    triage, _ = handoff_agents()
+    asyncio.run(AsyncSwarm(client=client, hooks=[recorder]).run(triage, []))
+    Swarm(client=sync_client, hooks=[sync_recorder]).run(triage, [])
+
+    assert recorder.names() == sync_recorder.names()
+
+
+def test_failing_tool_reports_errors():
+    def broken():
+        raise RuntimeError("boom")
+
+    client = MockOpenAIClient()
+    client.set_response(
+        create_mock_response({"role": "assistant"}, [{"name": "broken"}])
+    )
+    recorder = Recorder()
+
+    with pytest.raises(RuntimeError):
+        Swarm(client=client, hooks=[recorder]).run(
+            agent=Agent(functions=[broken]), messages=[]
+        )
+
+    tool_end, run_end = recorder.events[-2:]
+    assert (tool_end.name, run_end.name) == ("tool_end", "run_end")
+    assert tool_end.error is run_end.error
+
+
+def test_no_hooks_builds_no_events(monkeypatch):
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": "hi"}))
+    monkeypatch.setattr("swarm.hooks.HookEvent", None)
+
+    response = Swarm(client=client).run(agent=Agent(), messages=[])
+
+    assert response.messages[-1]["content"] == "hi"
+
+
+def test_base_hooks_implement_every_event():
+    for name in EVENTS:
+        assert callable(getattr(RunHooks(), "on_" + name))
@@ -0,0 +1,135 @@
+import json
+
+from swarm import Agent, Swarm
+from swarm.layout import PromptLayout, canonical, stable_tool_schemas
+from swarm.window import ContextWindow
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def lookup(order_id: str, verbose: bool = False):
+    return "found"
+
+
+def add_note(text: str):
+    return "ok"
+
+
+def mock_swarm(**options):
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    return Swarm(client=client, **options), client
+
+
+def sent(client):
+    return client.chat.completions.create.call_args.kwargs
+
+
+def test_canonical_sorts_keys_recursively():
+    value = {"b": [{"d": 1, "c": 2}], "a": None}
+
+    assert json.dumps(canonical(value)) == '{"a": null, "b": [{"c": 2, "d": 1}]}'
+
+
+def test_stable_tool_schemas_are_sorted_by_name():
+    schemas = [
+        {"type": "function", "function": {"name": name, "parameters": {}}}
+        for name in ("lookup", "add_note")
+    ]
+
+    stable = stable_tool_schemas(schemas)
+
+    assert [schema["function"]["name"] for schema in stable] == ["add_note", "lookup"]
+    assert list(stable[0]) == ["function", "type"]
+
+
+def test_default_layout_appends_context_instructions_to_system_prompt():
+    swarm, client = mock_swarm()
+    agent = Agent(
+        instructions="Be brief.",
+        context_instructions=lambda cv: f"User: {cv['user']}",
+    )
+
+    swarm.run(agent=agent, messages=[], context_variables={"user": "Ada"})
+
+    assert sent(client)["messages"] == [
+        {"role": "system", "content": "Be brief.\n\nUser: Ada"}
+    ]
+
+
+def test_stable_layout_moves_volatile_context_after_history():
+    layout = PromptLayout()
+    swarm, client = mock_swarm(prompt_layout=layout)
+    agent = Agent(
+        instructions="Be brief.",
+        context_instructions=lambda cv: f"User: {cv['user']}",
+        functions=[lookup, add_note],
+    )
+    history = [{"role": "user", "content": "hi"}]
+
+    swarm.run(agent=agent, messages=history, context_variables={"user": "Ada"})
+
+    params = sent(client)
+    assert params["messages"] == [
+        {"role": "system", "content": "Be brief."},
+        {"role": "user", "content": "hi"},
+        {"role": "system", "content": "User: Ada"},
+    ]
+    assert [tool["function"]["name"] for tool in params["tools"]] == [
+        "add_note",
+        "lookup",
+    ]
+    report = layout.last_report
+    assert report.agent == agent.name
+    assert report.shared_chars == 0
+    assert 0 < report.stable_chars < report.prompt_chars
+
+
+def test_callable_instructions_are_treated_as_volatile():
+    swarm, client = mock_swarm(prompt_layout=PromptLayout())
+    agent = Agent(instructions=lambda cv: f"Help {cv['user']}.")
+
+    swarm.run(agent=agent, messages=[{"role": "user", "content": "hi"}])
+
+    assert sent(client)["messages"] == [
+        {"role": "user", "content": "hi"},
+        {"role": "system", "content": "Help ."},
+    ]
+
+
+def test_window_keeps_latest_user_turn_before_volatile_context():
+    swarm, client = mock_swarm(
+        prompt_layout=PromptLayout(), context_window=ContextWindow(max_tokens=50)
+    )
+    agent = Agent(instructions="Be brief.", context_instructions="User is Ann.")
+    history = [
+        {"role": "user", "content": "a" * 400},
+        {"role": "user", "content": "What is my order status?"},
+    ]
+
+    swarm.run(agent=agent, messages=history)
+
+    assert sent(client)["messages"] == [
+        {"role": "system", "content": "Be brief."},
+        {"role": "user", "content": "What is my order status?"},
+        {"role": "system", "content": "User is Ann."},
+    ]
+
+
+def test_report_measures_prefix_shared_with_previous_request():
+    reports = []
+    swarm, _ = mock_swarm(prompt_layout=PromptLayout(on_report=reports.append))
+    agent = Agent(
+        instructions="Be brief.",
+        context_instructions=lambda cv: f"Turn {cv['turn']}",
+        functions=[lookup],
+    )
+    history = [{"role": "user", "content": "hi"}]
+
+    response = swarm.run(agent=agent, messages=history, context_variables={"turn": 1})
+    history += response.messages + [{"role": "user", "content": "and?"}]
+    swarm.run(agent=agent, messages=history, context_variables={"turn": 2})
+
+    first, second = reports
+    # everything but the trailing context message carried over unchanged
+    assert second.shared_chars == first.stable_chars
+    assert second.stable_chars > first.stable_chars
@@ -0,0 +1,155 @@
+import io
+import json
+import logging
+import sys
+
+import pytest
+
+from swarm import Agent, Swarm
+from swarm.log import (
+    BufferedHandler,
+    ConsoleFormatter,
+    configure_logging,
+    log_debug,
+    logger,
+    render,
+)
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+@pytest.fixture(autouse=True)
+def reset_logger():
+    yield
+    for handler in list(logger.handlers):
+        logger.removeHandler(handler)
+        handler.close()
+    logger.setLevel(logging.NOTSET)
+    logger.propagate = True
+
+
+class Exploding:
+    def __str__(self):
+        raise AssertionError("formatted without being emitted")
+
+    __repr__ = __str__
+
+
+def test_nothing_is_formatted_when_disabled():
+    logger.setLevel(logging.WARNING)
+
+    log_debug(False, "Received completion", message=Exploding())
+
+
+def test_fields_are_rendered_with_a_size_cap():
+    assert render("x" * 10, max_chars=4) == "xxxx… (+6 chars)"
+    assert render({"role": "user"}) == '{"role": "user"}'
+
+    record = logging.LogRecord("swarm", logging.DEBUG, "", 0, "Ending turn", (), None)
+    record.swarm_fields = {"messages": ["a" * 50]}
+    line = ConsoleFormatter(max_chars=10).format(record)
+    assert 'Ending turn messages=["aaaaaaaa… (+44 chars)' in line
+
+
+def test_json_output():
+    stream = io.StringIO()
+    configure_logging(json_output=True, stream=stream, max_chars=20)
+
+    log_debug(False, "Processing tool call", tool="lookup", arguments={"q": "x" * 30})
+
+    entry = json.loads(stream.getvalue())
+    assert entry["message"] == "Processing tool call"
+    assert entry["level"] == "DEBUG"
+    assert entry["tool"] == "lookup"
+    assert entry["arguments"] == '{"q": "xxxxxxxxxxxxx… (+19 chars)'
+
+
+def test_debug_flag_prints_to_stdout_without_configuration(capsys):
+    logger.setLevel(logging.WARNING)
+    logger.propagate = False
+
+    log_debug(True, "Ending turn", turn=2)
+
+    assert "Ending turn turn=2" in capsys.readouterr().out
+
+
+def test_buffered_handler_formats_off_thread_and_drops_when_full():
+    stream = io.StringIO()
+    handler = configure_logging(json_output=True, stream=stream, buffered=True)
+    assert isinstance(handler, BufferedHandler)
+
+    log_debug(False, "Ending turn", turn=1)
+    handler.close()
+    assert json.loads(stream.getvalue())["turn"] == 1
+
+    full = BufferedHandler(logging.NullHandler(), capacity=1)
+    full.close()
+    full.handle(logging.makeLogRecord({"msg": "a"}))
+    full.handle(logging.makeLogRecord({"msg": "b"}))
+    assert full.dropped == 1
+
+
+def test_run_logs_structured_records(caplog):
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": "Hi"}))
+    agent = Agent()
+
+    with caplog.at_level(logging.DEBUG, logger="swarm"):
+        Swarm(client=client).run(agent, [{"role": "user", "content": "Hello"}])
+
+    records = {record.swarm_message: record for record in caplog.records}
+    request = records["Getting chat completion"]
+    assert request.swarm_fields["agent"] == agent.name
+    assert request.swarm_fields["messages"][-1]["content"] == "Hello"
+    assert "Received completion" in records
+
+
+def test_buffered_record_is_frozen_when_logged():
+    stream = io.StringIO()
+    handler = configure_logging(json_output=True, stream=stream, buffered=True)
+    args = {"query": "weather"}
+
+    log_debug(False, "Processing tool call", tool="lookup", arguments=args)
+    args["context_variables"] = {"secret": "hunter2"}
+    handler.close()
+
+    entry = json.loads(stream.getvalue())
+    assert entry["arguments"] == '{"query": "weather"}'
+    assert entry["tool"] == "lookup"
+
+
+def test_logged_tool_arguments_leave_out_context_variables(caplog):
+    client = MockOpenAIClient()
+    client.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant", "content": ""},
+                [{"name": "lookup", "args": {"query": "weather"}}],
+            ),
+            create_mock_response({"role": "assistant", "content": "Done"}),
+        ]
+    )
+
+    def lookup(query, context_variables):
+        return query
+
+    with caplog.at_level(logging.DEBUG, logger="swarm"):
+        Swarm(client=client).run(
+            Agent(functions=[lookup]),
+            [{"role": "user", "content": "Hello"}],
+            context_variables={"secret": "hunter2"},
+        )
+
+    (record,) = [r for r in caplog.records if r.swarm_message == "Processing tool call"]
+    assert record.swarm_fields["arguments"] == {"query": "weather"}
+
+
+def test_fields_reach_other_formatters(capsys):
+    logger.setLevel(logging.WARNING)
+    handler = logging.StreamHandler(sys.stdout)
+    handler.setFormatter(logging.Formatter("%(levelname)s:%(name)s:%(message)s"))
+    logger.addHandler(handler)
+
+    log_debug(True, "Processing tool call", tool="lookup", arguments={"q": "x"})
+
+    out = capsys.readouterr().out
+    assert 'DEBUG:swarm:Processing tool call tool=lookup arguments={"q": "x"}' in out
@@ -0,0 +1,133 @@
+import urllib.request
+
+import pytest
+from openai.types.completion_usage import CompletionUsage
+
+from swarm import Agent, Swarm
+from swarm.metrics import Histogram, MetricsHooks, MetricsRegistry
+from tests.mock_client import MockOpenAIClient, create_mock_response, create_mock_stream
+
+
+def test_histogram_uses_fixed_buckets():
+    histogram = Histogram("latency", "Latency.", ["tool"], buckets=[0.1, 1])
+
+    for value in (0.05, 0.5, 0.5, 5):
+        histogram.observe(value, tool="lookup")
+
+    assert histogram.render()[2:] == [
+        'latency_bucket{tool="lookup",le="0.1"} 1',
+        'latency_bucket{tool="lookup",le="1"} 3',
+        'latency_bucket{tool="lookup",le="+Inf"} 4',
+        'latency_sum{tool="lookup"} 6.05',
+        'latency_count{tool="lookup"} 4',
+    ]
+    assert histogram.quantile(0.5, tool="lookup") == 1
+    assert histogram.quantile(0.99, tool="lookup") == float("inf")
+
+
+def test_labels_are_checked_and_escaped():
+    registry = MetricsRegistry()
+    counter = registry.counter("calls_total", "Calls.", ["tool"])
+
+    counter.inc(tool='say "hi"\n')
+
+    assert 'calls_total{tool="say \\"hi\\"\\n"} 1' in registry.render()
+    with pytest.raises(ValueError):
+        counter.inc(agent="x")
+    with pytest.raises(ValueError):
+        registry.histogram("calls_total", "Calls.")
+
+
+def run_with_metrics(hooks):
+    def lookup():
+        return "found"
+
+    def broken():
+        raise RuntimeError("boom")
+
+    def transfer():
+        return Agent(name="Billing")
+
+    completion = create_mock_response({"role": "assistant"}, [{"name": "lookup"}])
+    completion.usage = CompletionUsage(
+        prompt_tokens=30, completion_tokens=5, total_tokens=35
+    )
+    client = MockOpenAIClient()
+    client.set_sequential_responses(
+        [
+            completion,
+            create_mock_response({"role": "assistant"}, [{"name": "transfer"}]),
+            create_mock_response({"role": "assistant", "content": "done"}),
+        ]
+    )
+    agent = Agent(name="Triage", functions=[lookup, broken, transfer])
+    Swarm(client=client, hooks=[hooks]).run(agent=agent, messages=[])
+
+
+def test_hooks_record_run_metrics():
+    hooks = MetricsHooks()
+
+    run_with_metrics(hooks)
+
+    assert hooks.tool_seconds.count(agent="Triage", tool="lookup") == 1
+    assert hooks.completion_seconds.count(agent="Triage", model="gpt-4o") == 2
+    assert hooks.completion_seconds.count(agent="Billing", model="gpt-4o") == 1
+    assert hooks.tokens.value(agent="Triage", model="gpt-4o", kind="prompt") == 30
+    assert hooks.turns_per_run.quantile(1.0) == 3
+    assert hooks.handoffs_per_run.quantile(1.0) == 1
+    assert hooks.runs.value(status="ok") == 1
+
+
+def test_stream_records_time_to_first_token():
+    hooks = MetricsHooks()
+    client = MockOpenAIClient()
+    client.set_response(create_mock_stream({"role": "assistant", "content": "hi"}))
+
+    list(Swarm(client=client, hooks=[hooks]).run(Agent(), [], stream=True))
+
+    assert hooks.ttft_seconds.count(agent="Agent", model="gpt-4o") == 1
+
+
+def test_abandoned_stream_counts_as_cancelled():
+    hooks = MetricsHooks()
+    client = MockOpenAIClient()
+    client.set_response(create_mock_stream({"role": "assistant", "content": "a b"}))
+
+    stream = Swarm(client=client, hooks=[hooks]).run(Agent(), [], stream=True)
+    next(stream)
+    stream.close()
+
+    assert hooks.runs.value(status="cancelled") == 1
+    assert hooks.runs.value(status="error") == 0
+
+
+def test_failing_tools_are_counted():
+    hooks = MetricsHooks()
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant"}, [{"name": "f"}]))
+
+    def f():
+        raise RuntimeError("boom")
+
+    with pytest.raises(RuntimeError):
+        Swarm(client=client, hooks=[hooks]).run(Agent(functions=[f]), [])
+
+    assert hooks.tool_errors.value(agent="Agent", tool="f") == 1
+    assert hooks.runs.value(status="error") == 1
+
+
+def test_registry_serves_prometheus_text():
+    hooks = MetricsHooks()
+    run_with_metrics(hooks)
+    server = hooks.registry.serve(port=0)
+    try:
+        url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+        with urllib.request.urlopen(url) as response:
+            body = response.read().decode()
+            content_type = response.headers["Content-Type"]
+    finally:
+        server.shutdown()
+
+    assert content_type.startswith("text/plain; version=0.0.4")
+    assert "# TYPE swarm_tool_seconds histogram" in body
+    assert 'swarm_tool_seconds_count{agent="Triage",tool="lookup"} 1' in body
@@ -0,0 +1,110 @@
+import os
+import threading
+import time
+import tracemalloc
+
+from swarm import Agent, Swarm
+from swarm.profiling import RunProfiler, profiler_for
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+retained = []
+
+
+def crunch_numbers():
+    blocks = [bytearray(1024) for _ in range(200)]
+    retained.append(blocks)
+    deadline = time.perf_counter() + 0.05
+    while time.perf_counter() < deadline:
+        pass
+    return str(len(blocks))
+
+
+def run_with_tool(**run_kwargs):
+    client = MockOpenAIClient()
+    client.set_sequential_responses(
+        [
+            create_mock_response({"role": "assistant"}, [{"name": "crunch_numbers"}]),
+            create_mock_response({"role": "assistant", "content": "done"}),
+        ]
+    )
+    agent = Agent(functions=[crunch_numbers])
+    return Swarm(client=client).run(agent=agent, messages=[], **run_kwargs)
+
+
+def test_profile_writes_folded_stacks_and_allocations(tmp_path):
+    profiler = RunProfiler(str(tmp_path), interval=0.001)
+
+    run_with_tool(profile=profiler)
+
+    folded, alloc = profiler.paths
+    with open(folded) as f:
+        stacks = f.read().splitlines()
+    assert any("crunch_numbers" in line for line in stacks)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in stacks)
+    with open(alloc) as f:
+        report = f.read()
+    assert "turn 1 (Agent)" in report and "turn 2 (Agent)" in report
+    assert "test_profiling.py" in report
+
+
+def test_profile_directory_argument(tmp_path):
+    run_with_tool(profile=str(tmp_path))
+
+    assert sorted(name.split(".", 1)[1] for name in os.listdir(tmp_path)) == [
+        "alloc.txt",
+        "folded",
+    ]
+
+
+def test_environment_variable_enables_profiling(tmp_path, monkeypatch):
+    monkeypatch.setenv("SWARM_PROFILE", str(tmp_path))
+
+    assert profiler_for(None).directory == str(tmp_path)
+    assert profiler_for(False) is None
+    monkeypatch.setenv("SWARM_PROFILE", "0")
+    assert profiler_for(None) is None
+
+
+def test_profiling_is_off_by_default(monkeypatch):
+    monkeypatch.delenv("SWARM_PROFILE", raising=False)
+
+    assert profiler_for(None) is None
+
+
+def test_overlapping_profiled_runs_share_tracemalloc(tmp_path):
+    first_in_tool = threading.Event()
+    second_done = threading.Event()
+
+    def wait_for_other_run():
+        first_in_tool.set()
+        second_done.wait(5)
+        return "ok"
+
+    client = MockOpenAIClient()
+    client.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant"}, [{"name": "wait_for_other_run"}]
+            ),
+            create_mock_response({"role": "assistant", "content": "done"}),
+        ]
+    )
+    slow = RunProfiler(str(tmp_path / "slow"))
+    thread = threading.Thread(
+        target=Swarm(client=client).run,
+        kwargs={
+            "agent": Agent(functions=[wait_for_other_run]),
+            "messages": [],
+            "profile": slow,
+        },
+    )
+    thread.start()
+    first_in_tool.wait(5)
+    fast = RunProfiler(str(tmp_path / "fast"))
+    run_with_tool(profile=fast)
+    second_done.set()
+    thread.join()
+
+    assert len(fast.turns) == 2 and len(slow.turns) == 2
+    assert not tracemalloc.is_tracing()
+    assert slow.paths[0] != fast.paths[0]
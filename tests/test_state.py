@@ -0,0 +1,79 @@
+import copy
+import json
+import threading
+from collections import defaultdict
+
+from swarm.state import ContextVariables, ContextView
+
+
+def test_reads_copy_mutable_values_on_first_access():
+    cart = ["apple"]
+    caller = {"cart": cart, "user": "ann"}
+    context_variables = ContextVariables(caller)
+
+    context_variables["cart"].append("pear")
+    context_variables.get("cart").append("plum")
+
+    assert cart == ["apple"]
+    assert context_variables["cart"] == ["apple", "pear", "plum"]
+    assert caller == {"cart": ["apple"], "user": "ann"}
+
+
+def test_unread_values_are_copied_only_on_the_way_out():
+    profile = {"name": "ann"}
+    context_variables = ContextVariables({"profile": profile, "user": "ann"})
+
+    context_variables["user"] = "bob"
+    context_variables.update({"lang": "es"})
+    assert dict.__getitem__(context_variables, "profile") is profile
+
+    plain = context_variables.to_dict()
+    assert type(plain) is dict
+    assert plain["profile"] is not profile
+    assert plain == {"profile": {"name": "ann"}, "user": "bob", "lang": "es"}
+
+
+def test_instructions_render_without_copying():
+    profile = {"name": "ann"}
+    context_variables = ContextVariables({"profile": profile})
+    view = ContextView(context_variables)
+
+    assert view["profile"] is profile
+    assert view["missing"] == ""
+    assert view.get("missing") is None
+    assert dict(view) == {"profile": {"name": "ann"}}
+    assert "profile" in context_variables._shared
+
+
+def test_concurrent_reads_share_one_copy():
+    context_variables = ContextVariables({"cart": []})
+    barrier = threading.Barrier(8)
+
+    def add(item):
+        barrier.wait()
+        context_variables["cart"].append(item)
+
+    threads = [threading.Thread(target=add, args=(i,)) for i in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert sorted(context_variables["cart"]) == list(range(8))
+
+
+def test_dict_conversions_read_through_copies():
+    caller = {"cart": ["apple"]}
+    conversions = [
+        lambda c: {**c},
+        dict,
+        ContextVariables.copy,
+        lambda c: defaultdict(str, c),
+        copy.deepcopy,
+    ]
+
+    for convert in conversions:
+        convert(ContextVariables(caller))["cart"].append("pear")
+
+    assert caller == {"cart": ["apple"]}
+    assert json.dumps(ContextVariables(caller)) == '{"cart": ["apple"]}'
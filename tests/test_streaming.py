@@ -0,0 +1,88 @@
+from openai.types.chat.chat_completion_chunk import (
+    ChatCompletionChunk,
+    Choice,
+    ChoiceDelta,
+    ChoiceDeltaToolCall,
+    ChoiceDeltaToolCallFunction,
+)
+
+from swarm.streaming import StreamAccumulator, tool_call_objects
+
+
+def make_chunk(delta=None):
+    return ChatCompletionChunk(
+        id="chunk",
+        created=0,
+        model="gpt-4o",
+        object="chat.completion.chunk",
+        choices=[Choice(delta=delta, index=0)] if delta else [],
+    )
+
+
+def tool_delta(index, id=None, name=None, arguments=None):
+    return ChoiceDeltaToolCall(
+        index=index,
+        id=id,
+        type="function" if id else None,
+        function=ChoiceDeltaToolCallFunction(name=name, arguments=arguments),
+    )
+
+
+def test_accumulates_content_and_every_tool_call_delta():
+    chunks = [
+        make_chunk(ChoiceDelta(role="assistant", content="Checking ")),
+        make_chunk(ChoiceDelta(content="both.")),
+        # two tool calls start in the same chunk
+        make_chunk(
+            ChoiceDelta(
+                tool_calls=[
+                    tool_delta(0, id="call_a", name="get_weather", arguments='{"loc'),
+                    tool_delta(1, id="call_b", name="get_time", arguments="{"),
+                ]
+            )
+        ),
+        make_chunk(ChoiceDelta(tool_calls=[tool_delta(0, arguments='": "SF"}')])),
+        make_chunk(ChoiceDelta(tool_calls=[tool_delta(1, arguments="}")])),
+        # usage-only chunk has no choices
+        make_chunk(),
+    ]
+
+    accumulator = StreamAccumulator("Agent")
+    events = [accumulator.add_chunk(chunk) for chunk in chunks]
+
+    assert events[0]["sender"] == "Agent"
+    assert events[1]["content"] == "both."
+    assert "sender" not in events[1]
+    assert events[-1] is None
+
+    message = accumulator.message()
+    assert message["content"] == "Checking both."
+    assert message["tool_calls"] == [
+        {
+            "function": {"arguments": '{"loc": "SF"}', "name": "get_weather"},
+            "id": "call_a",
+            "type": "function",
+        },
+        {
+            "function": {"arguments": "{}", "name": "get_time"},
+            "id": "call_b",
+            "type": "function",
+        },
+    ]
+    assert [t.function.name for t in tool_call_objects(message)] == [
+        "get_weather",
+        "get_time",
+    ]
+
+
+def test_message_without_tool_calls():
+    accumulator = StreamAccumulator("Agent")
+    accumulator.add_chunk(make_chunk(ChoiceDelta(role="assistant", content="hi")))
+
+    assert accumulator.message() == {
+        "content": "hi",
+        "sender": "Agent",
+        "role": "assistant",
+        "function_call": None,
+        "tool_calls": None,
+    }
@@ -0,0 +1,187 @@
+import copy
+import threading
+from unittest.mock import Mock
+
+from swarm import Agent, Swarm
+from swarm.summarize import SUMMARY_PREFIX, Summarizer
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+SYSTEM = {"role": "system", "content": "You are a helpful agent."}
+
+
+def conversation(turns):
+    messages = []
+    for i in range(turns):
+        messages.append({"role": "user", "content": f"question {i} " * 10})
+        messages.append({"role": "assistant", "content": f"answer {i} " * 10})
+    return messages
+
+
+def summary_client(text="the user asked questions"):
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": text}))
+    return client
+
+
+def test_short_history_is_untouched():
+    summarizer = Summarizer(client=summary_client(), max_tokens=1000)
+    messages = [SYSTEM, *conversation(2)]
+
+    assert summarizer(messages) is messages
+    summarizer.wait()
+    assert summarizer.stats.summaries == 0
+
+
+def test_summary_is_swapped_in_on_the_next_request():
+    client = summary_client()
+    summarizer = Summarizer(client=client, max_tokens=100, keep_tokens=50)
+    history = conversation(6)
+
+    # the request that triggers summarization still sees the full history
+    first = summarizer([SYSTEM, *history])
+    assert first[1:] == history
+    summarizer.wait()
+
+    history.append({"role": "user", "content": "and one more"})
+    second = summarizer([SYSTEM, *history])
+
+    assert second[0] is SYSTEM
+    assert second[1]["content"] == SUMMARY_PREFIX + "the user asked questions"
+    assert second[-1] is history[-1]
+    assert len(second) < len(history)
+    assert client.chat.completions.create.call_args.kwargs["model"] == "llama3.2:1b"
+    stats = summarizer.session_stats(history)
+    assert stats.summaries == 1
+    assert stats.tokens_saved > 0
+    assert summarizer.stats.tokens_saved == stats.tokens_saved
+
+
+def test_summarization_runs_off_the_request_path():
+    release = threading.Event()
+    summarizer = Summarizer(max_tokens=100, keep_tokens=50)
+    summarizer.summarize = Mock(side_effect=lambda *_: release.wait() and "summary")
+    history = conversation(6)
+
+    # returns without waiting on the blocked summarization
+    assert summarizer([SYSTEM, *history])[1:] == history
+    assert summarizer([SYSTEM, *history])[1:] == history
+    release.set()
+    summarizer.wait()
+
+    assert summarizer.summarize.call_count == 1
+    assert summarizer([SYSTEM, *history])[1]["content"] == SUMMARY_PREFIX + "summary"
+
+
+def test_summaries_are_folded_incrementally():
+    summarizer = Summarizer(max_tokens=100, keep_tokens=50)
+    summarizer.summarize = Mock(side_effect=["first", "second"])
+    history = conversation(6)
+
+    summarizer(history)
+    summarizer.wait()
+    history.extend(conversation(6))
+    summarizer(history)
+    summarizer.wait()
+
+    (_, first_fold), (previous, second_fold) = [
+        call.args for call in summarizer.summarize.call_args_list
+    ]
+    assert previous == "first"
+    assert second_fold[0] is history[len(first_fold)]
+    assert summarizer(history)[0]["content"] == SUMMARY_PREFIX + "second"
+
+
+def test_failed_summary_keeps_full_history():
+    summarizer = Summarizer(max_tokens=100, keep_tokens=50)
+    summarizer.summarize = Mock(side_effect=RuntimeError("model unavailable"))
+    history = conversation(6)
+
+    summarizer(history)
+    summarizer.wait()
+
+    assert summarizer(history) == history
+    assert summarizer.stats.failures == 1
+    assert str(summarizer.last_error) == "model unavailable"
+
+
+def test_sessions_are_tracked_separately():
+    summarizer = Summarizer(max_tokens=100, keep_tokens=50)
+    summarizer.summarize = Mock(return_value="summary")
+    first = conversation(6)
+    second = [{"role": "user", "content": "another opening"}] + conversation(6)
+
+    summarizer(first)
+    summarizer.wait()
+
+    assert summarizer(second) == second
+    assert summarizer(first)[0]["content"] == SUMMARY_PREFIX + "summary"
+    assert summarizer.session_stats(second).summaries == 0
+
+
+def test_conversations_with_the_same_opening_keep_their_own_summaries():
+    summarizer = Summarizer(max_tokens=100, keep_tokens=50)
+    summarizer.summarize = Mock(side_effect=lambda _, fold: fold[1]["content"])
+    hello = {"role": "user", "content": "Hi"}
+    first = [hello] + conversation(6)
+    second = [hello] + [
+        {**message, "content": message["content"].upper()}
+        for message in conversation(6)
+    ]
+
+    summarizer(first)
+    summarizer(second)
+    summarizer.wait()
+
+    assert summarizer(first)[0]["content"].startswith(SUMMARY_PREFIX + "question")
+    assert summarizer(second)[0]["content"].startswith(SUMMARY_PREFIX + "QUESTION")
+    summarizer.wait()
+    assert summarizer.summarize.call_count == 2
+    assert summarizer.session_stats(first).tokens_saved > 0
+    assert summarizer.session_stats(second).tokens_saved > 0
+
+
+def test_reloaded_history_finds_its_summary():
+    summarizer = Summarizer(max_tokens=100, keep_tokens=50)
+    summarizer.summarize = Mock(return_value="summary")
+    summarizer(conversation(6))
+    summarizer.wait()
+
+    # a fresh copy, as a server that loads history per request would send
+    reloaded = copy.deepcopy(conversation(6))
+
+    assert summarizer(reloaded)[0]["content"] == SUMMARY_PREFIX + "summary"
+    assert summarizer.session_stats(reloaded).summaries == 1
+
+
+def test_explicit_session_key():
+    summarizer = Summarizer(
+        max_tokens=100,
+        keep_tokens=50,
+        session_key=lambda history: history[0]["content"].split()[-1],
+    )
+    summarizer.summarize = Mock(return_value="summary")
+    first = [{"role": "user", "content": "conversation a"}] + conversation(6)
+    second = [{"role": "user", "content": "conversation b"}] + conversation(6)
+
+    summarizer(first)
+    summarizer.wait()
+
+    assert summarizer(second) == second
+    assert summarizer.session_stats(first).summaries == 1
+
+
+def test_run_uses_summarizer_as_context_window():
+    summarizer = Summarizer(max_tokens=100, keep_tokens=50)
+    summarizer.summarize = Mock(return_value="summary")
+    history = conversation(6)
+    summarizer(history)
+    summarizer.wait()
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": "ok"}))
+    swarm = Swarm(client=client)
+
+    response = swarm.run(agent=Agent(context_window=summarizer), messages=history)
+
+    sent = client.chat.completions.create.call_args.kwargs["messages"]
+    assert sent[1]["content"] == SUMMARY_PREFIX + "summary"
+    assert response.messages[-1]["content"] == "ok"
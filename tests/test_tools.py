@@ -0,0 +1,36 @@
+from swarm import Agent
+from swarm.tools import ToolPlan, get_tool_plan
+
+
+def get_weather(location, context_variables):
+    """Get the weather for a location."""
+    return "sunny"
+
+
+def get_time(timezone: str = "UTC"):
+    return "noon"
+
+
+def test_plan_hides_context_variables():
+    plan = ToolPlan([get_weather, get_time])
+
+    params = plan.schemas[0]["function"]["parameters"]
+    assert params["properties"] == {"location": {"type": "string"}}
+    assert params["required"] == ["location"]
+    assert plan.function_map == {"get_weather": get_weather, "get_time": get_time}
+    assert plan.takes_context == {"get_weather"}
+
+
+def test_plan_is_cached_until_functions_change():
+    agent = Agent(functions=[get_weather])
+
+    plan = get_tool_plan(agent)
+    assert get_tool_plan(agent) is plan
+
+    agent.functions.append(get_time)
+    appended = get_tool_plan(agent)
+    assert appended is not plan
+    assert list(appended.function_map) == ["get_weather", "get_time"]
+
+    agent.functions = [get_time]
+    assert list(get_tool_plan(agent).function_map) == ["get_time"]
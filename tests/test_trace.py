@@ -0,0 +1,110 @@
+import json
+import time
+
+import pytest
+from swarm import Agent, Swarm
+from swarm.trace import ChromeTrace
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+
+def slow_a():
+    time.sleep(0.05)
+    return "a"
+
+
+def slow_b():
+    time.sleep(0.05)
+    return "b"
+
+
+def traced_run(trace, **options):
+    billing = Agent(name="Billing")
+
+    def transfer():
+        return billing
+
+    client = MockOpenAIClient()
+    client.set_sequential_responses(
+        [
+            create_mock_response(
+                {"role": "assistant"},
+                [{"name": "slow_a"}, {"name": "slow_b"}, {"name": "transfer"}],
+            ),
+            create_mock_response({"role": "assistant", "content": "done"}),
+        ]
+    )
+    agent = Agent(name="Triage", functions=[slow_a, slow_b, transfer])
+    Swarm(client=client, hooks=[trace], **options).run(agent=agent, messages=[])
+
+
+def spans(trace_json, cat=None):
+    return [
+        e
+        for e in trace_json["traceEvents"]
+        if e["ph"] == "X" and (cat is None or e["cat"] == cat)
+    ]
+
+
+def test_run_is_exported_as_nested_spans(tmp_path):
+    trace = ChromeTrace()
+    traced_run(trace)
+
+    path = trace.save(str(tmp_path / "traces" / "run.json"))
+    with open(path) as f:
+        data = json.load(f)
+
+    assert sorted(e["cat"] for e in spans(data)) == [
+        "completion",
+        "completion",
+        "run",
+        "tool",
+        "tool",
+        "tool",
+        "turn",
+        "turn",
+    ]
+    (run,) = spans(data, "run")
+    for span in spans(data):
+        assert run["ts"] <= span["ts"]
+        assert span["ts"] + span["dur"] <= run["ts"] + run["dur"] + 1e-3
+    # sequential tools share the run's track
+    assert {span["tid"] for span in spans(data)} == {run["tid"]}
+    instants = [e["name"] for e in data["traceEvents"] if e["ph"] == "i"]
+    assert instants == ["handoff → Billing"]
+
+
+def test_overlapping_tools_get_their_own_tracks():
+    trace = ChromeTrace()
+    traced_run(trace, tool_executor=3)
+
+    tool_tracks = {span["tid"] for span in spans(trace.to_json(), "tool")}
+
+    assert len(tool_tracks) >= 2
+
+
+def test_thread_lanes_follow_executor_threads():
+    trace = ChromeTrace(lanes="thread")
+    traced_run(trace, tool_executor=3)
+
+    data = trace.to_json()
+    names = {
+        e["args"]["name"]
+        for e in data["traceEvents"]
+        if e["ph"] == "M" and e["name"] == "thread_name"
+    }
+    assert any(name.startswith("swarm-tool") for name in names)
+
+
+def test_batch_runs_get_one_track_each():
+    trace = ChromeTrace()
+    traced_run(trace)
+    traced_run(trace)
+
+    runs = spans(trace.to_json(), "run")
+
+    assert len({span["tid"] for span in runs}) == 2
+
+
+def test_unknown_lanes_are_rejected():
+    with pytest.raises(ValueError):
+        ChromeTrace(lanes="agent")
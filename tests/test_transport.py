@@ -0,0 +1,38 @@
+import pytest
+
+from swarm import AsyncSwarm, Swarm
+from swarm.transport import (
+    TransportConfig,
+    configure_transport,
+    get_http_client,
+    get_transport_config,
+)
+
+
+@pytest.fixture(autouse=True)
+def restore_transport():
+    config = get_transport_config()
+    yield
+    configure_transport(config)
+
+
+def test_default_clients_share_one_pool():
+    a, b = Swarm(), Swarm()
+
+    assert a.client is not b.client
+    assert a.client._client is b.client._client is get_http_client()
+    assert str(a.client.base_url) == "http://localhost:11434/v1/"
+    assert AsyncSwarm().client._client is AsyncSwarm().client._client
+
+
+def test_configure_transport():
+    before = Swarm().client._client
+
+    config = configure_transport(max_connections=7, read_timeout=12.5)
+
+    assert config == TransportConfig(max_connections=7, read_timeout=12.5)
+    after = Swarm().client._client
+    assert after is not before
+    assert not before.is_closed
+    assert after.timeout.read == 12.5
+    assert after._transport._pool._max_connections == 7
@@ -0,0 +1,167 @@
+import asyncio
+
+import httpx
+import openai
+import pytest
+
+from openai.types.chat import ChatCompletionChunk
+from openai.types.completion_usage import CompletionUsage
+
+from swarm import Agent, AsyncSwarm, Swarm
+from tests.mock_client import (
+    MockAsyncOpenAIClient,
+    MockOpenAIClient,
+    create_mock_response,
+    create_mock_stream,
+)
+
+
+def with_usage(completion, prompt_tokens, completion_tokens):
+    completion.usage = CompletionUsage(
+        prompt_tokens=prompt_tokens,
+        completion_tokens=completion_tokens,
+        total_tokens=prompt_tokens + completion_tokens,
+    )
+    return completion
+
+
+def handoff_responses():
+    return [
+        with_usage(
+            create_mock_response({"role": "assistant"}, [{"name": "transfer"}]),
+            100,
+            10,
+        ),
+        with_usage(
+            create_mock_response({"role": "assistant", "content": "done"}), 150, 20
+        ),
+    ]
+
+
+def handoff_agent():
+    billing = Agent(name="Billing")
+
+    def transfer():
+        return billing
+
+    return Agent(name="Triage", functions=[transfer])
+
+
+def test_run_accounts_tokens_and_time_per_turn_and_agent():
+    client = MockOpenAIClient()
+    client.set_sequential_responses(handoff_responses())
+
+    usage = Swarm(client=client).run(agent=handoff_agent(), messages=[]).usage
+
+    first, second = usage.turns
+    assert (first.agent, first.prompt_tokens, first.completion_tokens) == (
+        "Triage",
+        100,
+        10,
+    )
+    assert [tool.name for tool in first.tools] == ["transfer"]
+    assert second.agent == "Billing" and second.tools == []
+    assert (usage.prompt_tokens, usage.completion_tokens, usage.total_tokens) == (
+        250,
+        30,
+        280,
+    )
+    assert usage.by_agent["Billing"].completion_tokens == 20
+    assert usage.by_agent["Triage"].turns == 1
+    assert usage.wall_time >= usage.completion_time + usage.tool_time > 0
+    assert usage.model_dump()["total_tokens"] == 280
+
+
+def test_async_run_accounts_usage():
+    client = MockAsyncOpenAIClient()
+    client.set_sequential_responses(handoff_responses())
+
+    response = asyncio.run(AsyncSwarm(client=client).run(handoff_agent(), []))
+
+    assert response.usage.total_tokens == 280
+    assert list(response.usage.by_agent) == ["Triage", "Billing"]
+
+
+def test_stream_requests_and_records_usage():
+    chunks = create_mock_stream({"role": "assistant", "content": "hello there"})
+    chunks.append(
+        ChatCompletionChunk(
+            id="mock_cc_id",
+            created=1234567890,
+            model="gpt-4o",
+            object="chat.completion.chunk",
+            choices=[],
+            usage=CompletionUsage(
+                prompt_tokens=12, completion_tokens=2, total_tokens=14
+            ),
+        )
+    )
+    client = MockOpenAIClient()
+    client.set_response(chunks)
+
+    events = list(Swarm(client=client).run(agent=Agent(), messages=[], stream=True))
+
+    kwargs = client.chat.completions.create.call_args.kwargs
+    assert kwargs["stream_options"] == {"include_usage": True}
+    (turn,) = events[-1]["response"].usage.turns
+    assert (turn.prompt_tokens, turn.completion_tokens, turn.model) == (
+        12,
+        2,
+        "gpt-4o",
+    )
+    assert 0 <= turn.time_to_first_token <= turn.latency
+
+
+def test_stream_usage_can_be_turned_off():
+    client = MockOpenAIClient()
+    client.set_response(create_mock_stream({"role": "assistant", "content": "hi"}))
+
+    events = list(
+        Swarm(client=client, stream_usage=False).run(
+            agent=Agent(), messages=[], stream=True
+        )
+    )
+
+    assert "stream_options" not in client.chat.completions.create.call_args.kwargs
+    assert events[-1]["response"].usage.turns[0].prompt_tokens is None
+
+
+def test_rejected_stream_options_are_dropped():
+    client = MockOpenAIClient()
+    request = httpx.Request("POST", "http://localhost/v1/chat/completions")
+    rejected = openai.BadRequestError(
+        "unknown field stream_options",
+        response=httpx.Response(400, request=request),
+        body=None,
+    )
+    stream = create_mock_stream({"role": "assistant", "content": "hi"})
+    client.chat.completions.create.side_effect = [rejected, stream, stream]
+    swarm = Swarm(client=client)
+
+    events = list(swarm.run(agent=Agent(), messages=[], stream=True))
+    list(swarm.run(agent=Agent(), messages=[], stream=True))
+
+    assert events[-1]["response"].messages[-1]["content"] == "hi "
+    calls = client.chat.completions.create.call_args_list
+    assert [("stream_options" in call.kwargs) for call in calls] == [
+        True,
+        False,
+        False,
+    ]
+
+
+def test_other_bad_requests_are_not_retried():
+    client = MockOpenAIClient()
+    request = httpx.Request("POST", "http://localhost/v1/chat/completions")
+    client.chat.completions.create.side_effect = openai.BadRequestError(
+        "maximum context length exceeded",
+        response=httpx.Response(400, request=request),
+        body={"error": {"code": "context_length_exceeded"}},
+    )
+    swarm = Swarm(client=client)
+
+    with pytest.raises(openai.BadRequestError):
+        list(swarm.run(agent=Agent(), messages=[], stream=True))
+
+    assert client.chat.completions.create.call_count == 1
+    assert swarm.stream_usage
@@ -1,4 +1,6 @@
-from swarm.util import function_to_json
+from collections import defaultdict
+
+from swarm.util import function_to_json, merge_chunk
 
 
 def test_basic_function():
@@ -48,3 +50,33 @@ def test_complex_function():
             },
         },
     }
+
+
+def test_merge_chunk_applies_every_tool_call():
+    message = {
+        "content": "",
+        "tool_calls": defaultdict(
+            lambda: {"function": {"arguments": "", "name": ""}, "id": "", "type": ""}
+        ),
+    }
+    merge_chunk(
+        message,
+        {
+            "role": "assistant",
+            "content": "hi",
+            "tool_calls": [
+                {"index": 0, "id": "a", "function": {"name": "f", "arguments": "{}"}},
+                {"index": 1, "id": "b", "function": {"name": "g", "arguments": "{"}},
+            ],
+        },
+    )
+    merge_chunk(
+        message,
+        {"tool_calls": [{"index": 1, "function": {"name": None, "arguments": "}"}}]},
+    )
+
+    assert message["content"] == "hi"
+    assert [(t["id"], t["function"]["arguments"]) for t in message["tool_calls"].values()] == [
+        ("a", "{}"),
+        ("b", "{}"),
+    ]
@@ -0,0 +1,90 @@
+from unittest.mock import Mock
+
+from swarm import Agent, Swarm
+from swarm.window import ContextWindow, TokenCounter, estimate_tokens, group_turns
+from tests.mock_client import MockOpenAIClient, create_mock_response
+
+SYSTEM = {"role": "system", "content": "You are a helpful agent."}
+
+
+def user(text):
+    return {"role": "user", "content": text}
+
+
+def tool_turn(call_id, result):
+    return [
+        {
+            "role": "assistant",
+            "content": None,
+            "tool_calls": [
+                {"id": call_id, "function": {"name": "lookup", "arguments": "{}"}}
+            ],
+        },
+        {"role": "tool", "tool_call_id": call_id, "content": result},
+    ]
+
+
+def test_group_turns_keeps_tool_results_with_their_call():
+    messages = [user("a"), *tool_turn("1", "x"), user("b")]
+
+    assert [len(unit) for unit in group_turns(messages)] == [1, 2, 1]
+
+
+def test_under_budget_is_untouched():
+    messages = [SYSTEM, user("hi")]
+
+    assert ContextWindow(max_tokens=1000)(messages) is messages
+
+
+def test_keeps_system_pinned_and_newest_turns():
+    pinned = {"role": "user", "content": "My account id is 42.", "pinned": True}
+    old_turn = tool_turn("1", "x" * 400)
+    new_turn = tool_turn("2", "y" * 40)
+    messages = [SYSTEM, pinned, user("a" * 400), *old_turn, *new_turn, user("ok?")]
+
+    window = ContextWindow(max_tokens=60, pinned=lambda m: m.get("pinned"))
+
+    assert window(messages) == [SYSTEM, pinned, *new_turn, user("ok?")]
+
+
+def test_newest_turn_is_kept_even_over_budget():
+    messages = [SYSTEM, user("a"), user("b" * 4000)]
+
+    assert ContextWindow(max_tokens=10)(messages) == [SYSTEM, user("b" * 4000)]
+
+
+def test_token_counts_are_memoized():
+    estimator = Mock(side_effect=estimate_tokens)
+    counter = TokenCounter(estimator)
+    message = user("hello")
+
+    assert counter(message) == counter(message) == estimate_tokens(message)
+    estimator.assert_called_once_with(message)
+
+
+def test_token_counter_keeps_a_bounded_amount_of_content():
+    counter = TokenCounter(max_chars=10_000)
+
+    for _ in range(100):
+        counter(user("x" * 1000))
+
+    # only the newest messages stay referenced
+    assert len(counter._memo) == 10
+    counter(user("y" * 20_000))
+    assert len(counter._memo) == 10
+
+
+def test_swarm_applies_window():
+    client = MockOpenAIClient()
+    client.set_response(create_mock_response({"role": "assistant", "content": "hi"}))
+    history = [user("a" * 400), user("b" * 400), user("latest")]
+
+    swarm = Swarm(client=client, context_window=ContextWindow(max_tokens=150))
+    swarm.run(agent=Agent(), messages=history)
+    sent = client.chat.completions.create.call_args.kwargs["messages"]
+    assert sent[1:] == [user("b" * 400), user("latest")]
+
+    agent = Agent(context_window=ContextWindow(max_tokens=20))
+    swarm.run(agent=agent, messages=history)
+    sent = client.chat.completions.create.call_args.kwargs["messages"]
+    assert sent[1:] == [user("latest")]